@@ -7,6 +7,7 @@ from config import Config, ProductionConfig
 import pytz
 from datetime import datetime
 import os
+import multiprocessing
 from decimal import Decimal
 from app.theme_state import read_theme_state, DEFAULT_THEME
 
@@ -61,7 +62,7 @@ def format_avg_timedelta(td):
     minutes = (seconds % 3600) // 60
     return f"{days}d {hours}h {minutes}m"
 
-def create_app(config_class=Config): 
+def create_app(config_class=Config, start_scheduler=True): 
     app = Flask(__name__)
     # Load production config if in production
     if os.getenv('FLASK_ENV') == 'production':
@@ -104,7 +105,7 @@ def create_app(config_class=Config):
             # Force logout if user status is not 'Active'
             if current_user.status != 'Active':
                 from flask_login import logout_user
-                print(f"SECURITY: Force logging out user {current_user.username} with status '{current_user.status}'")
+                app.logger.warning("Force logging out user %s with status '%s'", current_user.username, current_user.status)
                 logout_user()
                 flash('Only users with Active status can access the system.', 'warning')
                 return redirect(url_for('main.login'))
@@ -157,15 +158,55 @@ def create_app(config_class=Config):
             return base.rstrip()
         return message
 
-    # Initialize the scheduler
-    init_scheduler(app)
+    # Initialize the scheduler. Report/batch worker processes run without one,
+    # including while a spawned worker re-imports the entry script (its
+    # process name is already set then; parent_process() is not).
+    if start_scheduler and multiprocessing.current_process().name == 'MainProcess':
+        init_scheduler(app)
+
+    # Abandoned background jobs are resumed by one process only: run.py /
+    # waitress_server.py at startup, or this command (e.g. next to gunicorn)
+    @app.cli.command('resume-jobs')
+    def resume_jobs_command():
+        """Re-submit background jobs whose worker lease expired and wait for them."""
+        resume_background_jobs(app)
 
     return app
 
-@login_manager.user_loader
-def load_user(user_id):
-    from app.models import User
-    return User.query.get(int(user_id))
+def resume_background_jobs(app, watch=False):
+    """
+    Re-submit batch jobs and fail report jobs interrupted by a crash or
+    restart. Jobs still held by a live worker (unexpired lease) are left
+    alone; with watch=True the
+    scheduler repeats the check every lease period, so jobs whose lease had
+    not yet run out at startup are picked up once it does.
+    """
+    from sqlalchemy.exc import OperationalError, ProgrammingError
+    from app.batch_jobs import resume_batch_jobs
+    from app.report_jobs import fail_abandoned_report_jobs
+
+    with app.app_context():
+        for recover, done_message in ((resume_batch_jobs, "Resumed %s interrupted batch job(s)"),
+                                      (fail_abandoned_report_jobs, "Failed %s interrupted report job(s)")):
+            try:
+                count = recover()
+            except (OperationalError, ProgrammingError) as exc:
+                db.session.rollback()
+                app.logger.warning("Could not recover background jobs: %s", getattr(exc, "orig", exc))
+                continue
+            if count:
+                app.logger.info(done_message, count)
+
+    scheduler = getattr(app, 'scheduler', None)
+    if watch and scheduler is not None:
+        scheduler.add_job(
+            resume_background_jobs,
+            'interval',
+            args=[app],
+            seconds=int(app.config.get('JOB_LEASE_SECONDS', 900)),
+            id='resume_background_jobs',
+            replace_existing=True
+        )
 
 def init_scheduler(app):
     """
@@ -0,0 +1,382 @@
+"""
+Hot/cold storage for archived documents.
+
+Archived documents live in ``document_archive`` together with their
+``activity_log_archive`` and ``processing_logs_archive`` rows, so the hot
+tables only carry live work. Documents keep their primary keys when they move
+in either direction (the hot table's ids never repeat: AUTOINCREMENT on
+SQLite, an AUTO_INCREMENT floor on MySQL; a document that still lands on an
+archived id is renumbered as it moves), and the per-user ``archive_facets``
+counts are adjusted in the same transaction.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from flask import current_app
+from flask_sqlalchemy.pagination import Pagination
+from sqlalchemy import delete, func, insert, literal, select, text, union_all, update
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models import (
+    ActivityLog,
+    ArchiveFacet,
+    ArchivedActivityLog,
+    ArchivedDocument,
+    ArchivedProcessingLog,
+    Document,
+    ProcessingLog,
+)
+
+_DOCUMENT_COLUMNS = [column.name for column in Document.__table__.columns]
+# History rows get fresh ids on each move: hot-table ids can be reused once
+# their rows are deleted, so carrying them over could collide.
+_ACTIVITY_COLUMNS = [column.name for column in ActivityLog.__table__.columns if column.name != 'id']
+_PROCESSING_COLUMNS = [column.name for column in ProcessingLog.__table__.columns if column.name != 'id']
+
+
+def _copy(source, target, columns: List[str], key: str, ids: List[int], extra=None) -> None:
+    source_columns = [source.c[name] for name in columns]
+    target_columns = list(columns)
+    for name, value in (extra or {}).items():
+        source_columns.append(literal(value).label(name))
+        target_columns.append(name)
+    db.session.execute(
+        insert(target).from_select(
+            target_columns,
+            select(*source_columns).where(source.c[key].in_(ids)),
+        )
+    )
+
+
+def _facet_deltas(table, ids: List[int], sign: int) -> Dict[Tuple[int, int, int], int]:
+    """Count documents per (user, year, month) for both creator and recipient."""
+    deltas: Counter = Counter()
+    rows = db.session.execute(
+        select(table.c.creator_id, table.c.recipient_id, table.c.timestamp)
+        .where(table.c.id.in_(ids))
+    )
+    for creator_id, recipient_id, timestamp in rows:
+        if not timestamp:
+            continue
+        for user_id in {creator_id, recipient_id}:
+            if user_id:
+                deltas[(user_id, timestamp.year, timestamp.month)] += sign
+    return deltas
+
+
+def _apply_facet_deltas(deltas: Dict[Tuple[int, int, int], int]) -> None:
+    facets = ArchiveFacet.__table__
+    for (user_id, year, month), delta in deltas.items():
+        if not delta:
+            continue
+        result = db.session.execute(
+            update(facets)
+            .where(facets.c.user_id == user_id, facets.c.year == year, facets.c.month == month)
+            .values(count=facets.c['count'] + delta)
+        )
+        if not result.rowcount and delta > 0:
+            db.session.execute(
+                insert(facets).values(user_id=user_id, year=year, month=month, count=delta)
+            )
+    db.session.execute(delete(facets).where(facets.c['count'] <= 0))
+
+
+def get_archive_facets(user_id: int) -> Dict[int, Dict[int, int]]:
+    """Return {year: {month: count}} for a user's archived documents."""
+    facets: Dict[int, Dict[int, int]] = {}
+    rows = (
+        db.session.query(ArchiveFacet.year, ArchiveFacet.month, ArchiveFacet.count)
+        .filter(ArchiveFacet.user_id == user_id)
+        .all()
+    )
+    for year, month, count in rows:
+        if count > 0:
+            facets.setdefault(year, {})[month] = count
+    return facets
+
+
+def raise_document_id_floor() -> None:
+    """
+    Keep MySQL from handing out archived ids again: servers before 8.0 reset
+    AUTO_INCREMENT to the hot table's max(id) + 1 on restart. InnoDB never
+    lowers the counter below that, and the ALTER commits implicitly, so call
+    this outside a unit of work. SQLite's AUTOINCREMENT never reuses ids.
+    """
+    bind = db.session.get_bind(mapper=Document.__mapper__)
+    if bind.dialect.name not in ('mysql', 'mariadb'):
+        return
+    archived_max = db.session.execute(select(func.max(ArchivedDocument.id))).scalar()
+    if archived_max:
+        db.session.execute(text(f"ALTER TABLE {Document.__table__.name} AUTO_INCREMENT = {int(archived_max) + 1}"))
+        db.session.commit()
+
+
+def _free_archive_ids(ids: List[int]) -> List[int]:
+    """
+    Give hot documents whose id is already used in document_archive (an id the
+    database handed out again, e.g. after a MySQL 5.7 restart) a new id above
+    both tables, moving their history along. Returns the ids to archive.
+    """
+    archive = ArchivedDocument.__table__
+    taken = set(db.session.execute(select(archive.c.id).where(archive.c.id.in_(ids))).scalars())
+    if not taken:
+        return ids
+    documents = Document.__table__
+    next_id = max(db.session.execute(select(func.max(documents.c.id))).scalar() or 0,
+                  db.session.execute(select(func.max(archive.c.id))).scalar() or 0) + 1
+    free_ids = []
+    for old_id in ids:
+        if old_id not in taken:
+            free_ids.append(old_id)
+            continue
+        new_id, next_id = next_id, next_id + 1
+        db.session.execute(
+            insert(documents).from_select(
+                _DOCUMENT_COLUMNS,
+                select(*[literal(new_id).label('id') if name == 'id' else documents.c[name]
+                         for name in _DOCUMENT_COLUMNS]).where(documents.c.id == old_id),
+            )
+        )
+        for table in (ActivityLog.__table__, ProcessingLog.__table__):
+            db.session.execute(update(table).where(table.c.document_id == old_id).values(document_id=new_id))
+        db.session.execute(delete(documents).where(documents.c.id == old_id))
+        current_app.logger.warning(
+            "Document #%s collides with an archived document; archiving it as #%s", old_id, new_id
+        )
+        free_ids.append(new_id)
+    return free_ids
+
+
+def move_documents_to_archive(doc_ids: Iterable[int], archived_at=None) -> int:
+    """
+    Move documents and their activity/processing history into the archive
+    tables with set-based INSERT ... SELECT / DELETE statements. The caller
+    owns the transaction.
+    """
+    ids = list(doc_ids)
+    if not ids:
+        return 0
+    archived_at = archived_at or datetime.utcnow()
+    documents = Document.__table__
+    activities = ActivityLog.__table__
+    processing = ProcessingLog.__table__
+
+    ids = _free_archive_ids(ids)
+    deltas = _facet_deltas(documents, ids, 1)
+    _copy(documents, ArchivedDocument.__table__, _DOCUMENT_COLUMNS, 'id', ids,
+          extra={'archived_at': archived_at})
+    _copy(activities, ArchivedActivityLog.__table__, _ACTIVITY_COLUMNS, 'document_id', ids)
+    _copy(processing, ArchivedProcessingLog.__table__, _PROCESSING_COLUMNS, 'document_id', ids)
+
+    db.session.execute(delete(activities).where(activities.c.document_id.in_(ids)))
+    db.session.execute(delete(processing).where(processing.c.document_id.in_(ids)))
+    result = db.session.execute(delete(documents).where(documents.c.id.in_(ids)))
+    _apply_facet_deltas(deltas)
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(ids)
+
+
+def restore_documents_from_archive(doc_ids: Iterable[int]) -> int:
+    """
+    Move archived documents and their history back into the hot tables.
+    The caller owns the transaction and sets the restored status.
+    """
+    ids = list(doc_ids)
+    if not ids:
+        return 0
+    documents = ArchivedDocument.__table__
+    activities = ArchivedActivityLog.__table__
+    processing = ArchivedProcessingLog.__table__
+
+    deltas = _facet_deltas(documents, ids, -1)
+    _copy(documents, Document.__table__, _DOCUMENT_COLUMNS, 'id', ids)
+    _copy(activities, ActivityLog.__table__, _ACTIVITY_COLUMNS, 'document_id', ids)
+    _copy(processing, ProcessingLog.__table__, _PROCESSING_COLUMNS, 'document_id', ids)
+
+    db.session.execute(delete(activities).where(activities.c.document_id.in_(ids)))
+    db.session.execute(delete(processing).where(processing.c.document_id.in_(ids)))
+    result = db.session.execute(delete(documents).where(documents.c.id.in_(ids)))
+    _apply_facet_deltas(deltas)
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(ids)
+
+
+def all_documents():
+    """
+    Return a Document alias over hot + archived rows, for reports that must
+    see every document regardless of where it is stored.
+    """
+    hot = Document.__table__
+    cold = ArchivedDocument.__table__
+    combined = union_all(
+        select(*[hot.c[name] for name in _DOCUMENT_COLUMNS]),
+        select(*[cold.c[name] for name in _DOCUMENT_COLUMNS]),
+    ).subquery('all_documents')
+    return aliased(Document, combined)
+
+
+def count_all_documents(criteria=None) -> int:
+    """
+    Count hot and archived documents. ``criteria(model)`` returns the filter
+    clauses for Document or ArchivedDocument; each table is counted on its
+    own indexes instead of through the all_documents() UNION.
+    """
+    total = 0
+    for model in (Document, ArchivedDocument):
+        where = criteria(model) if criteria else []
+        total += db.session.execute(select(func.count(model.id)).where(*where)).scalar() or 0
+    return total
+
+
+def find_document_by_barcode(barcode: str):
+    """The hot or archived document using ``barcode``, or None."""
+    if not barcode:
+        return None
+    return (Document.query.filter_by(barcode=barcode).first()
+            or ArchivedDocument.query.filter_by(barcode=barcode).first())
+
+
+def all_processing_logs():
+    """
+    Return a ProcessingLog alias over hot + archived processing history.
+    Ids are only unique per table, so aggregate on other columns.
+    """
+    hot = ProcessingLog.__table__
+    cold = ArchivedProcessingLog.__table__
+    columns = ['id'] + _PROCESSING_COLUMNS
+    combined = union_all(
+        select(*[hot.c[name] for name in columns]),
+        select(*[cold.c[name] for name in columns]),
+    ).subquery('all_processing_logs')
+    return aliased(ProcessingLog, combined)
+
+
+class ArchivePagination(Pagination):
+    """
+    Paginate a user's archive as the UNION of the creator side and the
+    recipient side, so each branch is read in (user_id, timestamp) index order
+    instead of scanning the whole table for an OR filter. Each branch is cut
+    off at offset + per_page before the outer sort, and only the ids of the
+    page are loaded as full rows.
+    """
+
+    def _branches(self):
+        user_id = self._query_args["user_id"]
+        criteria = self._query_args.get("criteria") or []
+        return [
+            [ArchivedDocument.creator_id == user_id, *criteria],
+            [ArchivedDocument.recipient_id == user_id,
+             ArchivedDocument.creator_id != user_id, *criteria],
+        ]
+
+    def _query_items(self):
+        limit = self._query_offset + self.per_page
+        branches = []
+        for where in self._branches():
+            branch = (
+                select(ArchivedDocument.id, ArchivedDocument.timestamp)
+                .where(*where)
+                .order_by(ArchivedDocument.timestamp.desc())
+                .limit(limit)
+                .subquery()
+            )
+            branches.append(select(branch.c.id, branch.c.timestamp))
+        combined = union_all(*branches).subquery()
+        ids = db.session.execute(
+            select(combined.c.id)
+            .order_by(combined.c.timestamp.desc(), combined.c.id.desc())
+            .limit(self.per_page)
+            .offset(self._query_offset)
+        ).scalars().all()
+        if not ids:
+            return []
+        query = ArchivedDocument.query.filter(ArchivedDocument.id.in_(ids))
+        options = self._query_args.get("options") or []
+        if options:
+            query = query.options(*options)
+        by_id = {document.id: document for document in query.all()}
+        return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+    def _query_count(self):
+        return sum(
+            db.session.execute(
+                select(func.count()).select_from(ArchivedDocument).where(*where)
+            ).scalar() or 0
+            for where in self._branches()
+        )
+
+
+def paginate_user_archive(user_id: int, criteria=None, options=None, page=None,
+                          per_page=None, error_out=True) -> ArchivePagination:
+    """Paginate the archived documents a user created or received, newest first."""
+    return ArchivePagination(
+        page=page,
+        per_page=per_page,
+        error_out=error_out,
+        user_id=user_id,
+        criteria=list(criteria or []),
+        options=list(options or []),
+    )
+
+
+class HotAndArchivePagination(Pagination):
+    """
+    Paginate rows from a hot table and its archive table together, newest
+    first. Each source is (model, criteria, options); the page's (source, id)
+    keys come from a UNION ALL of the sources cut off at offset + per_page,
+    then each source loads only its ids of the page.
+    """
+
+    def _query_items(self):
+        sources = self._query_args["sources"]
+        limit = self._query_offset + self.per_page
+        branches = []
+        for index, (model, criteria, _options) in enumerate(sources):
+            branch = (
+                select(literal(index).label("source"), model.id.label("id"), model.timestamp.label("timestamp"))
+                .where(*criteria)
+                .order_by(model.timestamp.desc())
+                .limit(limit)
+                .subquery()
+            )
+            branches.append(select(branch.c.source, branch.c.id, branch.c.timestamp))
+        combined = union_all(*branches).subquery()
+        keys = db.session.execute(
+            select(combined.c.source, combined.c.id)
+            .order_by(combined.c.timestamp.desc(), combined.c.source, combined.c.id.desc())
+            .limit(self.per_page)
+            .offset(self._query_offset)
+        ).all()
+        loaded = {}
+        for index, (model, _criteria, options) in enumerate(sources):
+            ids = [row_id for source, row_id in keys if source == index]
+            if ids:
+                query = model.query.filter(model.id.in_(ids))
+                if options:
+                    query = query.options(*options)
+                loaded.update({(index, row.id): row for row in query.all()})
+        return [loaded[(source, row_id)] for source, row_id in keys if (source, row_id) in loaded]
+
+    def _query_count(self):
+        return sum(
+            db.session.execute(select(func.count(model.id)).where(*criteria)).scalar() or 0
+            for model, criteria, _options in self._query_args["sources"]
+        )
+
+
+def paginate_documents_with_archive(criteria=None, options=None, page=None, per_page=None,
+                                    error_out=True) -> HotAndArchivePagination:
+    """Paginate hot and archived documents, newest first; ``criteria(model)`` builds each table's filters."""
+    return HotAndArchivePagination(
+        page=page, per_page=per_page, error_out=error_out,
+        sources=[(model, list(criteria(model)) if criteria else [], list(options or []))
+                 for model in (Document, ArchivedDocument)],
+    )
+
+
+def paginate_activities_with_archive(page=None, per_page=None, error_out=True) -> HotAndArchivePagination:
+    """Paginate hot and archived activity logs, newest first."""
+    return HotAndArchivePagination(
+        page=page, per_page=per_page, error_out=error_out,
+        sources=[(ActivityLog, [], []), (ArchivedActivityLog, [], [])],
+    )
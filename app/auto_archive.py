@@ -1,29 +1,170 @@
+import json
+import os
+import time
 from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert, or_, update
+
 from app import db
-from app.models import Document, ActivityLog
+from app.archive_storage import move_documents_to_archive, raise_document_id_floor
+from app.models import Document, ActivityLog, document_status_rank
+
+DEFAULT_CHUNK_SIZE = 1000
+CHECKPOINT_FILENAME = "archive_checkpoint.json"
+
+
+def _checkpoint_path() -> str:
+    instance_path = getattr(current_app, "instance_path", None) or "."
+    return os.path.join(instance_path, CHECKPOINT_FILENAME)
+
+
+def _read_checkpoint(cutoff: datetime):
+    """Return the saved checkpoint for this cutoff, or None to start fresh."""
+    try:
+        with open(_checkpoint_path(), "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        current_app.logger.warning("Ignoring unreadable archive checkpoint: %s", exc)
+        return None
+    if not isinstance(data, dict) or data.get("cutoff") != cutoff.isoformat():
+        return None
+    return data
+
+
+def _write_checkpoint(state) -> None:
+    path = _checkpoint_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _clear_checkpoint() -> None:
+    try:
+        os.remove(_checkpoint_path())
+    except FileNotFoundError:
+        pass
+
+
+def _archive_chunk(rows, now: datetime) -> int:
+    """
+    Flip one primary-key chunk to Archived, bulk-insert its activity rows and
+    move the chunk (with its history) into the archive tables.
+    """
+    doc_ids = [row.id for row in rows]
+    to_flip = [row for row in rows if row.status != 'Archived']
+    if to_flip:
+        db.session.execute(
+            update(Document.__table__)
+            .where(Document.__table__.c.id.in_([row.id for row in to_flip]))
+            .values(status='Archived', status_rank=document_status_rank('Archived'))
+        )
+        db.session.execute(
+            insert(ActivityLog.__table__),
+            [
+                {
+                    "user_id": row.creator_id,
+                    "document_id": row.id,
+                    "action": "Auto Archived",
+                    "remarks": "Automatically archived after one month.",
+                    "timestamp": now,
+                }
+                for row in to_flip
+            ],
+        )
+    move_documents_to_archive(doc_ids, archived_at=now)
+    return len(to_flip)
 
-def archive_old_documents():
+
+def archive_old_documents(chunk_size=None, throttle_seconds=None):
     """
     Archive documents created before the first day of the current month (i.e., made last month or earlier) that are not already archived.
+
+    Works in primary-key chunks with set-based UPDATE/INSERT statements and a
+    commit per chunk; each chunk is moved to the archive tables so the hot
+    tables only hold live work. Progress is checkpointed to the instance
+    folder so an interrupted run resumes after the last committed chunk.
     """
+    config = current_app.config
+    if chunk_size is None:
+        chunk_size = config.get("ARCHIVE_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    if throttle_seconds is None:
+        throttle_seconds = config.get("ARCHIVE_THROTTLE_SECONDS", 0)
+    chunk_size = max(int(chunk_size), 1)
+
+    raise_document_id_floor()
+
     current_date = datetime.utcnow()
     first_day_of_current_month = datetime(current_date.year, current_date.month, 1)
-    old_docs = Document.query.filter(
-        Document.timestamp < first_day_of_current_month,
-        Document.status != 'Archived'
-    ).all()
-
-    for doc in old_docs:
-        doc.status = 'Archived'
-        log = ActivityLog(
-            user=doc.creator,
-            document_id=doc.id,
-            action="Auto Archived",
-            remarks="Automatically archived after one month."
+
+    checkpoint = _read_checkpoint(first_day_of_current_month) or {
+        "cutoff": first_day_of_current_month.isoformat(),
+        "last_id": 0,
+        "archived": 0,
+        "chunks": 0,
+    }
+    if checkpoint["last_id"]:
+        current_app.logger.info(
+            "Resuming auto-archive after document #%s (%s already archived)",
+            checkpoint["last_id"], checkpoint["archived"],
         )
-        db.session.add(log)
-    db.session.commit()
-    return f"Archived {len(old_docs)} documents."
+
+    started = time.monotonic()
+    archived_this_run = 0
+    while True:
+        rows = (
+            db.session.query(Document.id, Document.creator_id, Document.status)
+            .filter(
+                Document.id > checkpoint["last_id"],
+                or_(
+                    Document.timestamp < first_day_of_current_month,
+                    # Manually archived documents still waiting in the hot table
+                    Document.status == 'Archived',
+                ),
+            )
+            .order_by(Document.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        try:
+            count = _archive_chunk(rows, datetime.utcnow())
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception(
+                "Auto-archive chunk after document #%s failed", checkpoint["last_id"]
+            )
+            raise
+
+        archived_this_run += count
+        checkpoint["last_id"] = rows[-1].id
+        checkpoint["archived"] += count
+        checkpoint["chunks"] += 1
+        _write_checkpoint(checkpoint)
+
+        elapsed = time.monotonic() - started
+        rate = archived_this_run / elapsed if elapsed > 0 else float(archived_this_run)
+        current_app.logger.info(
+            "Auto-archive progress: %s documents in %s chunks (last id %s, %.1f docs/s)",
+            checkpoint["archived"], checkpoint["chunks"], checkpoint["last_id"], rate,
+        )
+
+        if len(rows) < chunk_size:
+            break
+        if throttle_seconds:
+            time.sleep(throttle_seconds)
+
+    _clear_checkpoint()
+    elapsed = time.monotonic() - started
+    rate = archived_this_run / elapsed if elapsed > 0 else float(archived_this_run)
+    return f"Archived {checkpoint['archived']} documents ({rate:.1f} docs/s)."
 
 if __name__ == '__main__':
     print(archive_old_documents())
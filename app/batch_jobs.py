@@ -0,0 +1,270 @@
+"""
+Background batch-operation jobs.
+
+Selections at or above ``BATCH_ASYNC_THRESHOLD`` documents are recorded as a
+job with one ``batch_job_items`` row per document and processed in chunks by
+a worker pool (spawned processes with their own app and database
+connections), so a bulk forward of a whole backlog never holds a web worker.
+Each chunk runs through the set-based transition engine and commits together
+with its per-document outcomes and the job's progress counters. The worker
+holds a lease on the job (claimed_by / heartbeat_at, refreshed with every
+chunk) and only commits while it still holds it; jobs whose lease expired
+after a crash or restart are re-submitted by ``resume_batch_jobs`` and skip
+finished items.
+"""
+import json
+import multiprocessing
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, insert, or_, select, update
+
+from app import db
+from app.batch_transitions import ALLOWED_FROM, FORWARD, apply_batch_transition
+from app.models import BatchJob, BatchJobItem, User
+from app.utils import job_lease_cutoff, job_lease_owner
+
+DEFAULT_ASYNC_THRESHOLD = 200
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_WORKERS = 1
+
+SUCCEEDED = 'Succeeded'
+FAILED = 'Failed'
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_app = None
+
+
+def _config_int(key, default):
+    try:
+        return max(int(current_app.config.get(key, default)), 1)
+    except (TypeError, ValueError):
+        return default
+
+
+def async_threshold() -> int:
+    return _config_int('BATCH_ASYNC_THRESHOLD', DEFAULT_ASYNC_THRESHOLD)
+
+
+def should_run_async(document_ids) -> bool:
+    return len(set(document_ids)) >= async_threshold()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, not fork: children must not share the parent's DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=_config_int('BATCH_JOB_WORKERS', DEFAULT_WORKERS),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _init_worker():
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(start_scheduler=False)
+
+
+def submit_batch_job(user_id: int, action: str, document_ids, params: dict) -> BatchJob:
+    """Record a batch job with its document items and hand it to the worker pool."""
+    if action not in ALLOWED_FROM:
+        raise ValueError(f"Unknown batch action '{action}'")
+    ids = list(dict.fromkeys(int(doc_id) for doc_id in document_ids))
+    if not ids:
+        raise ValueError('No documents selected.')
+
+    job = BatchJob(user_id=user_id, action=action, params=json.dumps(params),
+                   total=len(ids), message='Queued', heartbeat_at=datetime.utcnow())
+    db.session.add(job)
+    db.session.flush()
+    db.session.execute(insert(BatchJobItem.__table__), [
+        {'job_id': job.id, 'document_id': doc_id} for doc_id in ids
+    ])
+    db.session.commit()
+    try:
+        _get_executor().submit(run_batch_job, job.id)
+    except Exception as exc:
+        job.status = 'Failed'
+        job.message = f'Could not start batch worker: {exc}'[:255]
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    return job
+
+
+def resume_batch_jobs() -> int:
+    """
+    Re-submit jobs whose worker went away (crash or restart): Running jobs
+    whose lease expired go back to Queued, and Queued jobs nobody picked up
+    are handed to this process's pool again. Items that already have an
+    outcome are skipped, so each job picks up after its last committed chunk.
+    Run from one process only: the server entry point or ``flask resume-jobs``.
+    """
+    jobs = BatchJob.__table__
+    cutoff = job_lease_cutoff()
+    stale = or_(jobs.c.heartbeat_at.is_(None), jobs.c.heartbeat_at < cutoff)
+    job_ids = db.session.execute(
+        select(jobs.c.id).where(jobs.c.status.in_(('Queued', 'Running')), stale).order_by(jobs.c.id)
+    ).scalars().all()
+    resumed = []
+    for job_id in job_ids:
+        # Re-checked in the UPDATE: a live worker may have refreshed the lease meanwhile
+        requeued = db.session.execute(
+            update(jobs)
+            .where(jobs.c.id == job_id, jobs.c.status.in_(('Queued', 'Running')), stale)
+            .values(status='Queued', claimed_by=None, heartbeat_at=datetime.utcnow(),
+                    message='Queued (resumed after restart)')
+        )
+        if requeued.rowcount == 1:
+            resumed.append(job_id)
+    db.session.commit()
+    for job_id in resumed:
+        try:
+            _get_executor().submit(run_batch_job, job_id)
+        except Exception as exc:
+            db.session.execute(
+                update(jobs).where(jobs.c.id == job_id, jobs.c.status == 'Queued')
+                .values(status='Failed', message=f'Could not start batch worker: {exc}'[:255],
+                        finished_at=datetime.utcnow())
+            )
+            db.session.commit()
+    return len(resumed)
+
+
+def run_batch_job(job_id: int) -> None:
+    """Worker-process entry point."""
+    app = _worker_app
+    if app is None:
+        from app import create_app
+        app = create_app(start_scheduler=False)
+    with app.app_context():
+        jobs = BatchJob.__table__
+        owner = job_lease_owner()
+        now = datetime.utcnow()
+        # Claim the job atomically, so a job submitted twice still runs once
+        claimed = db.session.execute(
+            update(jobs)
+            .where(jobs.c.id == job_id, jobs.c.status == 'Queued')
+            .values(status='Running', message='Processing', claimed_by=owner, heartbeat_at=now,
+                    started_at=func.coalesce(jobs.c.started_at, now))
+        )
+        db.session.commit()
+        if claimed.rowcount != 1:
+            return
+        try:
+            finished = _process_job(job_id, owner)
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception("Batch job #%s failed", job_id)
+            _finish_job(job_id, owner, status='Failed', message=str(exc)[:255])
+            return
+        if not finished:
+            app.logger.warning("Batch job #%s: lease lost to another worker, stopping", job_id)
+            return
+        job = db.session.get(BatchJob, job_id)
+        _finish_job(job_id, owner, status='Completed', progress=100,
+                    message=f'{job.success_count} succeeded, {job.error_count} failed')
+
+
+def _finish_job(job_id: int, owner: str, **values) -> None:
+    jobs = BatchJob.__table__
+    db.session.execute(
+        update(jobs)
+        .where(jobs.c.id == job_id, jobs.c.status == 'Running', jobs.c.claimed_by == owner)
+        .values(finished_at=datetime.utcnow(), **values)
+    )
+    db.session.commit()
+
+
+def _process_job(job_id: int, owner: str) -> bool:
+    """Process the pending items chunk by chunk; False once another worker holds the lease."""
+    job = db.session.get(BatchJob, job_id)
+    params = json.loads(job.params or '{}')
+    actor = db.session.get(User, job.user_id)
+    if actor is None:
+        raise RuntimeError('The user who queued this job no longer exists.')
+    new_recipient = None
+    if job.action == FORWARD:
+        new_recipient = db.session.get(User, params.get('recipient_id'))
+        if new_recipient is None:
+            raise RuntimeError('The forwarding recipient no longer exists.')
+
+    chunk_size = _config_int('BATCH_JOB_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    jobs = BatchJob.__table__
+    items = BatchJobItem.__table__
+    while True:
+        # Pending items are re-read each time, so a restarted job resumes where it stopped
+        chunk_ids = db.session.execute(
+            select(items.c.document_id)
+            .where(items.c.job_id == job_id, items.c.outcome.is_(None))
+            .order_by(items.c.id)
+            .limit(chunk_size)
+        ).scalars().all()
+        if not chunk_ids:
+            return True
+
+        result = apply_batch_transition(
+            job.action, chunk_ids, actor,
+            reason=params.get('reason'),
+            new_recipient=new_recipient,
+            action_taken=params.get('action_taken'),
+            remarks=params.get('remarks'),
+        )
+        _record_outcomes(job_id, result)
+        processed = job.processed + len(chunk_ids)
+        # The chunk commits only while this worker holds the lease; counters are
+        # incremented in SQL so they never overwrite another writer's totals
+        kept = db.session.execute(
+            update(jobs)
+            .where(jobs.c.id == job_id, jobs.c.status == 'Running', jobs.c.claimed_by == owner)
+            .values(processed=jobs.c.processed + len(chunk_ids),
+                    success_count=jobs.c.success_count + result.success_count,
+                    error_count=jobs.c.error_count + result.error_count,
+                    progress=min(int(processed * 100 / job.total), 99) if job.total else 99,
+                    heartbeat_at=datetime.utcnow())
+        )
+        if kept.rowcount != 1:
+            db.session.rollback()
+            return False
+        db.session.commit()
+
+
+def _record_outcomes(job_id: int, result) -> None:
+    items = BatchJobItem.__table__
+    # Only items still pending: a finished outcome is never overwritten
+    scope = (items.c.job_id == job_id) & items.c.outcome.is_(None)
+    if result.succeeded:
+        db.session.execute(
+            update(items)
+            .where(scope, items.c.document_id.in_(result.succeeded))
+            .values(outcome=SUCCEEDED)
+        )
+    # Failure reasons take few distinct values, so group them into one UPDATE each
+    by_reason = defaultdict(list)
+    for doc_id, reason in result.failed.items():
+        by_reason[reason].append(doc_id)
+    for reason, doc_ids in by_reason.items():
+        db.session.execute(
+            update(items)
+            .where(scope, items.c.document_id.in_(doc_ids))
+            .values(outcome=FAILED, reason=reason[:255])
+        )
+
+
+def job_failures(job_id: int, limit: int = 200):
+    """Failed items of a job as dicts, oldest first."""
+    items = BatchJobItem.__table__
+    rows = db.session.execute(
+        select(items.c.document_id, items.c.reason)
+        .where(items.c.job_id == job_id, items.c.outcome == FAILED)
+        .order_by(items.c.id)
+        .limit(limit)
+    )
+    return [{'document_id': document_id, 'reason': reason} for document_id, reason in rows]
@@ -0,0 +1,237 @@
+"""
+Set-based status transitions for a selection of documents.
+
+The selected documents (and, for forwards, their open processing logs) are
+loaded with one ``IN`` query each, permissions and states are checked in
+memory, and the document updates, notifications, activity logs and
+processing logs are written with bulk statements. The caller owns the
+transaction.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, select, update
+
+from app import db
+from app.models import ActivityLog, Document, Notification, ProcessingLog, User, document_status_rank
+
+ACCEPT = 'accept'
+DECLINE = 'decline'
+FORWARD = 'forward'
+RELEASE = 'release'
+
+# Statuses a document must be in for the transition; None means any status
+ALLOWED_FROM = {
+    ACCEPT: ('Pending', 'Forwarded'),
+    DECLINE: None,
+    FORWARD: ('Accepted', 'Forwarded'),
+    RELEASE: None,
+}
+
+ACTIVITY_LABELS = {
+    ACCEPT: 'Batch Accepted',
+    DECLINE: 'Batch Declined',
+    FORWARD: 'Batch Forwarded',
+    RELEASE: 'Batch Released',
+}
+
+
+@dataclass
+class TransitionResult:
+    action: str
+    succeeded: List[int] = field(default_factory=list)
+    failed: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def success_count(self) -> int:
+        return len(self.succeeded)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.failed)
+
+    def merge(self, other: 'TransitionResult') -> None:
+        self.succeeded.extend(other.succeeded)
+        self.failed.update(other.failed)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'action': self.action,
+            'success_count': self.success_count,
+            'error_count': self.error_count,
+            'succeeded': list(self.succeeded),
+            'failed': {str(doc_id): reason for doc_id, reason in self.failed.items()},
+        }
+
+
+def _unique_ids(document_ids: Iterable) -> List[int]:
+    seen = set()
+    ids = []
+    for doc_id in document_ids:
+        doc_id = int(doc_id)
+        if doc_id not in seen:
+            seen.add(doc_id)
+            ids.append(doc_id)
+    return ids
+
+
+def apply_batch_transition(
+    action: str,
+    document_ids: Iterable,
+    actor: User,
+    *,
+    reason: Optional[str] = None,
+    new_recipient: Optional[User] = None,
+    action_taken: Optional[str] = None,
+    remarks: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> TransitionResult:
+    """
+    Apply ``action`` (accept, decline, forward or release) to the documents
+    the actor has received. Documents that are missing, not addressed to the
+    actor or in the wrong state are reported in ``result.failed``.
+    """
+    if action not in ALLOWED_FROM:
+        raise ValueError(f"Unknown batch action '{action}'")
+    if action == FORWARD and new_recipient is None:
+        raise ValueError('A recipient is required to forward documents')
+
+    now = now or datetime.utcnow()
+    result = TransitionResult(action=action)
+    ids = _unique_ids(document_ids)
+    if not ids:
+        return result
+
+    documents = Document.__table__
+    rows = {
+        row.id: row
+        for row in db.session.execute(
+            select(documents.c.id, documents.c.title, documents.c.status,
+                   documents.c.creator_id, documents.c.recipient_id)
+            .where(documents.c.id.in_(ids))
+            .with_for_update()
+        )
+    }
+
+    allowed = ALLOWED_FROM[action]
+    selected = []
+    for doc_id in ids:
+        row = rows.get(doc_id)
+        if row is None:
+            result.failed[doc_id] = 'Document not found'
+        elif row.recipient_id != actor.id:
+            result.failed[doc_id] = 'Not authorized'
+        elif allowed is not None and row.status not in allowed:
+            result.failed[doc_id] = f"Cannot {action} a document that is {row.status}"
+        else:
+            selected.append(row)
+    if not selected:
+        return result
+
+    selected_ids = [row.id for row in selected]
+    values = _document_values(action, now, reason, new_recipient, action_taken, remarks)
+    db.session.execute(update(documents).where(documents.c.id.in_(selected_ids)).values(**values))
+
+    db.session.execute(insert(Notification.__table__), [
+        _notification(action, row, actor, reason, new_recipient, now) for row in selected
+    ])
+    db.session.execute(insert(ActivityLog.__table__), [
+        {
+            'user_id': actor.id,
+            'document_id': row.id,
+            'action': ACTIVITY_LABELS[action],
+            'remarks': _activity_remarks(action, reason, new_recipient),
+            'timestamp': now,
+        }
+        for row in selected
+    ])
+
+    if action == ACCEPT:
+        db.session.execute(insert(ProcessingLog.__table__), [
+            {'user_id': actor.id, 'document_id': doc_id, 'accepted_timestamp': now}
+            for doc_id in selected_ids
+        ])
+    elif action == FORWARD:
+        _close_processing_logs(selected_ids, actor, now)
+
+    result.succeeded.extend(selected_ids)
+    return result
+
+
+def _document_values(action, now, reason, new_recipient, action_taken, remarks):
+    if action == ACCEPT:
+        status = 'Accepted'
+        values = {'accepted_timestamp': now}
+    elif action == DECLINE:
+        status = 'Declined'
+        values = {'remarks': reason}
+    elif action == FORWARD:
+        status = 'Pending'
+        values = {
+            'recipient_id': new_recipient.id,
+            'action_taken': action_taken,
+            'remarks': remarks,
+            'forwarded_timestamp': now,
+        }
+    else:
+        status = 'Released'
+        values = {'released_timestamp': now}
+    # Bulk UPDATEs bypass the model validator, so keep status_rank in step here
+    values.update(status=status, status_rank=document_status_rank(status))
+    return values
+
+
+def _notification(action, row, actor, reason, new_recipient, now):
+    if action == ACCEPT:
+        user_id = row.creator_id
+        message = f"Your document '{row.title}' has been accepted by {actor.username}"
+    elif action == DECLINE:
+        user_id = row.creator_id
+        message = f"Your document '{row.title}' has been declined. Reason: {reason}"
+    elif action == FORWARD:
+        user_id = new_recipient.id
+        message = f"Document '{row.title}' has been forwarded to you by {actor.username}"
+    else:
+        user_id = row.creator_id
+        message = f"Your document '{row.title}' has been released."
+    # Notification.message is VARCHAR(200)
+    return {'user_id': user_id, 'message': message[:200], 'is_read': False, 'timestamp': now}
+
+
+def _activity_remarks(action, reason, new_recipient):
+    if action == ACCEPT:
+        return 'Document accepted via batch operation'
+    if action == DECLINE:
+        return reason
+    if action == FORWARD:
+        return f'Forwarded to {new_recipient.username}'
+    return 'Document released via batch operation'
+
+
+def _close_processing_logs(doc_ids: List[int], actor: User, now: datetime) -> None:
+    """Stamp the latest open processing log of each document, creating one where none is open."""
+    logs = ProcessingLog.__table__
+    latest = {}
+    for log_id, document_id, accepted in db.session.execute(
+        select(logs.c.id, logs.c.document_id, logs.c.accepted_timestamp)
+        .where(logs.c.document_id.in_(doc_ids), logs.c.forwarded_timestamp.is_(None))
+    ):
+        current = latest.get(document_id)
+        if current is None or (accepted or datetime.min) > (current[1] or datetime.min):
+            latest[document_id] = (log_id, accepted)
+
+    if latest:
+        db.session.execute(
+            update(logs)
+            .where(logs.c.id.in_([log_id for log_id, _ in latest.values()]))
+            .values(forwarded_timestamp=now)
+        )
+    missing = [doc_id for doc_id in doc_ids if doc_id not in latest]
+    if missing:
+        db.session.execute(insert(logs), [
+            {'user_id': actor.id, 'document_id': doc_id, 'accepted_timestamp': now, 'forwarded_timestamp': now}
+            for doc_id in missing
+        ])
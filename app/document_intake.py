@@ -0,0 +1,272 @@
+"""
+Bulk document intake from a CSV (or .xlsx) upload.
+
+Every row is validated in one pass against lookups loaded up front (active
+recipients, allowed offices and action values, barcodes already in use).
+Valid rows are then written per chunk: one multi-row INSERT for the
+documents and one each for the recipients' notifications and the "Created"
+activity logs, committed together.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import func, insert, select
+
+from app import db
+from app.models import ActivityLog, ArchivedDocument, Document, Notification, User, document_status_rank
+
+try:  # Optional: .xlsx uploads need openpyxl
+    from openpyxl import load_workbook
+except Exception:  # pragma: no cover - depends on the deployment
+    load_workbook = None
+
+INTAKE_COLUMNS = ('title', 'office', 'classification', 'barcode', 'recipient', 'remarks', 'action_taken')
+REQUIRED_COLUMNS = ('title', 'office', 'classification', 'recipient')
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_ACTION_TAKEN = 'For Review'
+MAX_ROWS = 20000
+
+# Column limits from the Document model
+_MAX_LENGTHS = {'title': 100, 'office': 100, 'classification': 50, 'barcode': 50, 'action_taken': 50}
+_LOOKUP_CHUNK = 1000
+
+
+class IntakeFileError(ValueError):
+    """The upload itself cannot be read (wrong type, missing columns, too many rows)."""
+
+
+class IntakeInsertError(RuntimeError):
+    """
+    Writing a chunk failed after earlier chunks were committed; ``result``
+    counts the documents already created and ``first_row`` is the first
+    spreadsheet row that was not imported.
+    """
+
+    def __init__(self, result: 'IntakeResult', first_row: int, cause: Exception):
+        super().__init__(str(cause))
+        self.result = result
+        self.first_row = first_row
+
+
+@dataclass
+class RowError:
+    row: int
+    column: Optional[str]
+    message: str
+
+
+@dataclass
+class IntakeResult:
+    total_rows: int = 0
+    created: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def error_rows(self) -> int:
+        return len({error.row for error in self.errors})
+
+
+def xlsx_available() -> bool:
+    return load_workbook is not None
+
+
+def read_intake_rows(stream, filename: str) -> List[Dict[str, str]]:
+    """Read an uploaded CSV/XLSX into dicts keyed by lower-cased header."""
+    name = (filename or '').lower()
+    if name.endswith('.xlsx'):
+        if load_workbook is None:
+            raise IntakeFileError('Spreadsheet uploads need openpyxl; please upload a CSV file instead.')
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    elif name.endswith('.csv'):
+        # utf-8-sig strips the BOM Excel writes at the start of CSV exports
+        rows = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    else:
+        raise IntakeFileError('Unsupported file type. Upload a .csv or .xlsx file.')
+
+    header = next(rows, None)
+    if not header:
+        raise IntakeFileError('The file is empty.')
+    header = [str(cell or '').strip().lower() for cell in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise IntakeFileError(f"Missing required column(s): {', '.join(missing)}")
+
+    records = []
+    for values in rows:
+        values = ['' if value is None else str(value).strip() for value in values]
+        if not any(values):
+            continue
+        records.append({key: (values[index] if index < len(values) else '')
+                        for index, key in enumerate(header) if key in INTAKE_COLUMNS})
+        if len(records) > MAX_ROWS:
+            raise IntakeFileError(f'Too many rows: the limit is {MAX_ROWS} per upload.')
+    return records
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _existing_barcodes(barcodes: Sequence[str]) -> set:
+    """Lower-cased barcodes already used by hot or archived documents, via the indexed barcode columns."""
+    found = set()
+    for model in (Document, ArchivedDocument):
+        for chunk in _chunks(barcodes, _LOOKUP_CHUNK):
+            found.update(
+                value.lower() for value in db.session.execute(
+                    select(model.barcode).where(model.barcode.in_(chunk))
+                ).scalars() if value
+            )
+    return found
+
+
+def _recipient_lookup(creator: User) -> Dict[str, tuple]:
+    """Active users other than the creator, keyed by lower-cased username and by id."""
+    lookup = {}
+    rows = db.session.execute(
+        select(User.id, User.username).where(User.status == 'Active', User.id != creator.id)
+    )
+    for user_id, username in rows:
+        lookup[username.lower()] = (user_id, username)
+        lookup[str(user_id)] = (user_id, username)
+    return lookup
+
+
+def validate_rows(records: List[Dict[str, str]], creator: User, offices: Iterable[str],
+                  action_values: Iterable[str]) -> tuple:
+    """
+    Check every row against the preloaded lookups. Returns (valid, errors)
+    where ``valid`` holds (row_number, values) pairs ready to insert. Row
+    numbers count the header as row 1, matching what a spreadsheet shows.
+    """
+    offices = {office.lower(): office for office in offices}
+    action_values = {value.lower(): value for value in action_values}
+    recipients = _recipient_lookup(creator)
+    file_barcodes = sorted({record.get('barcode') or '' for record in records} - {''})
+    taken = _existing_barcodes(file_barcodes)
+
+    valid, errors, seen_barcodes = [], [], {}
+    for row_number, record in enumerate(records, start=2):
+        row_errors = []
+        for column in ('title', 'classification'):
+            if not record.get(column):
+                row_errors.append(RowError(row_number, column, f'{column.capitalize()} is required'))
+        for column, limit in _MAX_LENGTHS.items():
+            if len(record.get(column) or '') > limit:
+                row_errors.append(RowError(row_number, column, f'Longer than {limit} characters'))
+
+        office = offices.get((record.get('office') or '').lower())
+        if office is None:
+            row_errors.append(RowError(row_number, 'office', f"Unknown office '{record.get('office', '')}'"))
+
+        recipient = recipients.get((record.get('recipient') or '').lower())
+        if recipient is None:
+            row_errors.append(RowError(row_number, 'recipient',
+                                       f"Unknown or inactive recipient '{record.get('recipient', '')}'"))
+
+        action_taken = DEFAULT_ACTION_TAKEN
+        if record.get('action_taken'):
+            action_taken = action_values.get(record['action_taken'].lower())
+            if action_taken is None:
+                row_errors.append(RowError(row_number, 'action_taken',
+                                           f"Unknown action '{record['action_taken']}'"))
+
+        barcode = record.get('barcode') or None
+        if barcode:
+            key = barcode.lower()
+            if key in taken:
+                row_errors.append(RowError(row_number, 'barcode', f"Barcode '{barcode}' is already in use"))
+            elif key in seen_barcodes:
+                row_errors.append(RowError(row_number, 'barcode',
+                                           f"Barcode '{barcode}' repeats row {seen_barcodes[key]}"))
+            else:
+                seen_barcodes[key] = row_number
+
+        if row_errors:
+            errors.extend(row_errors)
+            continue
+        valid.append((row_number, {
+            'title': record['title'],
+            'office': office,
+            'classification': record['classification'],
+            'barcode': barcode,
+            'remarks': record.get('remarks') or None,
+            'action_taken': action_taken,
+            'recipient_id': recipient[0],
+        }))
+    return valid, errors
+
+
+def _chunk_size(chunk_size=None) -> int:
+    if chunk_size:
+        return max(int(chunk_size), 1)
+    try:
+        return max(int(current_app.config.get('INTAKE_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)), 1)
+    except (TypeError, ValueError):
+        return DEFAULT_CHUNK_SIZE
+
+
+def _insert_chunk(rows: List[Dict], creator: User, stamp: datetime) -> List[int]:
+    documents = Document.__table__
+    last_id = db.session.execute(select(func.max(documents.c.id))).scalar() or 0
+    db.session.execute(insert(documents), [
+        dict(row, status='Pending', status_rank=document_status_rank('Pending'),
+             creator_id=creator.id, timestamp=stamp, no_dtas_flag=False)
+        for row in rows
+    ])
+    # MySQL has no INSERT ... RETURNING. A multi-row INSERT assigns ids in row
+    # order, so read back this creator's rows above the previous high-water mark.
+    ids = db.session.execute(
+        select(documents.c.id)
+        .where(documents.c.id > last_id, documents.c.creator_id == creator.id,
+               documents.c.timestamp == stamp)
+        .order_by(documents.c.id)
+    ).scalars().all()
+    if len(ids) != len(rows):
+        raise RuntimeError('Could not match inserted documents to their rows; the chunk was rolled back.')
+
+    db.session.execute(insert(Notification.__table__), [
+        {'user_id': row['recipient_id'], 'message': f"You have received a new document: {row['title']}"[:200],
+         'is_read': False, 'timestamp': stamp}
+        for row in rows
+    ])
+    db.session.execute(insert(ActivityLog.__table__), [
+        {'user_id': creator.id, 'document_id': doc_id, 'action': 'Created',
+         'remarks': row['remarks'] or '', 'timestamp': stamp}
+        for doc_id, row in zip(ids, rows)
+    ])
+    return ids
+
+
+def intake_documents(records: List[Dict[str, str]], creator: User, offices: Iterable[str],
+                     action_values: Iterable[str], skip_invalid: bool = False,
+                     chunk_size=None) -> IntakeResult:
+    """
+    Validate and insert the uploaded rows. Unless ``skip_invalid`` is set,
+    any row error rejects the whole upload so it can be fixed and re-sent.
+    """
+    result = IntakeResult(total_rows=len(records))
+    valid, result.errors = validate_rows(records, creator, offices, action_values)
+    if result.errors and not skip_invalid:
+        return result
+
+    # Whole seconds: MySQL DATETIME columns drop fractions, and the stamp is matched exactly
+    stamp = datetime.utcnow().replace(microsecond=0)
+    for chunk in _chunks(valid, _chunk_size(chunk_size)):
+        try:
+            _insert_chunk([values for _, values in chunk], creator, stamp)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            # Earlier chunks are committed; say so, or the file gets re-sent and duplicated
+            raise IntakeInsertError(result, chunk[0][0], exc) from exc
+        result.created += len(chunk)
+    return result
@@ -0,0 +1,51 @@
+"""
+HR aggregates over the normalized PDS child tables.
+
+Each question is one SQL statement (a GROUP BY or an indexed lookup) instead
+of loading every Employee and parsing its JSON sections in Python.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import distinct, func, select
+
+from app import db
+from app.models import Employee, EmployeeCivilService, EmployeeLearningDev
+
+
+def employees_with_eligibility(career_service: str, limit: Optional[int] = None) -> List[Employee]:
+    """Employees holding the given civil service eligibility (uses ix_emp_cse_career_employee)."""
+    holders = select(EmployeeCivilService.employee_id).where(EmployeeCivilService.career_service == career_service)
+    query = Employee.query.filter(Employee.id.in_(holders)).order_by(Employee.bio_number.asc())
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def eligibility_counts_by_office() -> List[Dict]:
+    """Number of employees per (office, eligibility)."""
+    rows = db.session.execute(
+        select(Employee.office, EmployeeCivilService.career_service, func.count(distinct(Employee.id)))
+        .join(EmployeeCivilService, EmployeeCivilService.employee_id == Employee.id)
+        .where(EmployeeCivilService.career_service.isnot(None))
+        .group_by(Employee.office, EmployeeCivilService.career_service)
+        .order_by(Employee.office, EmployeeCivilService.career_service)
+    )
+    return [{'office': office, 'career_service': career_service, 'employees': count}
+            for office, career_service, count in rows]
+
+
+def learning_dev_hours_by_office(ld_type: Optional[str] = None) -> List[Dict]:
+    """Total L&D hours and participating employees per office, optionally for one L&D type."""
+    statement = (
+        select(Employee.office, func.coalesce(func.sum(EmployeeLearningDev.hours_value), 0),
+               func.count(distinct(Employee.id)))
+        .join(EmployeeLearningDev, EmployeeLearningDev.employee_id == Employee.id)
+        .group_by(Employee.office)
+        .order_by(Employee.office)
+    )
+    if ld_type:
+        statement = statement.where(EmployeeLearningDev.ld_type == ld_type)
+    return [{'office': office, 'hours': float(hours or 0), 'employees': count}
+            for office, hours, count in db.session.execute(statement)]
@@ -0,0 +1,175 @@
+"""
+Employee Records search.
+
+The search box matches surname, first name, display name and biometric number
+by token prefix ("dela cr" finds "Dela Cruz, Juan") and ranks the hits: exact
+surname, then surname prefix, first name, biometric number and display name.
+
+- A query equal to a biometric number is answered from the unique bio_number
+  index and returns that employee alone.
+- A query naming an office, position or status filters on that value.
+- Otherwise the tokens go to the text index the a7c9e1f3b528 migration built
+  for the database: a FULLTEXT index on MySQL, an FTS5 table on SQLite. Tokens
+  FULLTEXT cannot serve (shorter than its minimum word length, or stopwords
+  such as "de"/"la") are checked against the rows the FULLTEXT match found.
+  Databases without a text index (PostgreSQL, which gets trigram GIN indexes)
+  and all-short queries use prefix LIKEs on the indexed name and bio columns,
+  plus a word match inside employee_name for rows that only have that filled.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, func, inspect, literal_column, or_, select, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import Employee
+
+FULLTEXT_INDEX = 'ft_employees_search'
+FTS_TABLE = 'employees_fts'
+MAX_SEARCH_TOKENS = 5
+
+# InnoDB defaults: innodb_ft_min_token_size and the built-in stopword list
+FULLTEXT_MIN_TOKEN_LENGTH = 3
+FULLTEXT_STOPWORDS = frozenset((
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how', 'i', 'in',
+    'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'who',
+    'will', 'with', 'und', 'www',
+))
+
+# Text index available per database URL, detected on first search
+_text_indexes: Dict[str, Optional[str]] = {}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(search_query: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall((search_query or '').lower()):
+        if token not in tokens:
+            tokens.append(token)
+    return tokens[:MAX_SEARCH_TOKENS]
+
+
+def _prefix_pattern(token: str) -> str:
+    return token.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _text_index(bind) -> Optional[str]:
+    key = str(bind.url)
+    if key not in _text_indexes:
+        kind = None
+        try:
+            inspector = inspect(bind)
+            if bind.dialect.name in ('mysql', 'mariadb'):
+                if any(index.get('name') == FULLTEXT_INDEX for index in inspector.get_indexes(Employee.__tablename__)):
+                    kind = 'fulltext'
+            elif bind.dialect.name == 'sqlite':
+                if inspector.has_table(FTS_TABLE):
+                    kind = 'fts5'
+        except SQLAlchemyError:
+            kind = None
+        _text_indexes[key] = kind
+    return _text_indexes[key]
+
+
+def _prefix_condition(token: str, dialect_name: str):
+    pattern = _prefix_pattern(token)
+    columns = (Employee.surname, Employee.first_name, Employee.employee_name, Employee.bio_number)
+    # Later words of the display name ("Dela Cruz, Juan" for "juan" or "cruz"):
+    # employees may have only employee_name filled in
+    word_pattern = f'% {pattern}'
+    if dialect_name in ('mysql', 'mariadb'):
+        # The case-insensitive collation lets a plain LIKE range-scan the B-tree indexes
+        return or_(*[column.like(pattern, escape='\\') for column in columns],
+                   Employee.employee_name.like(word_pattern, escape='\\'))
+    # ILIKE is what PostgreSQL's trigram indexes serve
+    return or_(*[column.ilike(pattern, escape='\\') for column in columns],
+               Employee.employee_name.ilike(word_pattern, escape='\\'))
+
+
+def _rank(tokens: Iterable[str]):
+    """Relevance of a candidate row: per token, the best of its surname/first name/bio/display name matches."""
+    score = literal_column('0')
+    for token in tokens:
+        pattern = _prefix_pattern(token)
+        score = score + case(
+            (func.lower(Employee.surname) == token, 8),
+            (Employee.surname.ilike(pattern, escape='\\'), 4),
+            (func.lower(Employee.first_name) == token, 3),
+            (Employee.first_name.ilike(pattern, escape='\\'), 2),
+            (Employee.bio_number.ilike(pattern, escape='\\'), 2),
+            else_=1,
+        )
+    return score
+
+
+def _value_filter(search_query: str, offices: Iterable[str]):
+    """Filter for a query that is exactly an office, position or status value, else None."""
+    wanted = search_query.strip().lower()
+    for column, values in ((Employee.office, offices),
+                           (Employee.position, ('Job Order Worker', 'Contract of Service')),
+                           (Employee.status, ('Active', 'Inactive'))):
+        for value in values:
+            if value.lower() == wanted:
+                return column == value
+    return None
+
+
+def search_employees(search_query: str, offices: Iterable[str] = ()):
+    """Employee query for the Employee Records search box, best match first (the caller paginates)."""
+    search_query = (search_query or '').strip()
+    if not search_query:
+        return Employee.query.order_by(Employee.bio_number.asc())
+
+    exact = db.session.execute(
+        select(Employee.id).where(Employee.bio_number == search_query)
+    ).scalar_one_or_none()
+    if exact is not None:
+        return Employee.query.filter(Employee.id == exact)
+
+    value_filter = _value_filter(search_query, offices)
+    if value_filter is not None:
+        return Employee.query.filter(value_filter).order_by(Employee.bio_number.asc())
+
+    tokens = search_tokens(search_query)
+    if not tokens:
+        return Employee.query.filter(Employee.bio_number.like(_prefix_pattern(search_query), escape='\\')) \
+            .order_by(Employee.bio_number.asc())
+
+    bind = db.session.get_bind(mapper=Employee.__mapper__)
+    text_index = _text_index(bind)
+    conditions = []
+    prefix_tokens = tokens
+    if text_index == 'fulltext':
+        fulltext_tokens = [token for token in tokens
+                           if len(token) >= FULLTEXT_MIN_TOKEN_LENGTH and token not in FULLTEXT_STOPWORDS]
+        if fulltext_tokens:
+            conditions.append(
+                match(Employee.surname, Employee.first_name, Employee.employee_name, Employee.bio_number,
+                      against=' '.join(f'+{token}*' for token in fulltext_tokens)).in_boolean_mode()
+            )
+            # The FULLTEXT match already narrowed the rows; the rest only need a
+            # substring check so "dela cr" still finds "Dela Cruz, Juan"
+            conditions.extend(
+                or_(Employee.employee_name.like(f'%{_prefix_pattern(token)}', escape='\\'),
+                    Employee.bio_number.like(_prefix_pattern(token), escape='\\'))
+                for token in tokens if token not in fulltext_tokens
+            )
+            prefix_tokens = []
+    elif text_index == 'fts5':
+        conditions.append(Employee.id.in_(
+            select(literal_column('rowid')).select_from(text(FTS_TABLE))
+            .where(text(f'{FTS_TABLE} MATCH :fts_query').bindparams(
+                fts_query=' '.join(f'"{token}"*' for token in tokens)))
+        ))
+        prefix_tokens = []
+
+    conditions.extend(_prefix_condition(token, bind.dialect.name) for token in prefix_tokens)
+
+    return Employee.query.filter(and_(*conditions)).order_by(
+        _rank(tokens).desc(), Employee.employee_name.asc(), Employee.bio_number.asc()
+    )
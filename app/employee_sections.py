@@ -0,0 +1,191 @@
+"""
+Employee profile sections.
+
+The profile modal is split into sections that can be read and patched on
+their own: each section names the Employee columns and PDS record lists it
+owns, the deferred column groups and child tables needed to load it, and
+(for lazily loaded tabs) the template that renders its tab pane.
+Section payloads carry a content hash used as the HTTP ETag.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import selectinload, undefer_group
+
+from app.models import EDUCATION_FIELD_NAMES, Employee
+
+EDUCATION_LEVEL_PREFIXES = ('elem', 'sec', 'voc', 'college', 'grad')
+
+EMPLOYMENT_FIELDS = ('bio_number', 'office', 'position', 'status')
+PERSONAL_FIELDS = (
+    'surname', 'first_name', 'middle_name', 'name_extension',
+    'date_of_birth', 'place_of_birth', 'sex', 'civil_status',
+    'height_m', 'weight_kg', 'blood_type',
+    'gsis_id_no', 'pagibig_id_no', 'philhealth_no', 'sss_no', 'tin', 'agency_employee_no',
+    'citizenship', 'citizenship_details',
+)
+ADDRESS_FIELDS = (
+    'res_house_lot', 'res_street', 'res_subdivision', 'res_barangay',
+    'res_city_municipality', 'res_province', 'res_zip_code',
+    'perm_house_lot', 'perm_street', 'perm_subdivision', 'perm_barangay',
+    'perm_city_municipality', 'perm_province', 'perm_zip_code',
+    'telephone_no', 'mobile_no', 'email_address',
+)
+FAMILY_FIELDS = (
+    'spouse_surname', 'spouse_first_name', 'spouse_middle_name', 'spouse_occupation',
+    'spouse_employer_name', 'spouse_business_address', 'spouse_telephone_no',
+    'father_surname', 'father_first_name', 'father_middle_name', 'father_extension',
+    'mother_maiden_surname', 'mother_maiden_first_name', 'mother_maiden_middle_name',
+    'children_info',
+)
+EDUCATION_FIELDS = tuple(f"{prefix}_{field}" for prefix in EDUCATION_LEVEL_PREFIXES for field in EDUCATION_FIELD_NAMES)
+
+VALID_POSITIONS = ('Job Order Worker', 'Contract of Service')
+VALID_STATUSES = ('Active', 'Inactive')
+
+
+@dataclass(frozen=True)
+class ProfileSection:
+    name: str
+    fields: Tuple[str, ...] = ()
+    record_columns: Tuple[str, ...] = ()
+    groups: Tuple[str, ...] = ()
+    relationships: Tuple[str, ...] = ()
+    # Tab pane rendered on demand; personal/addresses share the tab the modal opens on
+    template: Optional[str] = None
+
+
+PROFILE_SECTIONS: Dict[str, ProfileSection] = {
+    section.name: section for section in (
+        ProfileSection('personal', EMPLOYMENT_FIELDS + PERSONAL_FIELDS, groups=('personal',)),
+        ProfileSection('addresses', ADDRESS_FIELDS, groups=('address',)),
+        ProfileSection('family', FAMILY_FIELDS, groups=('family',),
+                       template='partials/employee_profile_sections/family.html'),
+        ProfileSection('education', EDUCATION_FIELDS,
+                       tuple(f"{prefix}_records_json" for prefix in EDUCATION_LEVEL_PREFIXES),
+                       groups=('education', 'records'), relationships=('education_entries',),
+                       template='partials/employee_profile_sections/education.html'),
+        ProfileSection('eligibility', record_columns=('civil_service_records_json',), groups=('records',),
+                       relationships=('civil_service_entries',),
+                       template='partials/employee_profile_sections/eligibility.html'),
+        ProfileSection('experience', record_columns=('work_experience_json',), groups=('records',),
+                       relationships=('work_experience_entries',),
+                       template='partials/employee_profile_sections/experience.html'),
+        ProfileSection('voluntary', record_columns=('voluntary_work_json',), groups=('records',),
+                       relationships=('voluntary_work_entries',),
+                       template='partials/employee_profile_sections/voluntary.html'),
+        ProfileSection('learning_dev', record_columns=('learning_dev_json',), groups=('records',),
+                       relationships=('learning_dev_entries',),
+                       template='partials/employee_profile_sections/learning_dev.html'),
+    )
+}
+
+EDITABLE_PROFILE_FIELDS = tuple(field for section in PROFILE_SECTIONS.values() for field in section.fields)
+EDITABLE_RECORD_COLUMNS = tuple(column for section in PROFILE_SECTIONS.values() for column in section.record_columns)
+
+# Record column -> key used in section payloads ('elem_records_json' -> 'elem_records')
+_RECORD_KEYS = {column: column.replace('_records_json', '_records').replace('_json', '_records')
+                for column in EDITABLE_RECORD_COLUMNS}
+
+
+class ProfileUpdateError(ValueError):
+    """A submitted profile value failed validation; the message is shown to the user."""
+
+
+def section_load_options(sections: Iterable[ProfileSection]):
+    """Query options that load exactly what the given sections read."""
+    groups = {group for section in sections for group in section.groups}
+    relationships = {name for section in sections for name in section.relationships}
+    return ([undefer_group(group) for group in sorted(groups)]
+            + [selectinload(getattr(Employee, name)) for name in sorted(relationships)])
+
+
+def section_payload(employee: Employee, section: ProfileSection) -> Dict:
+    data = {field: getattr(employee, field) or '' for field in section.fields}
+    for column in section.record_columns:
+        key = _RECORD_KEYS[column]
+        data[key] = getattr(employee, key)
+    return data
+
+
+def payload_etag(payload) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def _record_entries(value):
+    """Record lists arrive as JSON text (form posts) or as lists (JSON bodies)."""
+    if isinstance(value, list):
+        return value
+    try:
+        return json.loads(value or '')
+    except (TypeError, ValueError):
+        return []
+
+
+def apply_profile_updates(employee: Employee, data, valid_offices, fields=EDITABLE_PROFILE_FIELDS,
+                          record_columns=EDITABLE_RECORD_COLUMNS) -> Dict:
+    """
+    Apply the submitted keys that belong to ``fields``/``record_columns`` and
+    return {key: stored value}. Raises ProfileUpdateError before changing
+    anything when a value is invalid. The caller commits.
+    """
+    if 'bio_number' in fields and 'bio_number' in data:
+        new_bio = (data.get('bio_number') or '').strip()
+        if new_bio and new_bio != (employee.bio_number or ''):
+            dupe = Employee.query.filter(Employee.bio_number == new_bio, Employee.id != employee.id).first()
+            if dupe:
+                raise ProfileUpdateError(f'Biometric number is already taken by employee {dupe.employee_name}')
+    if 'office' in fields and 'office' in data:
+        office = (data.get('office') or '').strip()
+        if office and office not in valid_offices:
+            raise ProfileUpdateError('Invalid office selection')
+    if 'position' in fields and 'position' in data:
+        position = (data.get('position') or '').strip()
+        if position and position not in VALID_POSITIONS:
+            raise ProfileUpdateError('Invalid position selection')
+    if 'status' in fields and 'status' in data:
+        status = (data.get('status') or '').strip()
+        if status and status not in VALID_STATUSES:
+            raise ProfileUpdateError('Invalid status value')
+
+    updated = {}
+    normalized_education = {}
+    for column in record_columns:
+        if column in data:
+            records = employee.set_records(column, _record_entries(data.get(column)))
+            updated[column] = json.dumps(records)
+            if column.endswith('_records_json'):
+                # Education lists also re-sync their base columns below
+                normalized_education[column[:-len('_records_json')]] = records
+
+    for key in fields:
+        if key in data:
+            val = (data.get(key) or '').strip()
+            if key == 'children_info':
+                # normalize to single newline-separated entries
+                lines = [ln.strip() for ln in val.splitlines()]
+                val = '\n'.join(ln for ln in lines if ln)
+            setattr(employee, key, val if val != '' else None)
+            updated[key] = getattr(employee, key)
+
+    # Sync educational base columns with normalized lists (ensures consistency even if no base inputs were submitted)
+    for prefix, entries in normalized_education.items():
+        first_entry = entries[0] if entries else {}
+        for field in EDUCATION_FIELD_NAMES:
+            column_name = f"{prefix}_{field}"
+            value = (first_entry.get(field, '').strip() if first_entry else '')
+            setattr(employee, column_name, value if value != '' else None)
+            updated[column_name] = getattr(employee, column_name)
+
+    # Re-compose display name from surname and first_name if any of them provided
+    if ('surname' in updated) or ('first_name' in updated):
+        s = (employee.surname or '').strip()
+        f = (employee.first_name or '').strip()
+        employee.employee_name = f"{s}, {f}".strip(', ').strip()
+
+    return updated
@@ -1,14 +1,18 @@
+import re
 import pytz
 import json
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy.orm import deferred, validates
 from app import db, login_manager
 # Remove the to_local_time import as it's causing circular import
 from werkzeug.security import generate_password_hash, check_password_hash
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Served from the in-process user directory; see app.user_directory
+    from app.user_directory import load_principal
+    return load_principal(user_id)
 
 EDUCATION_FIELD_NAMES = (
     'school_name',
@@ -58,6 +62,52 @@ LEARNING_DEV_FIELD_NAMES = (
     'conducted_by'
 )
 
+# JSON record columns on Employee and the fields each entry keeps
+PDS_RECORD_COLUMNS = {
+    'elem_records_json': EDUCATION_FIELD_NAMES,
+    'sec_records_json': EDUCATION_FIELD_NAMES,
+    'voc_records_json': EDUCATION_FIELD_NAMES,
+    'college_records_json': EDUCATION_FIELD_NAMES,
+    'grad_records_json': EDUCATION_FIELD_NAMES,
+    'civil_service_records_json': CIVIL_SERVICE_FIELD_NAMES,
+    'work_experience_json': WORK_EXPERIENCE_FIELD_NAMES,
+    'voluntary_work_json': VOLUNTARY_WORK_FIELD_NAMES,
+    'learning_dev_json': LEARNING_DEV_FIELD_NAMES,
+}
+
+# JSON record column -> (Employee relationship holding its rows, education level)
+PDS_SECTION_RELATIONSHIPS = {
+    'elem_records_json': ('education_entries', 'elem'),
+    'sec_records_json': ('education_entries', 'sec'),
+    'voc_records_json': ('education_entries', 'voc'),
+    'college_records_json': ('education_entries', 'college'),
+    'grad_records_json': ('education_entries', 'grad'),
+    'civil_service_records_json': ('civil_service_entries', None),
+    'work_experience_json': ('work_experience_entries', None),
+    'voluntary_work_json': ('voluntary_work_entries', None),
+    'learning_dev_json': ('learning_dev_entries', None),
+}
+
+# PDS values are stored whole (TEXT); MySQL indexes on them use this prefix
+PDS_INDEX_PREFIX = 191
+
+def parse_hours(value):
+    """First number in a free-text hours value ('8', '40 hrs', '1.5'), or None"""
+    match = re.search(r'\d+(?:\.\d+)?', value or '')
+    return float(match.group(0)) if match else None
+
+def normalize_pds_entries(raw_entries, field_names):
+    """Keep dict entries with at least one non-blank field, trimmed to ``field_names``"""
+    normalized = []
+    if isinstance(raw_entries, list):
+        for entry in raw_entries:
+            if not isinstance(entry, dict):
+                continue
+            norm = {field: (entry.get(field) or '').strip() for field in field_names}
+            if any(norm.values()):
+                normalized.append(norm)
+    return normalized
+
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(20), unique=True, nullable=False)
@@ -98,9 +148,10 @@ class User(db.Model, UserMixin):
 
     def has_documents(self):
         """Check if user has any documents (created or received)"""
-        created_count = Document.query.filter_by(creator_id=self.id).count()
-        received_count = Document.query.filter_by(recipient_id=self.id).count()
-        return created_count > 0 or received_count > 0
+        for model in (Document, ArchivedDocument):
+            if db.session.query(model.id).filter((model.creator_id == self.id) | (model.recipient_id == self.id)).first():
+                return True
+        return False
 
     @property
     def name(self):
@@ -114,15 +165,9 @@ class User(db.Model, UserMixin):
         This is used by Flask-Login to determine if a user can log in.
         We only allow users with 'Active' status.
         """
-        print(f"DEBUG - Checking if user {self.username} is_active - status: '{self.status}'")
-        
-        # Explicit status check - anything except exactly 'Active' returns False
-        if self.status != 'Active':
-            print(f"User {self.username} NOT active - status is '{self.status}'")
-            return False
-        
-        print(f"User {self.username} IS active - has 'Active' status")
-        return True
+        # Explicit status check - anything except exactly 'Active' returns False.
+        # Flask-Login calls this several times per request, so keep it silent.
+        return self.status == 'Active'
 
 # Move these timezone functions here instead of importing
 def to_local_time(dt):
@@ -144,12 +189,29 @@ def format_timestamp(timestamp):
     local_time = timestamp.astimezone(manila_tz)
     return local_time.strftime('%B-%d-%Y at %I:%M %p')
 
+# Sort order of the received queue: actionable items first, Released last.
+# Stored on Document.status_rank so the queue can be read in index order.
+DOCUMENT_STATUS_RANKS = {
+    'Pending': 0,
+    'Accepted': 1,
+    'Forwarded': 2,
+    'Declined': 3,
+    'Released': 4,
+}
+DEFAULT_STATUS_RANK = 5
+
+def document_status_rank(status):
+    """Return the received-queue rank for a document status"""
+    return DOCUMENT_STATUS_RANKS.get(status, DEFAULT_STATUS_RANK)
+
 class Document(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     office = db.Column(db.String(100), nullable=False)
     classification = db.Column(db.String(50), nullable=False)
     status = db.Column(db.String(20), nullable=False, default='For Computation', server_default='For Computation')
+    # Kept in sync with status (see set_status_rank); bulk UPDATEs must set it too
+    status_rank = db.Column(db.SmallInteger, nullable=False, default=DEFAULT_STATUS_RANK, server_default=str(DEFAULT_STATUS_RANK))
 
     action_taken = db.Column(db.String(50), nullable=False)
     attachment = db.Column(db.String(200), nullable=True)
@@ -181,8 +243,17 @@ class Document(db.Model):
         db.Index('ix_doc_timestamp', 'timestamp'),
         db.Index('ix_doc_barcode', 'barcode'),
         db.Index('ix_doc_classification', 'classification'),
+        # Created view: creator_id = ? ORDER BY timestamp DESC
+        db.Index('ix_doc_creator_ts', 'creator_id', 'timestamp'),
+        # Archived documents keep their ids, so SQLite must not hand out max(id)+1 again
+        {'sqlite_autoincrement': True},
     )
 
+    @validates('status')
+    def set_status_rank(self, key, status):
+        self.status_rank = document_status_rank(status)
+        return status
+
     @property
     def last_activity_details(self):
         """Return the last user who sent the document and the timestamp"""
@@ -221,6 +292,9 @@ class Document(db.Model):
             'forwarded_timestamp': format_timestamp(self.forwarded_timestamp)
         }
 
+# Received view: recipient_id = ? ORDER BY status_rank, timestamp DESC
+db.Index('ix_doc_recipient_rank_ts', Document.recipient_id, Document.status_rank, Document.timestamp.desc())
+
 class ActivityLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -308,31 +382,19 @@ class SLAAlertPreference(db.Model):
         onupdate=datetime.utcnow,
     )
 
+    # The rows themselves are seeded by migration e8b2c4d6f013
     DEFAULTS = {
         'documents': True,
         'leave_requests': True,
         'ewp_records': True,
     }
 
-    @classmethod
-    def ensure_defaults(cls):
-        """
-        Ensure default preference rows exist. Safe to call multiple times.
-        """
-        created = False
-        for key, default in cls.DEFAULTS.items():
-            if not cls.query.filter_by(category=key).first():
-                db.session.add(cls(category=key, enabled=default))
-                created = True
-        if created:
-            db.session.flush()
-
     @classmethod
     def get_preferences_map(cls):
         """
         Return a dictionary of category -> enabled, falling back to defaults.
+        Default rows are seeded by migration, so reads never write.
         """
-        cls.ensure_defaults()
         prefs = {row.category: row.enabled for row in cls.query.all()}
         for key, default in cls.DEFAULTS.items():
             prefs.setdefault(key, default)
@@ -362,6 +424,203 @@ class ProcessingLog(db.Model):
     # Update document relationship to use back_populates rather than backref
     document = db.relationship('Document', back_populates='processing_logs')
 
+# Cold storage for archived documents. Documents keep their original primary
+# keys so they (and their history) can move between the hot and archive tables.
+class ArchivedDocument(db.Model):
+    __tablename__ = 'document_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(100), nullable=False)
+    office = db.Column(db.String(100), nullable=False)
+    classification = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='Archived', server_default='Archived')
+    status_rank = db.Column(db.SmallInteger, nullable=False, default=DEFAULT_STATUS_RANK, server_default=str(DEFAULT_STATUS_RANK))
+    action_taken = db.Column(db.String(50), nullable=False)
+    attachment = db.Column(db.String(200), nullable=True)
+    remarks = db.Column(db.Text, nullable=True)
+    barcode = db.Column(db.String(50), nullable=True)
+    timestamp = db.Column(db.DateTime, nullable=False)
+    no_dtas_flag = db.Column(db.Boolean, nullable=False, default=False, server_default='0')
+    accepted_timestamp = db.Column(db.DateTime, nullable=True)
+    released_timestamp = db.Column(db.DateTime, nullable=True)
+    forwarded_timestamp = db.Column(db.DateTime, nullable=True)
+    creator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    recipient_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    creator = db.relationship('User', foreign_keys=[creator_id])
+    recipient = db.relationship('User', foreign_keys=[recipient_id])
+    activities = db.relationship('ArchivedActivityLog',
+                                 backref='document',
+                                 lazy=True,
+                                 cascade='all, delete-orphan')
+    processing_logs = db.relationship('ArchivedProcessingLog',
+                                      backref='document',
+                                      cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_doc_archive_creator_ts', 'creator_id', 'timestamp'),
+        db.Index('ix_doc_archive_recipient_ts', 'recipient_id', 'timestamp'),
+        db.Index('ix_doc_archive_timestamp', 'timestamp'),
+        db.Index('ix_doc_archive_released', 'released_timestamp'),
+        db.Index('ix_doc_archive_barcode', 'barcode'),
+    )
+
+    def to_dict(self):
+        return Document.to_dict(self)
+
+class ArchivedActivityLog(db.Model):
+    __tablename__ = 'activity_log_archive'
+
+    id = db.Column(db.Integer, primary_key=True)
+    timestamp = db.Column(db.DateTime, nullable=False)
+    action = db.Column(db.String(50), nullable=False)
+    remarks = db.Column(db.Text, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    document_id = db.Column(db.Integer, db.ForeignKey('document_archive.id', ondelete='CASCADE'), nullable=False)
+
+    user = db.relationship('User', foreign_keys=[user_id])
+
+    __table_args__ = (db.Index('ix_activity_archive_document_id', 'document_id'),)
+
+    def to_dict(self):
+        return ActivityLog.to_dict(self)
+
+class ArchivedProcessingLog(db.Model):
+    __tablename__ = 'processing_logs_archive'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    document_id = db.Column(db.Integer, db.ForeignKey('document_archive.id', ondelete='CASCADE'), nullable=False)
+    accepted_timestamp = db.Column(db.DateTime)
+    forwarded_timestamp = db.Column(db.DateTime)
+
+    user = db.relationship('User', foreign_keys=[user_id])
+
+    __table_args__ = (
+        db.Index('ix_processing_archive_document_id', 'document_id'),
+        db.Index('ix_processing_archive_user_forwarded', 'user_id', 'forwarded_timestamp'),
+    )
+
+class ArchiveFacet(db.Model):
+    """Per-user count of archived documents by creation year/month."""
+    __tablename__ = 'archive_facets'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+class ReportSnapshot(db.Model):
+    """Computed report payload (zlib-compressed JSON) for a closed period."""
+    __tablename__ = 'report_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    period_start = db.Column(db.DateTime, nullable=False)
+    period_end = db.Column(db.DateTime, nullable=False)
+    options_key = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.LargeBinary(length=(2**24) - 1), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('period_start', 'period_end', 'options_key', name='uq_report_snapshot_period'),
+        db.Index('ix_report_snapshot_end', 'period_end'),
+    )
+
+class ReportJob(db.Model):
+    """A system report rendered in the background report worker pool."""
+    __tablename__ = 'report_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    format = db.Column(db.String(10), nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='Queued', server_default='Queued')
+    progress = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    message = db.Column(db.String(255), nullable=True)
+    artifact_path = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Lease: the worker rendering the report and when it last wrote progress
+    claimed_by = db.Column(db.String(64), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship('User', foreign_keys=[user_id])
+
+    __table_args__ = (db.Index('ix_report_job_user_created', 'user_id', 'created_at'),)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'format': self.format,
+            'params': json.loads(self.params or '{}'),
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+class BatchJob(db.Model):
+    """A large batch accept/decline/forward/release processed in the background."""
+    __tablename__ = 'batch_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    action = db.Column(db.String(20), nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='Queued', server_default='Queued')
+    progress = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    processed = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    success_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    error_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    message = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Lease: the worker running the job and when it last committed progress
+    claimed_by = db.Column(db.String(64), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship('User', foreign_keys=[user_id])
+    items = db.relationship('BatchJobItem', backref='job', lazy='dynamic', cascade='all, delete-orphan',
+                            passive_deletes=True)
+
+    __table_args__ = (db.Index('ix_batch_job_user_created', 'user_id', 'created_at'),)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'action': self.action,
+            'params': json.loads(self.params or '{}'),
+            'status': self.status,
+            'progress': self.progress,
+            'total': self.total,
+            'processed': self.processed,
+            'success_count': self.success_count,
+            'error_count': self.error_count,
+            'message': self.message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+class BatchJobItem(db.Model):
+    """Per-document outcome of a batch job; outcome is NULL until the document is processed."""
+    __tablename__ = 'batch_job_items'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('batch_jobs.id', ondelete='CASCADE'), nullable=False)
+    # No foreign key: the document may be archived or deleted before the result is reviewed
+    document_id = db.Column(db.Integer, nullable=False)
+    outcome = db.Column(db.String(20), nullable=True)
+    reason = db.Column(db.String(255), nullable=True)
+
+    __table_args__ = (db.Index('ix_batch_job_item_job_outcome', 'job_id', 'outcome'),)
+
 class LeaveRequest(db.Model):
     __tablename__ = 'leave_requests'
 
@@ -466,6 +725,18 @@ class EWPRecord(db.Model):
 class Employee(db.Model):
     __tablename__ = 'employees'
 
+    # Only the core columns (id, bio_number, employee_name, office, position,
+    # status) load with the row. Each other group loads in one query on first
+    # access, or up front with undefer_group() (see app.employee_sections).
+    DEFERRED_GROUPS = ('personal', 'address', 'family', 'education', 'records')
+
+    # Prefix search on names (app.employee_search); the text indexes are created by migration a7c9e1f3b528
+    __table_args__ = (
+        db.Index('ix_employees_surname', 'surname'),
+        db.Index('ix_employees_first_name', 'first_name'),
+        db.Index('ix_employees_employee_name', 'employee_name'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     bio_number = db.Column(db.String(50), unique=True, nullable=False)
     employee_name = db.Column(db.String(120), nullable=False)
@@ -474,128 +745,197 @@ class Employee(db.Model):
     status = db.Column(db.String(50), nullable=False, default='Active', server_default='Active')  # Active/Inactive account status
 
     # Personal Information (Phase 1)
-    surname = db.Column(db.String(120), nullable=True)
-    first_name = db.Column(db.String(120), nullable=True)
-    middle_name = db.Column(db.String(120), nullable=True)
-    name_extension = db.Column(db.String(20), nullable=True)
+    surname = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    first_name = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    middle_name = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    name_extension = deferred(db.Column(db.String(20), nullable=True), group='personal')
 
-    date_of_birth = db.Column(db.String(20), nullable=True)  # store as string mm/dd/yyyy for simplicity
-    place_of_birth = db.Column(db.String(200), nullable=True)
+    date_of_birth = deferred(db.Column(db.String(20), nullable=True), group='personal')  # store as string mm/dd/yyyy for simplicity
+    place_of_birth = deferred(db.Column(db.String(200), nullable=True), group='personal')
 
-    sex = db.Column(db.String(20), nullable=True)  # Male/Female/Other
-    civil_status = db.Column(db.String(20), nullable=True)  # Single/Married/...
+    sex = deferred(db.Column(db.String(20), nullable=True), group='personal')  # Male/Female/Other
+    civil_status = deferred(db.Column(db.String(20), nullable=True), group='personal')  # Single/Married/...
 
-    height_m = db.Column(db.String(10), nullable=True)
-    weight_kg = db.Column(db.String(10), nullable=True)
-    blood_type = db.Column(db.String(10), nullable=True)
+    height_m = deferred(db.Column(db.String(10), nullable=True), group='personal')
+    weight_kg = deferred(db.Column(db.String(10), nullable=True), group='personal')
+    blood_type = deferred(db.Column(db.String(10), nullable=True), group='personal')
 
-    gsis_id_no = db.Column(db.String(120), nullable=True)
-    pagibig_id_no = db.Column(db.String(120), nullable=True)
-    philhealth_no = db.Column(db.String(120), nullable=True)
-    sss_no = db.Column(db.String(120), nullable=True)
-    tin = db.Column(db.String(120), nullable=True)
-    agency_employee_no = db.Column(db.String(120), nullable=True)
+    gsis_id_no = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    pagibig_id_no = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    philhealth_no = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    sss_no = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    tin = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    agency_employee_no = deferred(db.Column(db.String(120), nullable=True), group='personal')
 
-    citizenship = db.Column(db.String(120), nullable=True)
-    citizenship_details = db.Column(db.Text, nullable=True)
+    citizenship = deferred(db.Column(db.String(120), nullable=True), group='personal')
+    citizenship_details = deferred(db.Column(db.Text, nullable=True), group='personal')
 
     # Residential Address
-    res_house_lot = db.Column(db.String(150), nullable=True)
-    res_street = db.Column(db.String(150), nullable=True)
-    res_subdivision = db.Column(db.String(150), nullable=True)
-    res_barangay = db.Column(db.String(150), nullable=True)
-    res_city_municipality = db.Column(db.String(150), nullable=True)
-    res_province = db.Column(db.String(150), nullable=True)
-    res_zip_code = db.Column(db.String(10), nullable=True)
+    res_house_lot = deferred(db.Column(db.String(150), nullable=True), group='address')
+    res_street = deferred(db.Column(db.String(150), nullable=True), group='address')
+    res_subdivision = deferred(db.Column(db.String(150), nullable=True), group='address')
+    res_barangay = deferred(db.Column(db.String(150), nullable=True), group='address')
+    res_city_municipality = deferred(db.Column(db.String(150), nullable=True), group='address')
+    res_province = deferred(db.Column(db.String(150), nullable=True), group='address')
+    res_zip_code = deferred(db.Column(db.String(10), nullable=True), group='address')
 
     # Permanent Address
-    perm_house_lot = db.Column(db.String(150), nullable=True)
-    perm_street = db.Column(db.String(150), nullable=True)
-    perm_subdivision = db.Column(db.String(150), nullable=True)
-    perm_barangay = db.Column(db.String(150), nullable=True)
-    perm_city_municipality = db.Column(db.String(150), nullable=True)
-    perm_province = db.Column(db.String(150), nullable=True)
-    perm_zip_code = db.Column(db.String(10), nullable=True)
+    perm_house_lot = deferred(db.Column(db.String(150), nullable=True), group='address')
+    perm_street = deferred(db.Column(db.String(150), nullable=True), group='address')
+    perm_subdivision = deferred(db.Column(db.String(150), nullable=True), group='address')
+    perm_barangay = deferred(db.Column(db.String(150), nullable=True), group='address')
+    perm_city_municipality = deferred(db.Column(db.String(150), nullable=True), group='address')
+    perm_province = deferred(db.Column(db.String(150), nullable=True), group='address')
+    perm_zip_code = deferred(db.Column(db.String(10), nullable=True), group='address')
 
     # Contact
-    telephone_no = db.Column(db.String(120), nullable=True)
-    mobile_no = db.Column(db.String(120), nullable=True)
-    email_address = db.Column(db.String(120), nullable=True)
+    telephone_no = deferred(db.Column(db.String(120), nullable=True), group='address')
+    mobile_no = deferred(db.Column(db.String(120), nullable=True), group='address')
+    email_address = deferred(db.Column(db.String(120), nullable=True), group='address')
 
     # Family Background
-    spouse_surname = db.Column(db.String(120), nullable=True)
-    spouse_first_name = db.Column(db.String(120), nullable=True)
-    spouse_middle_name = db.Column(db.String(120), nullable=True)
-    spouse_occupation = db.Column(db.String(120), nullable=True)
-    spouse_employer_name = db.Column(db.String(150), nullable=True)
-    spouse_business_address = db.Column(db.String(255), nullable=True)
-    spouse_telephone_no = db.Column(db.String(120), nullable=True)
+    spouse_surname = deferred(db.Column(db.String(120), nullable=True), group='family')
+    spouse_first_name = deferred(db.Column(db.String(120), nullable=True), group='family')
+    spouse_middle_name = deferred(db.Column(db.String(120), nullable=True), group='family')
+    spouse_occupation = deferred(db.Column(db.String(120), nullable=True), group='family')
+    spouse_employer_name = deferred(db.Column(db.String(150), nullable=True), group='family')
+    spouse_business_address = deferred(db.Column(db.String(255), nullable=True), group='family')
+    spouse_telephone_no = deferred(db.Column(db.String(120), nullable=True), group='family')
 
-    father_surname = db.Column(db.String(120), nullable=True)
-    father_first_name = db.Column(db.String(120), nullable=True)
-    father_middle_name = db.Column(db.String(120), nullable=True)
-    father_extension = db.Column(db.String(20), nullable=True)
+    father_surname = deferred(db.Column(db.String(120), nullable=True), group='family')
+    father_first_name = deferred(db.Column(db.String(120), nullable=True), group='family')
+    father_middle_name = deferred(db.Column(db.String(120), nullable=True), group='family')
+    father_extension = deferred(db.Column(db.String(20), nullable=True), group='family')
 
-    mother_maiden_surname = db.Column(db.String(120), nullable=True)
-    mother_maiden_first_name = db.Column(db.String(120), nullable=True)
-    mother_maiden_middle_name = db.Column(db.String(120), nullable=True)
+    mother_maiden_surname = deferred(db.Column(db.String(120), nullable=True), group='family')
+    mother_maiden_first_name = deferred(db.Column(db.String(120), nullable=True), group='family')
+    mother_maiden_middle_name = deferred(db.Column(db.String(120), nullable=True), group='family')
 
-    children_info = db.Column(db.Text, nullable=True)
+    children_info = deferred(db.Column(db.Text, nullable=True), group='family')
 
     # Educational Background - Elementary
-    elem_school_name = db.Column(db.String(255), nullable=True)
-    elem_basic_education = db.Column(db.String(255), nullable=True)
-    elem_period_from = db.Column(db.String(20), nullable=True)
-    elem_period_to = db.Column(db.String(20), nullable=True)
-    elem_highest_level = db.Column(db.String(255), nullable=True)
-    elem_year_graduated = db.Column(db.String(10), nullable=True)
-    elem_scholarships = db.Column(db.String(255), nullable=True)
+    elem_school_name = deferred(db.Column(db.String(255), nullable=True), group='education')
+    elem_basic_education = deferred(db.Column(db.String(255), nullable=True), group='education')
+    elem_period_from = deferred(db.Column(db.String(20), nullable=True), group='education')
+    elem_period_to = deferred(db.Column(db.String(20), nullable=True), group='education')
+    elem_highest_level = deferred(db.Column(db.String(255), nullable=True), group='education')
+    elem_year_graduated = deferred(db.Column(db.String(10), nullable=True), group='education')
+    elem_scholarships = deferred(db.Column(db.String(255), nullable=True), group='education')
 
     # Educational Background - Secondary
-    sec_school_name = db.Column(db.String(255), nullable=True)
-    sec_basic_education = db.Column(db.String(255), nullable=True)
-    sec_period_from = db.Column(db.String(20), nullable=True)
-    sec_period_to = db.Column(db.String(20), nullable=True)
-    sec_highest_level = db.Column(db.String(255), nullable=True)
-    sec_year_graduated = db.Column(db.String(10), nullable=True)
-    sec_scholarships = db.Column(db.String(255), nullable=True)
+    sec_school_name = deferred(db.Column(db.String(255), nullable=True), group='education')
+    sec_basic_education = deferred(db.Column(db.String(255), nullable=True), group='education')
+    sec_period_from = deferred(db.Column(db.String(20), nullable=True), group='education')
+    sec_period_to = deferred(db.Column(db.String(20), nullable=True), group='education')
+    sec_highest_level = deferred(db.Column(db.String(255), nullable=True), group='education')
+    sec_year_graduated = deferred(db.Column(db.String(10), nullable=True), group='education')
+    sec_scholarships = deferred(db.Column(db.String(255), nullable=True), group='education')
 
     # Educational Background - Vocational
-    voc_school_name = db.Column(db.String(255), nullable=True)
-    voc_basic_education = db.Column(db.String(255), nullable=True)
-    voc_period_from = db.Column(db.String(20), nullable=True)
-    voc_period_to = db.Column(db.String(20), nullable=True)
-    voc_highest_level = db.Column(db.String(255), nullable=True)
-    voc_year_graduated = db.Column(db.String(10), nullable=True)
-    voc_scholarships = db.Column(db.String(255), nullable=True)
+    voc_school_name = deferred(db.Column(db.String(255), nullable=True), group='education')
+    voc_basic_education = deferred(db.Column(db.String(255), nullable=True), group='education')
+    voc_period_from = deferred(db.Column(db.String(20), nullable=True), group='education')
+    voc_period_to = deferred(db.Column(db.String(20), nullable=True), group='education')
+    voc_highest_level = deferred(db.Column(db.String(255), nullable=True), group='education')
+    voc_year_graduated = deferred(db.Column(db.String(10), nullable=True), group='education')
+    voc_scholarships = deferred(db.Column(db.String(255), nullable=True), group='education')
 
     # Educational Background - College
-    college_school_name = db.Column(db.String(255), nullable=True)
-    college_basic_education = db.Column(db.String(255), nullable=True)
-    college_period_from = db.Column(db.String(20), nullable=True)
-    college_period_to = db.Column(db.String(20), nullable=True)
-    college_highest_level = db.Column(db.String(255), nullable=True)
-    college_year_graduated = db.Column(db.String(10), nullable=True)
-    college_scholarships = db.Column(db.String(255), nullable=True)
+    college_school_name = deferred(db.Column(db.String(255), nullable=True), group='education')
+    college_basic_education = deferred(db.Column(db.String(255), nullable=True), group='education')
+    college_period_from = deferred(db.Column(db.String(20), nullable=True), group='education')
+    college_period_to = deferred(db.Column(db.String(20), nullable=True), group='education')
+    college_highest_level = deferred(db.Column(db.String(255), nullable=True), group='education')
+    college_year_graduated = deferred(db.Column(db.String(10), nullable=True), group='education')
+    college_scholarships = deferred(db.Column(db.String(255), nullable=True), group='education')
 
     # Educational Background - Graduate Studies
-    grad_school_name = db.Column(db.String(255), nullable=True)
-    grad_basic_education = db.Column(db.String(255), nullable=True)
-    grad_period_from = db.Column(db.String(20), nullable=True)
-    grad_period_to = db.Column(db.String(20), nullable=True)
-    grad_highest_level = db.Column(db.String(255), nullable=True)
-    grad_year_graduated = db.Column(db.String(10), nullable=True)
-    grad_scholarships = db.Column(db.String(255), nullable=True)
-
-    elem_records_json = db.Column(db.Text, nullable=True)
-    sec_records_json = db.Column(db.Text, nullable=True)
-    voc_records_json = db.Column(db.Text, nullable=True)
-    college_records_json = db.Column(db.Text, nullable=True)
-    grad_records_json = db.Column(db.Text, nullable=True)
-    civil_service_records_json = db.Column(db.Text, nullable=True)
-    work_experience_json = db.Column(db.Text, nullable=True)
-    voluntary_work_json = db.Column(db.Text, nullable=True)
-    learning_dev_json = db.Column(db.Text, nullable=True)
+    grad_school_name = deferred(db.Column(db.String(255), nullable=True), group='education')
+    grad_basic_education = deferred(db.Column(db.String(255), nullable=True), group='education')
+    grad_period_from = deferred(db.Column(db.String(20), nullable=True), group='education')
+    grad_period_to = deferred(db.Column(db.String(20), nullable=True), group='education')
+    grad_highest_level = deferred(db.Column(db.String(255), nullable=True), group='education')
+    grad_year_graduated = deferred(db.Column(db.String(10), nullable=True), group='education')
+    grad_scholarships = deferred(db.Column(db.String(255), nullable=True), group='education')
+
+    elem_records_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    sec_records_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    voc_records_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    college_records_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    grad_records_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    civil_service_records_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    work_experience_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    voluntary_work_json = deferred(db.Column(db.Text, nullable=True), group='records')
+    learning_dev_json = deferred(db.Column(db.Text, nullable=True), group='records')
+
+    # Normalized PDS sections. The *_records properties read these rows; the
+    # *_json columns are still written alongside them by set_records().
+    education_entries = db.relationship('EmployeeEducation', back_populates='employee', cascade='all, delete-orphan',
+                                        order_by='EmployeeEducation.sort_order')
+    civil_service_entries = db.relationship('EmployeeCivilService', back_populates='employee', cascade='all, delete-orphan',
+                                            order_by='EmployeeCivilService.sort_order')
+    work_experience_entries = db.relationship('EmployeeWorkExperience', back_populates='employee', cascade='all, delete-orphan',
+                                              order_by='EmployeeWorkExperience.sort_order')
+    voluntary_work_entries = db.relationship('EmployeeVoluntaryWork', back_populates='employee', cascade='all, delete-orphan',
+                                             order_by='EmployeeVoluntaryWork.sort_order')
+    learning_dev_entries = db.relationship('EmployeeLearningDev', back_populates='employee', cascade='all, delete-orphan',
+                                           order_by='EmployeeLearningDev.sort_order')
+
+    @validates(*PDS_RECORD_COLUMNS)
+    def _drop_parsed_records(self, key, value):
+        self.__dict__.get('_records_memo', {}).pop(key, None)
+        return value
+
+    # Parsed *_records lists keyed by JSON column: {column: (raw_json, records)}.
+    # Entries are dropped when the column is assigned and ignored when the
+    # loaded text differs from the text they were parsed from (e.g. after a refresh).
+    def _parsed_records(self, column, field_names):
+        memo = self.__dict__.setdefault('_records_memo', {})
+        raw_json = getattr(self, column)
+        cached = memo.get(column)
+        if cached is not None and cached[0] == raw_json:
+            return cached[1]
+        records = []
+        if raw_json:
+            try:
+                records = normalize_pds_entries(json.loads(raw_json), field_names)
+            except Exception:
+                records = []
+        memo[column] = (raw_json, records)
+        return records
+
+    def _section_records(self, column):
+        relationship, level = PDS_SECTION_RELATIONSHIPS[column]
+        rows = getattr(self, relationship)
+        if level is not None:
+            rows = [row for row in rows if row.level == level]
+        if rows:
+            return [row.to_record() for row in rows]
+        # Not backfilled yet (see scripts/backfill_employee_records.py): read the JSON copy
+        return list(self._parsed_records(column, PDS_RECORD_COLUMNS[column]))
+
+    def set_records(self, column, entries):
+        """
+        Store normalized entries for a PDS section and return them.
+        Replaces the section's child rows and keeps the *_json column in sync;
+        the memo is seeded with the stored list, so reads skip parsing.
+        """
+        field_names = PDS_RECORD_COLUMNS[column]
+        records = normalize_pds_entries(entries, field_names)
+        raw_json = json.dumps(records) if records else None
+        setattr(self, column, raw_json)
+        self.__dict__.setdefault('_records_memo', {})[column] = (raw_json, records)
+
+        relationship, level = PDS_SECTION_RELATIONSHIPS[column]
+        entry_class = getattr(type(self), relationship).property.mapper.class_
+        rows = [entry_class.from_record(record, sort_order) for sort_order, record in enumerate(records)]
+        kept = []
+        if level is not None:
+            kept = [row for row in getattr(self, relationship) if row.level != level]
+            for row in rows:
+                row.level = level
+        setattr(self, relationship, kept + rows)
+        return records
 
     def _primary_education_entry(self, prefix):
         entry = {field: (getattr(self, f"{prefix}_{field}", '') or '').strip() for field in EDUCATION_FIELD_NAMES}
@@ -604,20 +944,7 @@ class Employee(db.Model):
         return {}
 
     def _education_records(self, prefix):
-        records = []
-        json_field = getattr(self, f"{prefix}_records_json", None)
-        if json_field:
-            try:
-                parsed = json.loads(json_field)
-                if isinstance(parsed, list):
-                    for item in parsed:
-                        if not isinstance(item, dict):
-                            continue
-                        normalized = {field: (item.get(field) or '').strip() for field in EDUCATION_FIELD_NAMES}
-                        if any(normalized.values()):
-                            records.append(normalized)
-            except Exception:
-                records = []
+        records = self._section_records(f"{prefix}_records_json")
         if not records:
             primary = self._primary_education_entry(prefix)
             if primary:
@@ -644,101 +971,21 @@ class Employee(db.Model):
     def grad_records(self):
         return self._education_records('grad')
 
-    def _civil_service_records_internal(self):
-        records = []
-        raw_json = self.civil_service_records_json
-        if raw_json:
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            if isinstance(parsed, list):
-                for entry in parsed:
-                    if not isinstance(entry, dict):
-                        continue
-                    normalized = {
-                        field: (entry.get(field) or '').strip()
-                        for field in CIVIL_SERVICE_FIELD_NAMES
-                    }
-                    if any(normalized.values()):
-                        records.append(normalized)
-        return records
-
     @property
     def civil_service_records(self):
-        return self._civil_service_records_internal()
-
-    def _work_experience_records_internal(self):
-        records = []
-        raw_json = self.work_experience_json
-        if raw_json:
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            if isinstance(parsed, list):
-                for entry in parsed:
-                    if not isinstance(entry, dict):
-                        continue
-                    normalized = {
-                        field: (entry.get(field) or '').strip()
-                        for field in WORK_EXPERIENCE_FIELD_NAMES
-                    }
-                    if any(normalized.values()):
-                        records.append(normalized)
-        return records
+        return self._section_records('civil_service_records_json')
 
     @property
     def work_experience_records(self):
-        return self._work_experience_records_internal()
-
-    def _voluntary_work_records_internal(self):
-        records = []
-        raw_json = self.voluntary_work_json
-        if raw_json:
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            if isinstance(parsed, list):
-                for entry in parsed:
-                    if not isinstance(entry, dict):
-                        continue
-                    normalized = {
-                        field: (entry.get(field) or '').strip()
-                        for field in VOLUNTARY_WORK_FIELD_NAMES
-                    }
-                    if any(normalized.values()):
-                        records.append(normalized)
-        return records
+        return self._section_records('work_experience_json')
 
     @property
     def voluntary_work_records(self):
-        return self._voluntary_work_records_internal()
-
-    def _learning_dev_records_internal(self):
-        records = []
-        raw_json = self.learning_dev_json
-        if raw_json:
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            if isinstance(parsed, list):
-                for entry in parsed:
-                    if not isinstance(entry, dict):
-                        continue
-                    normalized = {
-                        field: (entry.get(field) or '').strip()
-                        for field in LEARNING_DEV_FIELD_NAMES
-                    }
-                    if any(normalized.values()):
-                        records.append(normalized)
-        return records
+        return self._section_records('voluntary_work_json')
 
     @property
     def learning_dev_records(self):
-        return self._learning_dev_records_internal()
+        return self._section_records('learning_dev_json')
 
     def to_dict(self):
         return {
@@ -853,3 +1100,134 @@ class Employee(db.Model):
             'voluntary_work_records': self.voluntary_work_records,
             'learning_dev_records': self.learning_dev_records
         }
+
+
+class PDSEntryMixin:
+    """Shared conversion between a PDS child row and its record dict."""
+    FIELD_NAMES = ()
+
+    def to_record(self):
+        return {field: getattr(self, field) or '' for field in self.FIELD_NAMES}
+
+    @classmethod
+    def from_record(cls, record, sort_order):
+        values = {field: record.get(field) or None for field in cls.FIELD_NAMES}
+        return cls(sort_order=sort_order, **values)
+
+class EmployeeEducation(PDSEntryMixin, db.Model):
+    __tablename__ = 'employee_education'
+    FIELD_NAMES = EDUCATION_FIELD_NAMES
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    level = db.Column(db.String(10), nullable=False)  # elem/sec/voc/college/grad
+    sort_order = db.Column(db.Integer, nullable=False, default=0)
+    school_name = db.Column(db.Text, nullable=True)
+    basic_education = db.Column(db.Text, nullable=True)
+    period_from = db.Column(db.Text, nullable=True)
+    period_to = db.Column(db.Text, nullable=True)
+    highest_level = db.Column(db.Text, nullable=True)
+    year_graduated = db.Column(db.Text, nullable=True)
+    scholarships = db.Column(db.Text, nullable=True)
+
+    employee = db.relationship('Employee', back_populates='education_entries')
+
+    __table_args__ = (
+        db.Index('ix_emp_edu_employee', 'employee_id', 'level', 'sort_order'),
+        db.Index('ix_emp_edu_level_course', 'level', 'basic_education', mysql_length={'basic_education': PDS_INDEX_PREFIX}),
+    )
+
+class EmployeeCivilService(PDSEntryMixin, db.Model):
+    __tablename__ = 'employee_civil_service'
+    FIELD_NAMES = CIVIL_SERVICE_FIELD_NAMES
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    sort_order = db.Column(db.Integer, nullable=False, default=0)
+    career_service = db.Column(db.Text, nullable=True)
+    rating = db.Column(db.Text, nullable=True)
+    exam_date = db.Column(db.Text, nullable=True)
+    exam_place = db.Column(db.Text, nullable=True)
+    license_number = db.Column(db.Text, nullable=True)
+    license_validity = db.Column(db.Text, nullable=True)
+
+    employee = db.relationship('Employee', back_populates='civil_service_entries')
+
+    __table_args__ = (
+        db.Index('ix_emp_cse_employee', 'employee_id', 'sort_order'),
+        # Eligibility lookups: career_service = ? -> employee ids
+        db.Index('ix_emp_cse_career_employee', 'career_service', 'employee_id', mysql_length={'career_service': PDS_INDEX_PREFIX}),
+    )
+
+class EmployeeWorkExperience(PDSEntryMixin, db.Model):
+    __tablename__ = 'employee_work_experience'
+    FIELD_NAMES = WORK_EXPERIENCE_FIELD_NAMES
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    sort_order = db.Column(db.Integer, nullable=False, default=0)
+    inclusive_from = db.Column(db.Text, nullable=True)
+    inclusive_to = db.Column(db.Text, nullable=True)
+    position_title = db.Column(db.Text, nullable=True)
+    department_agency = db.Column(db.Text, nullable=True)
+    monthly_salary = db.Column(db.Text, nullable=True)
+    salary_grade = db.Column(db.Text, nullable=True)
+    appointment_status = db.Column(db.Text, nullable=True)
+    is_gov_service = db.Column(db.Text, nullable=True)
+
+    employee = db.relationship('Employee', back_populates='work_experience_entries')
+
+    __table_args__ = (db.Index('ix_emp_work_employee', 'employee_id', 'sort_order'),)
+
+class EmployeeVoluntaryWork(PDSEntryMixin, db.Model):
+    __tablename__ = 'employee_voluntary_work'
+    FIELD_NAMES = VOLUNTARY_WORK_FIELD_NAMES
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    sort_order = db.Column(db.Integer, nullable=False, default=0)
+    organization_name = db.Column(db.Text, nullable=True)
+    organization_address = db.Column(db.Text, nullable=True)
+    inclusive_from = db.Column(db.Text, nullable=True)
+    inclusive_to = db.Column(db.Text, nullable=True)
+    hours = db.Column(db.Text, nullable=True)
+    hours_value = db.Column(db.Float, nullable=True)  # parse_hours(hours), for SUMs
+    position_nature = db.Column(db.Text, nullable=True)
+
+    employee = db.relationship('Employee', back_populates='voluntary_work_entries')
+
+    __table_args__ = (db.Index('ix_emp_vol_employee', 'employee_id', 'sort_order'),)
+
+    @classmethod
+    def from_record(cls, record, sort_order):
+        row = super().from_record(record, sort_order)
+        row.hours_value = parse_hours(row.hours)
+        return row
+
+class EmployeeLearningDev(PDSEntryMixin, db.Model):
+    __tablename__ = 'employee_learning_dev'
+    FIELD_NAMES = LEARNING_DEV_FIELD_NAMES
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    sort_order = db.Column(db.Integer, nullable=False, default=0)
+    program_title = db.Column(db.Text, nullable=True)
+    inclusive_from = db.Column(db.Text, nullable=True)
+    inclusive_to = db.Column(db.Text, nullable=True)
+    hours = db.Column(db.Text, nullable=True)
+    hours_value = db.Column(db.Float, nullable=True)  # parse_hours(hours), for SUMs
+    ld_type = db.Column(db.Text, nullable=True)
+    conducted_by = db.Column(db.Text, nullable=True)
+
+    employee = db.relationship('Employee', back_populates='learning_dev_entries')
+
+    __table_args__ = (
+        db.Index('ix_emp_ld_employee', 'employee_id', 'sort_order'),
+        db.Index('ix_emp_ld_type_employee', 'ld_type', 'employee_id', mysql_length={'ld_type': PDS_INDEX_PREFIX}),
+    )
+
+    @classmethod
+    def from_record(cls, record, sort_order):
+        row = super().from_record(record, sort_order)
+        row.hours_value = parse_hours(row.hours)
+        return row
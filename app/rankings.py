@@ -0,0 +1,158 @@
+"""
+Processing-time leaderboards.
+
+One grouped aggregate per time window gives every user's average
+accept -> forward time; best/worst, ranks and percentiles are then read from
+the ordered leaderboard in memory. Leaderboards are cached per window for a
+short TTL so the report, the admin dashboard and the user metrics modal can
+share them.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from flask import current_app
+
+from app import db
+from app.archive_storage import all_processing_logs
+from app.models import User, format_timedelta
+
+DEFAULT_CACHE_TTL_SECONDS = 60
+
+_cache: Dict[Tuple[Optional[datetime], Optional[datetime]], Tuple[float, 'Leaderboard']] = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    user_id: int
+    username: str
+    count: int
+    avg_sec: int
+
+    @property
+    def avg_formatted(self) -> str:
+        return format_timedelta(timedelta(seconds=self.avg_sec))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'username': self.username,
+            'avg_sec': self.avg_sec,
+            'avg_formatted': self.avg_formatted,
+            'count': self.count,
+        }
+
+
+@dataclass(frozen=True)
+class Leaderboard:
+    """Users ordered fastest first by average processing time."""
+    entries: Tuple[LeaderboardEntry, ...]
+
+    @property
+    def best(self) -> Optional[LeaderboardEntry]:
+        return self.entries[0] if self.entries else None
+
+    @property
+    def worst(self) -> Optional[LeaderboardEntry]:
+        return self.entries[-1] if self.entries else None
+
+    def entry_for(self, user_id: int) -> Optional[LeaderboardEntry]:
+        for entry in self.entries:
+            if entry.user_id == user_id:
+                return entry
+        return None
+
+    def rank_of(self, user_id: int) -> Optional[int]:
+        """1-based rank (1 = fastest), or None if the user has no data."""
+        for index, entry in enumerate(self.entries, 1):
+            if entry.user_id == user_id:
+                return index
+        return None
+
+    def percentile(self, pct: float) -> Optional[int]:
+        """Average seconds at the given percentile (nearest-rank)."""
+        if not self.entries:
+            return None
+        pct = min(max(pct, 0.0), 100.0)
+        index = max(math.ceil(pct / 100.0 * len(self.entries)) - 1, 0)
+        return self.entries[index].avg_sec
+
+    def faster_than_pct(self, user_id: int) -> Optional[int]:
+        """Share of the other ranked users that are slower than this user."""
+        rank = self.rank_of(user_id)
+        if rank is None:
+            return None
+        others = len(self.entries) - 1
+        return 100 if others == 0 else int(round((len(self.entries) - rank) * 100.0 / others))
+
+
+def _ttl() -> float:
+    try:
+        return float(current_app.config.get('RANKING_CACHE_TTL_SECONDS', DEFAULT_CACHE_TTL_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_CACHE_TTL_SECONDS
+
+
+def _compute_leaderboard(start_dt, end_dt) -> Leaderboard:
+    HandledLog = all_processing_logs()
+    avg_expr = db.func.avg(
+        db.func.time_to_sec(
+            db.func.timediff(HandledLog.forwarded_timestamp, HandledLog.accepted_timestamp)
+        )
+    )
+    query = (
+        db.session.query(User.id, User.username, db.func.count(HandledLog.id), avg_expr)
+        .join(HandledLog, HandledLog.user_id == User.id)
+        .filter(HandledLog.forwarded_timestamp != None)
+    )
+    if start_dt is not None:
+        query = query.filter(HandledLog.forwarded_timestamp >= start_dt)
+    if end_dt is not None:
+        query = query.filter(HandledLog.forwarded_timestamp < end_dt)
+
+    entries = []
+    for user_id, username, count, avg_sec in query.group_by(User.id, User.username).all():
+        if not count or avg_sec is None:
+            continue
+        try:
+            seconds = int(avg_sec)
+        except (TypeError, ValueError):
+            seconds = 0
+        entries.append(LeaderboardEntry(user_id=user_id, username=username, count=int(count), avg_sec=seconds))
+    entries.sort(key=lambda entry: (entry.avg_sec, (entry.username or '').lower()))
+    return Leaderboard(entries=tuple(entries))
+
+
+def processing_leaderboard(start_dt=None, end_dt=None, use_cache=True) -> Leaderboard:
+    """
+    Leaderboard of average accept -> forward time for logs forwarded in
+    [start_dt, end_dt) (open-ended when a bound is None), including the
+    processing history of archived documents.
+    """
+    key = (start_dt, end_dt)
+    ttl = _ttl() if use_cache else 0
+    now = time.monotonic()
+    if ttl > 0:
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+
+    leaderboard = _compute_leaderboard(start_dt, end_dt)
+    if ttl > 0:
+        with _cache_lock:
+            # Drop expired windows so ad-hoc report ranges don't accumulate
+            for stale in [k for k, (stamp, _) in _cache.items() if now - stamp >= ttl]:
+                _cache.pop(stale, None)
+            _cache[key] = (now, leaderboard)
+    return leaderboard
+
+
+def clear_leaderboard_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
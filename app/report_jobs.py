@@ -0,0 +1,243 @@
+"""
+Background report jobs.
+
+Admins queue a system report; it is rendered in a process pool (spawned
+workers with their own app and database connections) so large periods never
+hold a web worker. Progress is written to ``report_jobs`` and the finished
+TXT/CSV/PDF artifact is saved under the instance folder for download. Each
+progress write renews the worker's lease on the job; jobs left without a
+live worker by a crash or restart are failed by ``fail_abandoned_report_jobs``.
+"""
+import json
+import multiprocessing
+import os
+import threading
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from flask import current_app, render_template
+from sqlalchemy import or_, update
+from werkzeug.datastructures import MultiDict
+
+from app import db
+from app.models import ReportJob, to_local_time
+from app.reports import (
+    build_report_summary,
+    iter_report_csv,
+    iter_report_documents,
+    iter_report_text,
+    report_period_label,
+    resolve_report_period,
+)
+from app.utils import job_lease_cutoff, job_lease_owner
+
+try:  # Optional: PDF artifacts need WeasyPrint and its system libraries
+    from weasyprint import HTML
+except Exception:  # pragma: no cover - depends on the deployment
+    HTML = None
+
+JOB_FORMATS = ('pdf', 'txt', 'csv')
+ARTIFACT_DIRNAME = 'report_artifacts'
+DEFAULT_WORKERS = 2
+PDF_DETAIL_CAP = 5000
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_app = None
+
+
+def pdf_available() -> bool:
+    return HTML is not None
+
+
+def artifact_dir(app=None) -> str:
+    app = app or current_app
+    path = app.config.get('REPORT_ARTIFACT_DIR') or os.path.join(app.instance_path, ARTIFACT_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(int(current_app.config.get('REPORT_JOB_WORKERS', DEFAULT_WORKERS)), 1)
+            # spawn, not fork: children must not share the parent's DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def submit_report_job(user_id: int, fmt: str, params: dict) -> ReportJob:
+    """Record a report job and hand it to the worker pool."""
+    fmt = (fmt or '').lower()
+    if fmt not in JOB_FORMATS:
+        raise ValueError(f"Unsupported report format '{fmt}'")
+    if fmt == 'pdf' and not pdf_available():
+        raise ValueError('PDF export is unavailable: WeasyPrint is not installed on this server.')
+
+    job = ReportJob(user_id=user_id, format=fmt, params=json.dumps(params), message='Queued',
+                    heartbeat_at=datetime.utcnow())
+    db.session.add(job)
+    db.session.commit()
+    try:
+        _get_executor().submit(run_report_job, job.id)
+    except Exception as exc:
+        job.status = 'Failed'
+        job.message = f'Could not start report worker: {exc}'[:255]
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    return job
+
+
+def fail_abandoned_report_jobs() -> int:
+    """
+    Fail report jobs left Queued or Running by a crash or restart (lease older
+    than JOB_LEASE_SECONDS), so the admin's status poll ends and the report
+    can be queued again. Run from one process only, like resume_batch_jobs.
+    """
+    jobs = ReportJob.__table__
+    result = db.session.execute(
+        update(jobs)
+        .where(jobs.c.status.in_(('Queued', 'Running')),
+               or_(jobs.c.heartbeat_at.is_(None), jobs.c.heartbeat_at < job_lease_cutoff()))
+        .values(status='Failed', message='Interrupted by a server restart; queue the report again.',
+                finished_at=datetime.utcnow())
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _init_worker():
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(start_scheduler=False)
+
+
+class _LeaseLost(Exception):
+    """The job was failed as abandoned while this worker was still rendering it."""
+
+
+def _set_progress(job_id: int, owner: str, **values) -> None:
+    # Own connection and commit, so a streaming cursor on the session stays
+    # open; only the lease holder may write, and every write renews the lease
+    jobs = ReportJob.__table__
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            update(jobs)
+            .where(jobs.c.id == job_id, jobs.c.status == 'Running', jobs.c.claimed_by == owner)
+            .values(heartbeat_at=datetime.utcnow(), **values)
+        )
+    if result.rowcount != 1:
+        raise _LeaseLost(job_id)
+
+
+def _count_progress(job_id, owner, documents, total, start=40, end=95, every=1000):
+    """Pass documents through, moving the job's progress from start to end."""
+    for index, document in enumerate(documents, 1):
+        if total and index % every == 0:
+            _set_progress(job_id, owner, progress=start + int((end - start) * min(index / total, 1)))
+        yield document
+
+
+def run_report_job(job_id: int) -> None:
+    """Worker-process entry point."""
+    app = _worker_app
+    if app is None:
+        from app import create_app
+        app = create_app(start_scheduler=False)
+    with app.app_context():
+        jobs = ReportJob.__table__
+        owner = job_lease_owner()
+        now = datetime.utcnow()
+        # Claim the job atomically; a job already failed as abandoned is not run
+        claimed = db.session.execute(
+            update(jobs)
+            .where(jobs.c.id == job_id, jobs.c.status == 'Queued')
+            .values(status='Running', progress=5, message='Computing summary', started_at=now,
+                    claimed_by=owner, heartbeat_at=now)
+        )
+        db.session.commit()
+        if claimed.rowcount != 1:
+            return
+        job = db.session.get(ReportJob, job_id)
+        path = None
+        try:
+            path = _render_job(app, job, owner)
+            _set_progress(job_id, owner, status='Completed', progress=100, message='Ready for download',
+                          artifact_path=os.path.basename(path), finished_at=datetime.utcnow())
+        except _LeaseLost:
+            db.session.rollback()
+            app.logger.warning("Report job #%s was failed as abandoned while rendering; discarding it", job_id)
+            if path and os.path.exists(path):
+                os.remove(path)
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception("Report job #%s failed", job_id)
+            try:
+                _set_progress(job_id, owner, status='Failed', message=str(exc)[:255], finished_at=datetime.utcnow())
+            except _LeaseLost:
+                pass
+
+
+def _render_job(app, job: ReportJob, owner: str) -> str:
+    params = json.loads(job.params or '{}')
+    start_dt, end_dt, date_from_str, date_to_str = resolve_report_period(MultiDict(params))
+    include_details = bool(int(params.get('include_details', 1)))
+
+    report = build_report_summary(start_dt, end_dt)
+    _set_progress(job.id, owner, progress=40, message='Writing report')
+    period_label = report_period_label(start_dt, end_dt, date_from_str, date_to_str)
+    total = report.get('documents_created_this_month') or 0
+
+    filename = f'report_{job.id}_{start_dt:%Y%m%d}_{end_dt:%Y%m%d}.{job.format}'
+    path = os.path.join(artifact_dir(app), filename)
+    tmp_path = f'{path}.tmp'
+
+    if job.format in ('txt', 'csv'):
+        documents = None
+        if include_details:
+            documents = _count_progress(job.id, owner, iter_report_documents(start_dt, end_dt), total)
+        chunks = (iter_report_csv if job.format == 'csv' else iter_report_text)(report, period_label, documents)
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+    else:
+        if HTML is None:
+            raise RuntimeError('WeasyPrint is not installed on this server.')
+        documents_list = []
+        if include_details:
+            documents = iter_report_documents(start_dt, end_dt)
+            # Closed explicitly: stopping at the cap leaves the yield_per cursor mid-result
+            with closing(documents):
+                for document in _count_progress(job.id, owner, documents, min(total, PDF_DETAIL_CAP)):
+                    documents_list.append(document)
+                    if len(documents_list) > PDF_DETAIL_CAP:
+                        break
+        truncated = len(documents_list) > PDF_DETAIL_CAP
+        with app.test_request_context():
+            html = render_template(
+                'report_text.html',
+                title='System Activity Report',
+                selected_from=date_from_str,
+                selected_to=date_to_str,
+                selected_from_fmt=period_label,
+                selected_to_fmt=period_label,
+                period_label=period_label,
+                autoprint=False,
+                include_details=include_details,
+                documents_list=documents_list[:PDF_DETAIL_CAP],
+                truncated=truncated,
+                cap=PDF_DETAIL_CAP,
+                generated_at=to_local_time(datetime.utcnow()),
+                **dict(report, snapshot_at=None)
+            )
+        _set_progress(job.id, owner, progress=95, message='Rendering PDF')
+        HTML(string=html, base_url=app.root_path).write_pdf(tmp_path)
+
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,806 @@
+"""
+System activity report: summary computation and streamed txt/CSV output.
+
+The summary sections are small and computed up front; the per-document
+detail list is read with a ``yield_per`` cursor and written out in chunks so
+full-period listings do not have to be held in memory.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta
+from itertools import islice
+
+from flask import current_app
+from sqlalchemy import delete, event, inspect, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app import db
+from app.archive_storage import all_documents, all_processing_logs
+from app.models import (
+    ArchivedDocument,
+    ArchivedProcessingLog,
+    Document,
+    LeaveRequest,
+    ProcessingLog,
+    ReportSnapshot,
+    User,
+    format_timedelta,
+    to_local_time,
+)
+from app.rankings import processing_leaderboard
+from app.utils import calculate_business_hours
+
+DEFAULT_STREAM_CHUNK_SIZE = 1000
+
+# Bump when the shape of the period summary changes so old snapshots are ignored
+SNAPSHOT_OPTIONS_KEY = 'summary:v1'
+
+# Timestamp attributes whose values place a row in a report period
+_SNAPSHOT_TIMESTAMPS = {
+    Document: ('timestamp', 'released_timestamp'),
+    ArchivedDocument: ('timestamp', 'released_timestamp'),
+    ProcessingLog: ('forwarded_timestamp',),
+    ArchivedProcessingLog: ('forwarded_timestamp',),
+    LeaveRequest: ('created_timestamp', 'released_timestamp'),
+}
+
+DETAIL_FIELDS = ['title', 'office', 'classification', 'creator', 'created_at', 'status', 'barcode']
+
+
+def _stream_chunk_size() -> int:
+    try:
+        return max(int(current_app.config.get('REPORT_STREAM_CHUNK_SIZE', DEFAULT_STREAM_CHUNK_SIZE)), 1)
+    except (TypeError, ValueError):
+        return DEFAULT_STREAM_CHUNK_SIZE
+
+
+def report_period_dates(start_dt, end_dt):
+    """First and last day of the period as 'MMMM DD, YYYY' (end_dt is exclusive)."""
+    try:
+        start_fmt = to_local_time(start_dt).strftime('%B %d, %Y') if start_dt else ''
+    except Exception:
+        start_fmt = start_dt.strftime('%B %d, %Y') if start_dt else ''
+    end_inclusive = (end_dt - timedelta(days=1)) if end_dt else None
+    try:
+        end_fmt = to_local_time(end_inclusive).strftime('%B %d, %Y') if end_inclusive else start_fmt
+    except Exception:
+        end_fmt = end_inclusive.strftime('%B %d, %Y') if end_inclusive else start_fmt
+    return start_fmt, end_fmt
+
+
+def report_period_label(start_dt, end_dt, date_from_str, date_to_str):
+    """Human-friendly period label (MMMM DD, YYYY or MMMM YYYY)."""
+    start_fmt, end_fmt = report_period_dates(start_dt, end_dt)
+    if date_from_str and date_to_str:
+        if date_from_str == date_to_str:
+            return start_fmt
+        return f'{start_fmt} to {end_fmt}'
+    return to_local_time(start_dt).strftime('%B %Y') if start_dt else 'Selected Period'
+
+
+def _parse_report_date(s: str):
+    try:
+        return datetime.strptime(s, '%Y-%m-%d')
+    except Exception:
+        return None
+
+
+def resolve_report_period(args, now=None):
+    """
+    Resolve the report period from request args: date_from/date_to (preferred)
+    or month/year, defaulting to the current month. Returns
+    (start_dt, end_dt, date_from_str, date_to_str) with bounds [start, end).
+    """
+    now = now or datetime.utcnow()
+    # Date range support (preferred); fallback to month/year
+    date_from_str = (args.get('date_from') or '').strip()
+    date_to_str = (args.get('date_to') or '').strip()
+
+    # Normalize partial inputs: if only one is provided, use it for both
+    if date_from_str and not date_to_str:
+        date_to_str = date_from_str
+    if date_to_str and not date_from_str:
+        date_from_str = date_to_str
+
+    start_dt = None
+    end_dt = None
+
+    if date_from_str and date_to_str:
+        df = _parse_report_date(date_from_str)
+        dt = _parse_report_date(date_to_str)
+        if df and dt:
+            # Bounds are [start, end)
+            start_dt = datetime(df.year, df.month, df.day)
+            # end is next day midnight of date_to to make [start,end)
+            end_dt = datetime(dt.year, dt.month, dt.day) + timedelta(days=1)
+        else:
+            # Invalid date strings; clear and fallback to month/year
+            date_from_str = ''
+            date_to_str = ''
+
+    if start_dt is None or end_dt is None:
+        # Fallback to month/year if date range not provided/invalid
+        month = args.get('month', type=int) or now.month
+        year = args.get('year', type=int) or now.year
+        try:
+            start_dt = datetime(year, month, 1)
+        except Exception:
+            start_dt = datetime(now.year, now.month, 1)
+            year = start_dt.year
+            month = start_dt.month
+        if month == 12:
+            end_dt = datetime(year + 1, 1, 1)
+        else:
+            end_dt = datetime(year, month + 1, 1)
+        # Populate defaults for date inputs from computed month bounds
+        date_from_str = start_dt.date().isoformat()
+        date_to_str = (end_dt - timedelta(days=1)).date().isoformat()
+    return start_dt, end_dt, date_from_str, date_to_str
+
+
+def _build_period_summary(start_dt, end_dt):
+    """
+    Compute the period-scoped summary sections for [start_dt, end_dt):
+    counts, processing times per classification, period rankings and user
+    metrics. The result is JSON-serialisable so it can be snapshotted.
+    """
+    # Reports read hot and archived rows alike.
+    ReportDocument = all_documents()
+    ReportProcessingLog = all_processing_logs()
+
+    # 1) Documents created in selected month
+    documents_month_q = db.session.query(ReportDocument).filter(
+        ReportDocument.timestamp >= start_dt,
+        ReportDocument.timestamp < end_dt
+    )
+    documents_created_this_month = documents_month_q.count()
+
+    # 2) Per-classification counts for selected month
+    def count_class(prefix: str) -> int:
+        return db.session.query(ReportDocument).filter(
+            ReportDocument.classification.like(f'{prefix}%'),
+            ReportDocument.timestamp >= start_dt,
+            ReportDocument.timestamp < end_dt
+        ).count()
+
+    # Include Leave requests created within the selected period
+    try:
+        leave_created_in_period = LeaveRequest.query.filter(
+            LeaveRequest.created_timestamp >= start_dt,
+            LeaveRequest.created_timestamp < end_dt
+        ).count()
+    except Exception:
+        leave_created_in_period = 0
+
+    per_classification_counts = {
+        'Communications': count_class('Communications'),
+        'Payroll': count_class('Payroll'),
+        'Request': count_class('Request'),
+        'Others': count_class('Others'),
+        'Leave': int(leave_created_in_period or 0)
+    }
+
+    # New: Processing time by classification (released within period, business hours)
+    classification_buckets = {
+        'Communications': {'count': 0, 'total_sec': 0},
+        'Payroll': {'count': 0, 'total_sec': 0},
+        'Request': {'count': 0, 'total_sec': 0},
+        'Others': {'count': 0, 'total_sec': 0},
+        'Leave': {'count': 0, 'total_sec': 0}
+    }
+    # Track per sub-classification aggregates under each main classification
+    classification_sub_buckets = {
+        'Communications': {},
+        'Payroll': {},
+        'Request': {},
+        'Others': {},
+        'Leave': {}
+    }
+    docs_rel = (
+        db.session.query(ReportDocument)
+        .with_entities(ReportDocument.classification, ReportDocument.timestamp, ReportDocument.released_timestamp)
+        .filter(
+            ReportDocument.released_timestamp != None,
+            ReportDocument.released_timestamp >= start_dt,
+            ReportDocument.released_timestamp < end_dt
+        ).all()
+    )
+    for cls, created_at, released_at in docs_rel:
+        if not created_at or not released_at:
+            continue
+        main = 'Others'
+        try:
+            if isinstance(cls, str):
+                if cls.startswith('Communications'):
+                    main = 'Communications'
+                elif cls.startswith('Payroll'):
+                    main = 'Payroll'
+                elif cls.startswith('Request'):
+                    main = 'Request'
+        except Exception:
+            main = 'Others'
+        try:
+            delta_td = calculate_business_hours(created_at, released_at)
+        except Exception:
+            delta_td = (released_at - created_at)
+        try:
+            sec = int(delta_td.total_seconds()) if delta_td else 0
+        except Exception:
+            sec = 0
+        if sec < 0:
+            sec = 0
+        classification_buckets[main]['count'] += 1
+        classification_buckets[main]['total_sec'] += sec
+        # Determine sub-classification label
+        sub_name = cls
+        try:
+            if isinstance(cls, str):
+                prefix = main + ' - '
+                if cls.startswith(prefix):
+                    sub_name = cls[len(prefix):].strip() or 'General'
+                elif cls == main:
+                    sub_name = 'General'
+                else:
+                    sub_name = cls
+        except Exception:
+            sub_name = 'General'
+        subs = classification_sub_buckets.get(main, {})
+        entry = subs.get(sub_name)
+        if not entry:
+            entry = {'count': 0, 'total_sec': 0}
+            subs[sub_name] = entry
+            classification_sub_buckets[main] = subs
+        entry['count'] += 1
+        entry['total_sec'] += sec
+
+    # Include LeaveRequest processing (released within period)
+    try:
+        leaves_rel = (
+            LeaveRequest.query
+            .with_entities(LeaveRequest.leave_type, LeaveRequest.created_timestamp, LeaveRequest.released_timestamp)
+            .filter(
+                LeaveRequest.released_timestamp != None,
+                LeaveRequest.released_timestamp >= start_dt,
+                LeaveRequest.released_timestamp < end_dt
+            ).all()
+        )
+    except Exception:
+        leaves_rel = []
+
+    for leave_type, created_ts, released_ts in leaves_rel:
+        if not created_ts or not released_ts:
+            continue
+        main = 'Leave'
+        try:
+            delta_td = calculate_business_hours(created_ts, released_ts)
+        except Exception:
+            delta_td = (released_ts - created_ts)
+        try:
+            sec = int(delta_td.total_seconds()) if delta_td else 0
+        except Exception:
+            sec = 0
+        if sec < 0:
+            sec = 0
+        # Update main bucket
+        bucket = classification_buckets.get(main)
+        if not bucket:
+            classification_buckets[main] = {'count': 0, 'total_sec': 0}
+            bucket = classification_buckets[main]
+        bucket['count'] += 1
+        bucket['total_sec'] += sec
+
+        # Subtype by leave_type
+        sub_name = leave_type or 'General'
+        subs = classification_sub_buckets.get(main) or {}
+        entry = subs.get(sub_name)
+        if not entry:
+            entry = {'count': 0, 'total_sec': 0}
+            subs[sub_name] = entry
+            classification_sub_buckets[main] = subs
+        entry['count'] += 1
+        entry['total_sec'] += sec
+
+    classification_processing = []
+    for key in ['Communications', 'Payroll', 'Request', 'Others', 'Leave']:
+        c = classification_buckets[key]['count']
+        tot = classification_buckets[key]['total_sec']
+        avg_sec = int(tot / c) if c > 0 else 0
+        if c > 0:
+            try:
+                avg_formatted = format_timedelta(timedelta(seconds=avg_sec))
+            except Exception:
+                avg_formatted = str(timedelta(seconds=avg_sec))
+        else:
+            avg_formatted = "No document processed yet"
+        classification_processing.append({
+            'classification': key,
+            'count': c,
+            'avg_sec': avg_sec,
+            'avg_formatted': avg_formatted
+        })
+
+    # Build output structure for template/TXT
+    classification_sub_processing = []
+    for key in ['Communications', 'Payroll', 'Request', 'Others', 'Leave']:
+        submap = classification_sub_buckets.get(key, {})
+        rows = []
+        if submap:
+            for sub_name in sorted(submap.keys()):
+                sc = submap[sub_name]['count']
+                tot_sec = submap[sub_name]['total_sec']
+                avg_sec = int(tot_sec / sc) if sc > 0 else 0
+                avg_formatted = format_timedelta(timedelta(seconds=avg_sec)) if sc > 0 else "No document processed yet"
+                rows.append({
+                    'sub': sub_name,
+                    'count': sc,
+                    'avg_sec': avg_sec,
+                    'avg_formatted': avg_formatted
+                })
+        else:
+            # No documents released for this main classification
+            rows.append({
+                'sub': '—',
+                'count': 0,
+                'avg_sec': 0,
+                'avg_formatted': "No document processed yet"
+            })
+        classification_sub_processing.append({
+            'classification': key,
+            'rows': rows
+        })
+
+    # 3) Rankings (selected period; overall rankings are added by build_report_summary)
+    # Monthly rankings (based on forwarded in selected month)
+    period_board = processing_leaderboard(start_dt, end_dt)
+    monthly_best = period_board.best.to_dict() if period_board.best else None
+    monthly_worst = period_board.worst.to_dict() if period_board.worst else None
+
+    # User Performance (This Month)
+    user_performance = []
+    leave_user_metrics_period = []
+    try:
+        # Collect handled per user from ProcessingLog within month and compute avg in Python
+        plogs = (
+            db.session.query(
+                ReportProcessingLog.user_id,
+                ReportProcessingLog.accepted_timestamp,
+                ReportProcessingLog.forwarded_timestamp
+            )
+            .filter(
+                ReportProcessingLog.forwarded_timestamp != None,
+                ReportProcessingLog.accepted_timestamp != None,
+                ReportProcessingLog.forwarded_timestamp >= start_dt,
+                ReportProcessingLog.forwarded_timestamp < end_dt
+            ).all()
+        )
+        handled_map = {}
+        for pl in plogs:
+            uid = pl.user_id
+            if not uid:
+                continue
+            delta = 0
+            try:
+                if pl.forwarded_timestamp and pl.accepted_timestamp:
+                    delta = int((pl.forwarded_timestamp - pl.accepted_timestamp).total_seconds())
+            except Exception:
+                delta = 0
+            if delta < 0:
+                delta = 0
+            entry = handled_map.setdefault(uid, {'handled': 0, 'total_sec': 0})
+            entry['handled'] += 1
+            entry['total_sec'] += delta
+
+        # Collect created per user from Document within month
+        creators = db.session.query(ReportDocument).with_entities(ReportDocument.creator_id).filter(
+            ReportDocument.timestamp >= start_dt,
+            ReportDocument.timestamp < end_dt
+        ).all()
+        created_map = {}
+        for (cid,) in creators:
+            if cid:
+                created_map[cid] = created_map.get(cid, 0) + 1
+
+        # Merge and build list
+        all_uids = set(created_map.keys()) | set(handled_map.keys())
+        if all_uids:
+            users_rows = db.session.query(User.id, User.username).filter(User.id.in_(all_uids)).all()
+            usernames = {uid: uname for uid, uname in users_rows}
+            for uid in all_uids:
+                created = int(created_map.get(uid, 0))
+                handled_data = handled_map.get(uid, {'handled': 0, 'total_sec': 0})
+                handled = int(handled_data['handled'])
+                if created > 0 or handled > 0:
+                    avg_sec = int(handled_data['total_sec'] / handled) if handled > 0 else 0
+                    user_performance.append({
+                        'username': usernames.get(uid, f'User {uid}'),
+                        'documents_created': created,
+                        'documents_handled': handled,
+                        'avg_sec': avg_sec,
+                        'avg_formatted': format_timedelta(timedelta(seconds=avg_sec))
+                    })
+            user_performance.sort(key=lambda x: x['username'].lower() if isinstance(x['username'], str) else str(x['username']).lower())
+
+        # Leave user performance for selected period (created -> released)
+        try:
+            leave_rows = (
+                LeaveRequest.query
+                .with_entities(
+                    LeaveRequest.created_by_user_id,
+                    LeaveRequest.created_timestamp,
+                    LeaveRequest.released_timestamp
+                )
+                .filter(
+                    LeaveRequest.created_by_user_id != None,
+                    LeaveRequest.released_timestamp != None,
+                    LeaveRequest.released_timestamp >= start_dt,
+                    LeaveRequest.released_timestamp < end_dt
+                ).all()
+            )
+        except Exception:
+            leave_rows = []
+
+        agg = {}
+        for uid, cts, rts in leave_rows:
+            if not uid or not cts or not rts:
+                continue
+            try:
+                delta_td = calculate_business_hours(cts, rts)
+            except Exception:
+                delta_td = (rts - cts)
+            try:
+                sec = int(delta_td.total_seconds()) if delta_td else 0
+            except Exception:
+                sec = 0
+            if sec < 0:
+                sec = 0
+            e = agg.setdefault(uid, {'count': 0, 'total_sec': 0})
+            e['count'] += 1
+            e['total_sec'] += sec
+
+        if agg:
+            users_rows2 = db.session.query(User.id, User.username).filter(User.id.in_(list(agg.keys()))).all()
+            uname_map = {uid: uname for uid, uname in users_rows2}
+            for uid, data in agg.items():
+                cnt = int(data['count'])
+                avg_sec = int(data['total_sec'] / cnt) if cnt > 0 else 0
+                leave_user_metrics_period.append({
+                    'username': uname_map.get(uid, f'User {uid}'),
+                    'leaves_released': cnt,
+                    'avg_sec': avg_sec,
+                    'avg_formatted': format_timedelta(timedelta(seconds=avg_sec))
+                })
+            leave_user_metrics_period.sort(key=lambda x: x['username'].lower() if isinstance(x['username'], str) else str(x['username']).lower())
+        else:
+            leave_user_metrics_period = []
+    except Exception as _e:
+        user_performance = []
+        leave_user_metrics_period = []
+
+    return {
+        'documents_created_this_month': documents_created_this_month,
+        'per_classification_counts': per_classification_counts,
+        'classification_processing': classification_processing,
+        'classification_sub_processing': classification_sub_processing,
+        'monthly_best': monthly_best,
+        'monthly_worst': monthly_worst,
+        'user_performance': user_performance,
+        'leave_user_metrics_period': leave_user_metrics_period,
+    }
+
+
+def _snapshots_enabled() -> bool:
+    return bool(current_app.config.get('REPORT_SNAPSHOTS_ENABLED', True))
+
+
+def is_closed_period(end_dt, now=None) -> bool:
+    """A period is closed once its (exclusive) end lies in the past."""
+    return end_dt is not None and end_dt <= (now or datetime.utcnow())
+
+
+def _load_snapshot(start_dt, end_dt):
+    snapshot = ReportSnapshot.query.filter_by(
+        period_start=start_dt, period_end=end_dt, options_key=SNAPSHOT_OPTIONS_KEY
+    ).first()
+    if not snapshot:
+        return None
+    try:
+        return snapshot, json.loads(zlib.decompress(snapshot.payload).decode('utf-8'))
+    except Exception as exc:
+        current_app.logger.warning("Discarding unreadable report snapshot #%s: %s", snapshot.id, exc)
+        return None
+
+
+def _store_snapshot(start_dt, end_dt, summary):
+    payload = zlib.compress(json.dumps(summary, separators=(',', ':')).encode('utf-8'))
+    snapshot = ReportSnapshot(
+        period_start=start_dt,
+        period_end=end_dt,
+        options_key=SNAPSHOT_OPTIONS_KEY,
+        payload=payload,
+    )
+    try:
+        db.session.add(snapshot)
+        db.session.commit()
+    except IntegrityError:
+        # Another worker stored the same period first
+        db.session.rollback()
+        return None
+    return snapshot
+
+
+def build_report_summary(start_dt, end_dt, use_snapshot=True):
+    """
+    Return the report summary for [start_dt, end_dt). Period sections of a
+    closed period are served from (or saved to) a ReportSnapshot; overall
+    rankings span all time and are always computed live.
+    """
+    summary = None
+    snapshot = None
+    cacheable = use_snapshot and _snapshots_enabled() and is_closed_period(end_dt)
+    if cacheable:
+        loaded = _load_snapshot(start_dt, end_dt)
+        if loaded:
+            snapshot, summary = loaded
+    if summary is None:
+        summary = _build_period_summary(start_dt, end_dt)
+        if cacheable:
+            snapshot = _store_snapshot(start_dt, end_dt, summary)
+
+    report = dict(summary)
+    overall_board = processing_leaderboard()
+    report['overall_best'] = overall_board.best.to_dict() if overall_board.best else None
+    report['overall_worst'] = overall_board.worst.to_dict() if overall_board.worst else None
+    report['snapshot_at'] = snapshot.created_at if snapshot else None
+    return report
+
+
+def rebuild_report_snapshot(start_dt, end_dt):
+    """Drop the snapshot for a period and recompute it if the period is closed."""
+    invalidate_report_snapshots([(start_dt, end_dt)], exact=True)
+    db.session.commit()
+    return build_report_summary(start_dt, end_dt)
+
+
+def invalidate_report_snapshots(periods=None, exact=False) -> int:
+    """
+    Delete snapshots overlapping any of the given (start, end) periods (or
+    only exact period matches with ``exact=True``). Without ``periods``
+    every snapshot is dropped. The caller owns the transaction.
+    """
+    table = ReportSnapshot.__table__
+    stmt = delete(table)
+    if periods is not None:
+        clauses = []
+        for start, end in periods:
+            if exact:
+                clauses.append((table.c.period_start == start) & (table.c.period_end == end))
+            else:
+                clauses.append((table.c.period_start < end) & (table.c.period_end > start))
+        if not clauses:
+            return 0
+        stmt = stmt.where(or_(*clauses))
+    result = db.session.execute(stmt)
+    return result.rowcount or 0
+
+
+def _touched_timestamps(session):
+    """Current and previous report timestamps of rows changed in this flush."""
+    timestamps = set()
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj)
+    ]
+    for obj in changed:
+        names = _SNAPSHOT_TIMESTAMPS.get(type(obj))
+        if not names:
+            continue
+        state = inspect(obj)
+        for name in names:
+            values = [getattr(obj, name, None)]
+            values.extend(state.attrs[name].history.deleted or ())
+            timestamps.update(value for value in values if isinstance(value, datetime))
+    return timestamps
+
+
+def _users_renamed(session) -> bool:
+    return any(
+        isinstance(obj, User) and inspect(obj).attrs.username.history.has_changes()
+        for obj in session.dirty
+    )
+
+
+@event.listens_for(Session, 'before_flush')
+def _invalidate_snapshots_on_edit(session, flush_context, instances):
+    """Drop snapshots of closed periods that an edit in this flush touches."""
+    table = ReportSnapshot.__table__
+    if _users_renamed(session):
+        session.connection().execute(delete(table))
+        return
+    # Report periods end on a midnight boundary, so rows stamped today can't
+    # fall in a closed period; group the rest by day to keep the DELETE small.
+    now = datetime.utcnow()
+    today = datetime(now.year, now.month, now.day)
+    days = {datetime(ts.year, ts.month, ts.day) for ts in _touched_timestamps(session) if ts < today}
+    if days:
+        session.connection().execute(
+            delete(table).where(or_(*[
+                (table.c.period_start < day + timedelta(days=1)) & (table.c.period_end > day)
+                for day in sorted(days)
+            ]))
+        )
+
+
+def iter_report_documents(start_dt, end_dt, chunk_size=None):
+    """
+    Yield the documents created in [start_dt, end_dt), newest first, as
+    plain dicts. Rows are fetched with a ``yield_per`` cursor so only one
+    chunk is held in memory at a time.
+    """
+    chunk_size = chunk_size or _stream_chunk_size()
+    ReportDocument = all_documents()
+    Creator = aliased(User)
+    stmt = (
+        select(
+            ReportDocument.title,
+            ReportDocument.office,
+            ReportDocument.classification,
+            Creator.username,
+            ReportDocument.timestamp,
+            ReportDocument.status,
+            ReportDocument.barcode,
+        )
+        .outerjoin(Creator, Creator.id == ReportDocument.creator_id)
+        .where(ReportDocument.timestamp >= start_dt, ReportDocument.timestamp < end_dt)
+        .order_by(ReportDocument.timestamp.desc(), ReportDocument.id.desc())
+        .execution_options(yield_per=chunk_size)
+    )
+    # The with block closes the cursor when a caller stops early and closes the generator
+    with db.session.execute(stmt) as result:
+        for title, office, classification, creator, timestamp, status, barcode in result:
+            yield {
+                'title': title,
+                'office': office,
+                'classification': classification,
+                'creator': creator or 'Unknown',
+                'created_at': to_local_time(timestamp) if timestamp else None,
+                'status': status,
+                'barcode': barcode or '',
+            }
+
+
+def _summary_text_lines(report, period_label, generated_ts):
+    lines = []
+    lines.append(f'System Activity Report — {period_label}')
+    lines.append(f'Generated: {generated_ts}')
+    lines.append('')
+    lines.append('Summary')
+    lines.append('-------')
+    lines.append(f'Documents created in period: {report["documents_created_this_month"]}')
+    lines.append('Per-Classification counts (selected period):')
+    for k, v in report['per_classification_counts'].items():
+        lines.append(f'  - {k}: {v}')
+    lines.append('')
+    lines.append(f'Processing Time by Classification and Sub-types ({period_label})')
+    lines.append('------------------------------------------------------')
+    for grp in report['classification_sub_processing']:
+        lines.append(f'  {grp["classification"]}:')
+        for row in grp["rows"]:
+            lines.append(f'    - {row["sub"]}: count {row["count"]}, avg {row["avg_formatted"]}')
+    lines.append('')
+    for title, best, worst in (
+        ('Rankings (Selected Period)', report['monthly_best'], report['monthly_worst']),
+        ('Rankings (Overall)', report['overall_best'], report['overall_worst']),
+    ):
+        lines.append(title)
+        lines.append('-' * len(title))
+        if best:
+            lines.append(f'  Top performer: {best["username"]} — {best["avg_formatted"]} (avg, {best["count"]} handled)')
+        else:
+            lines.append('  Top performer: N/A')
+        if worst:
+            lines.append(f'  Longest processing: {worst["username"]} — {worst["avg_formatted"]} (avg, {worst["count"]} handled)')
+        else:
+            lines.append('  Longest processing: N/A')
+        lines.append('')
+    lines.append('User Performance (Selected Period)')
+    lines.append('----------------------------------')
+    if report['user_performance']:
+        for u in report['user_performance']:
+            lines.append(f'  - {u["username"]}: created {u["documents_created"]}, handled {u["documents_handled"]}, avg {u["avg_formatted"]}')
+    else:
+        lines.append('  No user activity found.')
+    lines.append('')
+    lines.append('Leave User Performance (Selected Period)')
+    lines.append('---------------------------------------')
+    if report['leave_user_metrics_period']:
+        for row in report['leave_user_metrics_period']:
+            lines.append(f'  - {row["username"]}: released {row["leaves_released"]}, avg {row["avg_formatted"]}')
+    else:
+        lines.append('  No leave processing data found.')
+    lines.append('')
+    return lines
+
+
+def iter_report_text(report, period_label, documents=None):
+    """
+    Yield the plain-text report: the summary sections first, then the
+    document list (if ``documents`` is given) in chunks.
+    """
+    generated_ts = to_local_time(datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+    yield '\n'.join(_summary_text_lines(report, period_label, generated_ts)) + '\n'
+    if documents is None:
+        return
+    yield 'Documents Created This Month\n'
+    yield '----------------------------\n'
+    chunk_size = _stream_chunk_size()
+    empty = True
+    while True:
+        chunk = list(islice(documents, chunk_size))
+        if not chunk:
+            break
+        empty = False
+        lines = []
+        for d in chunk:
+            created_str = d['created_at'].strftime('%Y-%m-%d %H:%M') if d['created_at'] else 'N/A'
+            lines.append(f'  • {d["title"]} | {d["office"]} | {d["classification"]} | by {d["creator"]} | {created_str} | {d["status"]} | {d["barcode"]}')
+        yield '\n'.join(lines) + '\n'
+    if empty:
+        yield '  No documents found.\n'
+
+
+def iter_report_csv(report, period_label, documents=None):
+    """
+    Yield the report as CSV: one ``section,label,...`` block per summary
+    section, then the document list (if ``documents`` is given) in chunks.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    writer.writerow(['System Activity Report', period_label])
+    writer.writerow(['Generated', to_local_time(datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')])
+    writer.writerow([])
+    writer.writerow(['section', 'name', 'count', 'avg_seconds', 'avg', 'created'])
+    writer.writerow(['summary', 'Documents created in period', report['documents_created_this_month'], '', ''])
+    for k, v in report['per_classification_counts'].items():
+        writer.writerow(['classification_count', k, v, '', ''])
+    for grp in report['classification_sub_processing']:
+        for row in grp['rows']:
+            writer.writerow(['processing_time', f'{grp["classification"]} / {row["sub"]}',
+                             row['count'], row['avg_sec'], row['avg_formatted']])
+    for section, entry in (
+        ('ranking_period_top', report['monthly_best']),
+        ('ranking_period_longest', report['monthly_worst']),
+        ('ranking_overall_top', report['overall_best']),
+        ('ranking_overall_longest', report['overall_worst']),
+    ):
+        if entry:
+            writer.writerow([section, entry['username'], entry['count'], entry['avg_sec'], entry['avg_formatted']])
+    for u in report['user_performance']:
+        writer.writerow(['user_performance', u['username'], u['documents_handled'], u['avg_sec'], u['avg_formatted'],
+                         u['documents_created']])
+    for row in report['leave_user_metrics_period']:
+        writer.writerow(['leave_user_performance', row['username'], row['leaves_released'], row['avg_sec'], row['avg_formatted']])
+    yield drain()
+
+    if documents is None:
+        return
+    writer.writerow([])
+    writer.writerow(DETAIL_FIELDS)
+    chunk_size = _stream_chunk_size()
+    while True:
+        chunk = list(islice(documents, chunk_size))
+        if not chunk:
+            break
+        for d in chunk:
+            created_str = d['created_at'].strftime('%Y-%m-%d %H:%M') if d['created_at'] else ''
+            writer.writerow([d['title'], d['office'], d['classification'], d['creator'],
+                             created_str, d['status'], d['barcode']])
+        yield drain()
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, session, jsonify, make_response, render_template_string, send_from_directory, abort
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, session, jsonify, make_response, render_template_string, send_from_directory, abort, Response, stream_with_context
 from flask_login import login_user, current_user, logout_user, login_required
 from app import db
 from app.forms import RegistrationForm, LoginForm, DocumentForm, DeclineDocumentForm, ForwardDocumentForm, ResubmitDocumentForm, LeaveRequestForm, EWPForm, EmployeeForm, LEAVE_TYPE_CHOICES, BatchDeclineDocumentForm, BatchForwardDocumentForm
@@ -13,13 +13,25 @@ from app.models import (
     Employee,
     to_local_time,
     format_timedelta,
-    EDUCATION_FIELD_NAMES,
-    CIVIL_SERVICE_FIELD_NAMES,
-    WORK_EXPERIENCE_FIELD_NAMES,
-    VOLUNTARY_WORK_FIELD_NAMES,
-    LEARNING_DEV_FIELD_NAMES,
-    SLAAlertPreference
+    SLAAlertPreference,
+    ArchivedDocument,
+    ArchivedActivityLog,
+    ArchivedProcessingLog,
+    ReportJob,
+    BatchJob
 )
+from app.archive_storage import move_documents_to_archive, restore_documents_from_archive, get_archive_facets, paginate_user_archive, count_all_documents, find_document_by_barcode, paginate_documents_with_archive, paginate_activities_with_archive
+from app.reports import build_report_summary, iter_report_documents, iter_report_text, iter_report_csv, report_period_dates, report_period_label, resolve_report_period, rebuild_report_snapshot, invalidate_report_snapshots
+from app.report_jobs import submit_report_job, artifact_dir as report_artifact_dir
+from app.rankings import processing_leaderboard
+from app.exports import EXPORT_FORMATS, ExportFilters, iter_export
+from app.batch_transitions import ACCEPT, DECLINE, FORWARD, RELEASE, apply_batch_transition
+from app.batch_jobs import submit_batch_job, should_run_async, job_failures
+from app.document_intake import INTAKE_COLUMNS, DEFAULT_ACTION_TAKEN as INTAKE_DEFAULT_ACTION_TAKEN, IntakeFileError, IntakeInsertError, intake_documents, read_intake_rows, xlsx_available as intake_xlsx_available
+from app.user_directory import get_user_directory
+from app.employee_sections import PROFILE_SECTIONS, ProfileUpdateError, apply_profile_updates, payload_etag, section_load_options, section_payload
+from app.employee_reports import employees_with_eligibility, eligibility_counts_by_office, learning_dev_hours_by_office
+from app.employee_search import search_employees
 from app.theme_state import read_theme_state, write_theme_state, ALLOWED_THEMES, DEFAULT_THEME, THEME_SEQUENCE
 
 from werkzeug.utils import secure_filename
@@ -27,15 +39,17 @@ from datetime import timedelta, datetime
 import os
 import csv
 import pytz
-from sqlalchemy import or_, case, extract, and_, text
-from sqlalchemy.orm import joinedload
+from sqlalchemy import or_, case, extract, and_, text, select
+from sqlalchemy.orm import joinedload, aliased, undefer_group
 from sqlalchemy.exc import OperationalError, ProgrammingError
 import json
 from werkzeug.security import generate_password_hash, check_password_hash
 import mimetypes
 from app.utils import get_upload_path, get_file_url, calculate_business_hours, is_allowed_file
-from app.sla_monitor import _resolve_document_anchor, _elapsed_hours, _format_elapsed_duration
+from app.sla_monitor import _resolve_document_anchors, _elapsed_hours, _format_elapsed_duration, get_sla_snapshot, invalidate_sla_snapshot
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import islice
+from contextlib import closing
 
 # form choices
 OFFICE_CHOICES = [
@@ -74,7 +88,20 @@ def get_recipient_choices():
     """Return list of recipient choices excluding current user"""
     if not current_user.is_authenticated:
         return []
-    return [(user.id, user.username) for user in User.query.filter(User.id != current_user.id).all()]
+    return get_user_directory().recipient_choices(exclude_id=current_user.id)
+
+
+RECIPIENT_TYPEAHEAD_LIMIT = 20
+
+@main.route('/users/typeahead')
+@login_required
+def recipient_typeahead():
+    """Active users whose username starts with ``q``, for the recipient pickers."""
+    limit = min(max(request.args.get('limit', RECIPIENT_TYPEAHEAD_LIMIT, type=int), 1), 100)
+    matches = get_user_directory().search_active(request.args.get('q', ''), limit=limit, exclude_id=current_user.id)
+    resp = jsonify({'results': [{'id': user_id, 'username': username} for user_id, username in matches]})
+    resp.headers['Cache-Control'] = 'private, max-age=30'
+    return resp
 
 
 @main.route('/system-theme', methods=['GET'])
@@ -142,20 +169,8 @@ def employee_list():
         per_page = 10
 
         try:
-            query = Employee.query
-
-            if search_query:
-                query = query.filter(
-                    or_(
-                        Employee.employee_name.ilike(f'%{search_query}%'),
-                        Employee.bio_number.ilike(f'%{search_query}%'),
-                        Employee.office.ilike(f'%{search_query}%'),
-                        Employee.position.ilike(f'%{search_query}%'),
-                        Employee.status.ilike(f'%{search_query}%')
-                    )
-                )
-
-            pagination = query.order_by(Employee.bio_number.asc()).paginate(page=page, per_page=per_page, error_out=False)
+            query = search_employees(search_query, [value for value, _label in OFFICE_CHOICES])
+            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
             employees = pagination.items
         except (OperationalError, ProgrammingError) as e:
             try:
@@ -186,6 +201,20 @@ def employee_list():
                                search_query=request.args.get('search', '').strip(),
                                form=form)
 
+@main.route('/employees/<int:employee_id>/profile_modal')
+@login_required
+def employee_profile_modal(employee_id):
+    """
+    Profile modal HTML for one employee; the list page fetches it when View is
+    clicked. Only the tab it opens on (personal + addresses) is rendered; the
+    other tabs load from employee_profile_section when shown.
+    """
+    if not (current_user.is_admin or current_user.can_access_employee_records):
+        abort(403)
+    shell_sections = [PROFILE_SECTIONS['personal'], PROFILE_SECTIONS['addresses']]
+    employee = Employee.query.options(*section_load_options(shell_sections)).get_or_404(employee_id)
+    return render_template('partials/employee_profile_modal.html', e=employee)
+
 @main.route('/employees/add', methods=['GET', 'POST'])
 @login_required
 def add_employee():
@@ -281,7 +310,7 @@ def edit_employee(employee_id):
         flash('You are not authorized to edit employees.', 'danger')
         return redirect(url_for('main.employee_list'))
 
-    employee = Employee.query.get_or_404(employee_id)
+    employee = Employee.query.options(undefer_group('personal'), undefer_group('address')).get_or_404(employee_id)
     form = EmployeeForm(obj=employee)
     form.office.choices = OFFICE_CHOICES
 
@@ -415,226 +444,12 @@ def update_employee_profile(employee_id):
     try:
         employee = Employee.query.get_or_404(employee_id)
 
-        # Allowed keys for inline profile editing (Personal Information, address/contact, and employment core)
-        allowed_fields = [
-            # Personal Information
-            'surname', 'first_name', 'middle_name', 'name_extension',
-            'date_of_birth', 'place_of_birth', 'sex', 'civil_status',
-            'height_m', 'weight_kg', 'blood_type',
-            'gsis_id_no', 'pagibig_id_no', 'philhealth_no', 'sss_no', 'tin', 'agency_employee_no',
-            'citizenship', 'citizenship_details',
-            # Residential Address
-            'res_house_lot', 'res_street', 'res_subdivision', 'res_barangay',
-            'res_city_municipality', 'res_province', 'res_zip_code',
-            # Permanent Address
-            'perm_house_lot', 'perm_street', 'perm_subdivision', 'perm_barangay',
-            'perm_city_municipality', 'perm_province', 'perm_zip_code',
-            # Contact
-            'telephone_no', 'mobile_no', 'email_address',
-            # Family Background
-            'spouse_surname', 'spouse_first_name', 'spouse_middle_name', 'spouse_occupation',
-            'spouse_employer_name', 'spouse_business_address', 'spouse_telephone_no',
-            'father_surname', 'father_first_name', 'father_middle_name', 'father_extension',
-            'mother_maiden_surname', 'mother_maiden_first_name', 'mother_maiden_middle_name',
-            'children_info',
-            # Educational Background
-            'elem_school_name', 'elem_basic_education', 'elem_period_from', 'elem_period_to',
-            'elem_highest_level', 'elem_year_graduated', 'elem_scholarships',
-            'sec_school_name', 'sec_basic_education', 'sec_period_from', 'sec_period_to',
-            'sec_highest_level', 'sec_year_graduated', 'sec_scholarships',
-            'voc_school_name', 'voc_basic_education', 'voc_period_from', 'voc_period_to',
-            'voc_highest_level', 'voc_year_graduated', 'voc_scholarships',
-            'college_school_name', 'college_basic_education', 'college_period_from', 'college_period_to',
-            'college_highest_level', 'college_year_graduated', 'college_scholarships',
-            'grad_school_name', 'grad_basic_education', 'grad_period_from', 'grad_period_to',
-            'grad_highest_level', 'grad_year_graduated', 'grad_scholarships',
-            # Employment core (auto-filled section) - allow inline changes
-            'bio_number', 'office', 'position', 'status'
-        ]
-
         # Read values from form (support both form and JSON for flexibility)
         data = request.form if request.form else (request.get_json(silent=True) or {})
-
-        # Pre-validate special cases
-        # 1) bio_number uniqueness
-        if 'bio_number' in data:
-            new_bio = (data.get('bio_number') or '').strip()
-            if new_bio and new_bio != (employee.bio_number or ''):
-                dupe = Employee.query.filter(Employee.bio_number == new_bio, Employee.id != employee.id).first()
-                if dupe:
-                    return jsonify({
-                        'success': False,
-                        'message': f'Biometric number is already taken by employee {dupe.employee_name}'
-                    }), 400
-
-        # 2) office must be in OFFICE_CHOICES (value list) if provided
-        if 'office' in data:
-            off = (data.get('office') or '').strip()
-            valid_offices = {v for (v, _lbl) in OFFICE_CHOICES}
-            if off and off not in valid_offices:
-                return jsonify({'success': False, 'message': 'Invalid office selection'}), 400
-
-        # 3) position - keep current simple whitelist (if you later expand, adjust here)
-        if 'position' in data:
-            pos = (data.get('position') or '').strip()
-            valid_positions = {'Job Order Worker', 'Contract of Service'}
-            if pos and pos not in valid_positions:
-                return jsonify({'success': False, 'message': 'Invalid position selection'}), 400
-
-        # 4) status allowed values
-        if 'status' in data:
-            st = (data.get('status') or '').strip()
-            if st and st not in {'Active', 'Inactive'}:
-                return jsonify({'success': False, 'message': 'Invalid status value'}), 400
-
-        education_json_fields = [
-            ('elem_records_json', 'elem'),
-            ('sec_records_json', 'sec'),
-            ('voc_records_json', 'voc'),
-            ('college_records_json', 'college'),
-            ('grad_records_json', 'grad')
-        ]
-
-        def _normalize_education_entries(raw_entries):
-            normalized = []
-            if isinstance(raw_entries, list):
-                for entry in raw_entries:
-                    if not isinstance(entry, dict):
-                        continue
-                    norm = {field: (entry.get(field) or '').strip() for field in EDUCATION_FIELD_NAMES}
-                    if any(norm.values()):
-                        normalized.append(norm)
-            return normalized
-
-        def _normalize_civil_service_entries(raw_entries):
-            normalized = []
-            if isinstance(raw_entries, list):
-                for entry in raw_entries:
-                    if not isinstance(entry, dict):
-                        continue
-                    norm = {field: (entry.get(field) or '').strip() for field in CIVIL_SERVICE_FIELD_NAMES}
-                    if any(norm.values()):
-                        normalized.append(norm)
-            return normalized
-
-        def _normalize_work_experience_entries(raw_entries):
-            normalized = []
-            if isinstance(raw_entries, list):
-                for entry in raw_entries:
-                    if not isinstance(entry, dict):
-                        continue
-                    norm = {field: (entry.get(field) or '').strip() for field in WORK_EXPERIENCE_FIELD_NAMES}
-                    if any(norm.values()):
-                        normalized.append(norm)
-            return normalized
-
-        def _normalize_voluntary_work_entries(raw_entries):
-            normalized = []
-            if isinstance(raw_entries, list):
-                for entry in raw_entries:
-                    if not isinstance(entry, dict):
-                        continue
-                    norm = {field: (entry.get(field) or '').strip() for field in VOLUNTARY_WORK_FIELD_NAMES}
-                    if any(norm.values()):
-                        normalized.append(norm)
-            return normalized
-
-        def _normalize_learning_dev_entries(raw_entries):
-            normalized = []
-            if isinstance(raw_entries, list):
-                for entry in raw_entries:
-                    if not isinstance(entry, dict):
-                        continue
-                    norm = {field: (entry.get(field) or '').strip() for field in LEARNING_DEV_FIELD_NAMES}
-                    if any(norm.values()):
-                        normalized.append(norm)
-            return normalized
-
-        normalized_education = {}
-        updated = {}
-
-        for json_field, prefix in education_json_fields:
-            if json_field in data:
-                raw_json = data.get(json_field) or ''
-                try:
-                    parsed = json.loads(raw_json)
-                except Exception:
-                    parsed = []
-                normalized = _normalize_education_entries(parsed)
-                json_str = json.dumps(normalized)
-                setattr(employee, json_field, json_str if normalized else None)
-                normalized_education[prefix] = normalized
-                updated[json_field] = json_str
-
-        if 'civil_service_records_json' in data:
-            raw_json = data.get('civil_service_records_json') or ''
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            normalized_cse = _normalize_civil_service_entries(parsed)
-            json_str = json.dumps(normalized_cse)
-            employee.civil_service_records_json = json_str if normalized_cse else None
-            updated['civil_service_records_json'] = json_str
-
-        if 'work_experience_json' in data:
-            raw_json = data.get('work_experience_json') or ''
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            normalized_we = _normalize_work_experience_entries(parsed)
-            json_str = json.dumps(normalized_we)
-            employee.work_experience_json = json_str if normalized_we else None
-            updated['work_experience_json'] = json_str
-
-        if 'voluntary_work_json' in data:
-            raw_json = data.get('voluntary_work_json') or ''
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            normalized_vw = _normalize_voluntary_work_entries(parsed)
-            json_str = json.dumps(normalized_vw)
-            employee.voluntary_work_json = json_str if normalized_vw else None
-            updated['voluntary_work_json'] = json_str
-
-        if 'learning_dev_json' in data:
-            raw_json = data.get('learning_dev_json') or ''
-            try:
-                parsed = json.loads(raw_json)
-            except Exception:
-                parsed = []
-            normalized_ld = _normalize_learning_dev_entries(parsed)
-            json_str = json.dumps(normalized_ld)
-            employee.learning_dev_json = json_str if normalized_ld else None
-            updated['learning_dev_json'] = json_str
-
-        for key in allowed_fields:
-            if key in data:
-                val = (data.get(key) or '').strip()
-                if key == 'children_info':
-                    # normalize to single newline-separated entries
-                    lines = [ln.strip() for ln in val.splitlines()]
-                    lines = [ln for ln in lines if ln]
-                    val = '\n'.join(lines)
-                setattr(employee, key, val if val != '' else None)
-                updated[key] = getattr(employee, key)
-
-        # Sync educational base columns with normalized lists (ensures consistency even if no base inputs were submitted)
-        for prefix, entries in normalized_education.items():
-            first_entry = entries[0] if entries else {}
-            for field in EDUCATION_FIELD_NAMES:
-                column_name = f"{prefix}_{field}"
-                value = (first_entry.get(field, '').strip() if first_entry else '')
-                setattr(employee, column_name, value if value != '' else None)
-                updated[column_name] = getattr(employee, column_name)
-
-        # Re-compose display name from surname and first_name if any of them provided
-        if ('surname' in data) or ('first_name' in data):
-            s = (employee.surname or '').strip()
-            f = (employee.first_name or '').strip()
-            employee.employee_name = f"{s}, {f}".strip(', ').strip()
+        try:
+            updated = apply_profile_updates(employee, data, {v for (v, _lbl) in OFFICE_CHOICES})
+        except ProfileUpdateError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
 
         db.session.commit()
 
@@ -654,6 +469,92 @@ def update_employee_profile(employee_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+def _employee_section_response(employee, section, include_html):
+    data = section_payload(employee, section)
+    # 'etag' is the value PATCH expects in If-Match; the HTTP ETag also covers the html
+    payload = {'section': section.name, 'etag': payload_etag(data), 'data': data}
+    if include_html and section.template:
+        payload['html'] = render_template(section.template, e=employee)
+    response = jsonify(payload)
+    response.set_etag(payload['etag'] + ('-html' if 'html' in payload else ''))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@main.route('/employees/<int:employee_id>/sections/<section_name>', methods=['GET', 'PATCH'])
+@login_required
+def employee_profile_section(employee_id, section_name):
+    """
+    Read or patch one profile section as JSON.
+
+    GET returns {section, data[, html]} with an ETag of the section data and
+    answers If-None-Match with 304; ?html=1 adds the rendered tab pane.
+    PATCH applies only the section's keys (same formats as update_profile)
+    and answers a stale If-Match with 412.
+    """
+    if not (current_user.is_admin or current_user.can_access_employee_records):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    section = PROFILE_SECTIONS.get(section_name)
+    if section is None:
+        return jsonify({'success': False, 'message': 'Unknown section'}), 404
+    employee = Employee.query.options(*section_load_options([section])).get_or_404(employee_id)
+
+    if request.method == 'GET':
+        response = _employee_section_response(employee, section, request.args.get('html') == '1')
+        return response.make_conditional(request)
+
+    current_etag = payload_etag(section_payload(employee, section))
+    if request.if_match and not request.if_match.contains(current_etag):
+        return jsonify({'success': False, 'message': 'This section was changed by someone else. Reload it and try again.',
+                        'etag': current_etag}), 412
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = request.form
+    try:
+        updated = apply_profile_updates(employee, data, {v for (v, _lbl) in OFFICE_CHOICES},
+                                        fields=section.fields, record_columns=section.record_columns)
+        db.session.commit()
+    except ProfileUpdateError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Profile section update error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    data = section_payload(employee, section)
+    etag = payload_etag(data)
+    response = jsonify({'success': True, 'section': section.name, 'etag': etag, 'updated': updated, 'data': data,
+                        'employee_name': employee.employee_name or '', 'id': employee.id})
+    response.set_etag(etag)
+    return response
+
+
+@main.route('/employees/summary')
+@login_required
+def employee_summary():
+    """
+    HR aggregates from the PDS child tables: employees per eligibility and
+    L&D hours per office. ?career_service= also lists the holders of one
+    eligibility; ?ld_type= limits the hours to one L&D type.
+    """
+    if not (current_user.is_admin or current_user.can_access_employee_records):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    career_service = (request.args.get('career_service') or '').strip()
+    ld_type = (request.args.get('ld_type') or '').strip() or None
+    result = {
+        'success': True,
+        'eligibility_by_office': eligibility_counts_by_office(),
+        'learning_dev_hours_by_office': learning_dev_hours_by_office(ld_type),
+    }
+    if career_service:
+        result['eligibility_holders'] = [
+            {'id': e.id, 'bio_number': e.bio_number, 'employee_name': e.employee_name, 'office': e.office}
+            for e in employees_with_eligibility(career_service, limit=500)
+        ]
+    return jsonify(result)
+
+
 @main.route('/employees/check_bio_number', methods=['POST'])
 @login_required
 def check_bio_number():
@@ -839,10 +740,11 @@ def dashboard():
     form.classification.choices = CLASSIFICATION_CHOICES
     form.status.choices = STATUS_CHOICES
     form.action_taken.choices = ACTION_TAKEN_CHOICES
-    form.recipient.choices = get_recipient_choices()
-    
-    forward_form.recipient.choices = get_recipient_choices()
-    batch_forward_form.recipient.choices = get_recipient_choices()
+    # Recipient pickers load their options from the typeahead endpoint, so the
+    # page stays the same size however many accounts exist
+    form.recipient.choices = []
+    forward_form.recipient.choices = []
+    batch_forward_form.recipient.choices = []
     
     created_query = Document.query.filter(
         Document.creator_id == current_user.id,
@@ -881,16 +783,9 @@ def dashboard():
             )
 
     if view == 'received':
-        status_order = case(
-            (Document.status == 'Pending', 0),
-            (Document.status == 'Accepted', 1),
-            (Document.status == 'Forwarded', 2),
-            (Document.status == 'Declined', 3),
-            (Document.status == 'Released', 4),
-            else_=5
-        )
-        # Ensure actionable items stay on top and Released items sink to the end
-        received_pagination = received_query.order_by(status_order, Document.timestamp.desc()).paginate(
+        # Ensure actionable items stay on top and Released items sink to the end;
+        # status_rank follows ix_doc_recipient_rank_ts so no filesort is needed
+        received_pagination = received_query.order_by(Document.status_rank, Document.timestamp.desc()).paginate(
             page=page, per_page=per_page, error_out=False)
         received_documents = received_pagination.items
         created_pagination = None
@@ -1034,7 +929,7 @@ def create_document():
             if not classification:
                 classification = form.classification.data
 
-            recipient_user = User.query.get(form.recipient.data)
+            recipient_id = form.recipient.data
             barcode_value = form.barcode.data.strip() if form.barcode.data else None
             barcode_suggested_flag = True if (request.form.get('barcode_from_suggestion') == '1') else False
             document = Document(
@@ -1047,7 +942,7 @@ def create_document():
                 attachment=attachment_path, 
                 barcode=barcode_value, 
                 creator=current_user, 
-                recipient=recipient_user
+                recipient_id=recipient_id
             )
 
             db.session.add(document)
@@ -1055,7 +950,7 @@ def create_document():
 
             # notification for recipient
             notification = Notification(
-                user=recipient_user,
+                user_id=recipient_id,
                 message=f"You have received a new document: {document.title}"
             )
             db.session.add(notification)
@@ -1101,6 +996,65 @@ def create_document():
     
     return redirect(url_for('main.dashboard'))
 
+@main.route('/documents/intake', methods=['GET', 'POST'])
+@login_required
+def document_intake():
+    """Create many documents at once from an uploaded CSV/XLSX file."""
+    context = {
+        'xlsx_available': intake_xlsx_available(),
+        'default_action_taken': INTAKE_DEFAULT_ACTION_TAKEN,
+        'error_cap': 500,
+        'result': None,
+        'filename': None,
+    }
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Please choose a file to upload.', 'warning')
+            return render_template('document_intake.html', **context)
+        try:
+            records = read_intake_rows(upload.stream, upload.filename)
+            result = intake_documents(
+                records,
+                current_user,
+                offices=[value for value, _ in OFFICE_CHOICES],
+                action_values=[value for value, _ in ACTION_TAKEN_CHOICES],
+                skip_invalid=request.form.get('skip_invalid') == '1',
+            )
+        except IntakeFileError as e:
+            flash(str(e), 'danger')
+            return render_template('document_intake.html', **context)
+        except IntakeInsertError as e:
+            current_app.logger.error(f"Error in bulk document intake at row {e.first_row}: {str(e)}")
+            if e.result.created:
+                flash(f'Created {e.result.created} document(s) from the rows before row {e.first_row}, then stopped: '
+                      f'{str(e)}. Upload only row {e.first_row} onwards again to avoid duplicates.', 'danger')
+            else:
+                flash(f'Error importing documents: {str(e)}', 'danger')
+            context.update(result=e.result, filename=secure_filename(upload.filename))
+            return render_template('document_intake.html', **context)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error in bulk document intake: {str(e)}")
+            flash(f'Error importing documents: {str(e)}', 'danger')
+            return render_template('document_intake.html', **context)
+
+        if result.created:
+            flash(f'Created {result.created} document(s).', 'success')
+        if result.errors and not result.created:
+            flash(f'No documents were created: {result.error_rows} row(s) have errors.', 'danger')
+        context.update(result=result, filename=secure_filename(upload.filename))
+    return render_template('document_intake.html', **context)
+
+@main.route('/documents/intake/template.csv')
+@login_required
+def document_intake_template():
+    """Blank CSV with the intake columns."""
+    resp = make_response(','.join(INTAKE_COLUMNS) + '\r\n')
+    resp.headers['Content-Type'] = 'text/csv; charset=utf-8'
+    resp.headers['Content-Disposition'] = 'attachment; filename=document_intake_template.csv'
+    return resp
+
 # LeaveRequest create endpoint
 @main.route('/leave_request/create', methods=['POST'])
 @login_required
@@ -1661,7 +1615,7 @@ def edit_document(document_id):
             document.action_taken = form.action_taken.data
             document.remarks = form.remarks.data
             document.barcode = barcode_value
-            document.recipient = User.query.get(form.recipient.data)
+            document.recipient_id = form.recipient.data
 
             db.session.commit()
             flash('Document updated successfully.', 'success')
@@ -1878,9 +1832,9 @@ def forward_document(document_id):
             document.forwarded_timestamp = datetime.utcnow()
 
             # Notify the new recipient
-            new_recipient_user = User.query.get(new_recipient_id)
+            new_recipient_user = get_user_directory().get(new_recipient_id)
             notification = Notification(
-                user=new_recipient_user,
+                user_id=new_recipient_user.id,
                 message=f"Document '{document.title}' has been forwarded to you by {current_user.username}"
             )
             db.session.add(notification)
@@ -1986,6 +1940,11 @@ def archive_document(document_id):
             remarks="Document archived"
         )
         db.session.add(activity_log)
+        db.session.flush()
+        # Move it and its history to the archive tables right away
+        move_documents_to_archive([document.id])
+        db.session.expunge(activity_log)
+        db.session.expunge(document)
         db.session.commit()
 
         flash('Document archived successfully.', 'success')
@@ -2031,52 +1990,51 @@ def archive():
             start_dt = None
             end_dt = None
 
-    query = Document.query.filter(
-        (Document.status == 'Archived') &
-        ((Document.creator == current_user) | (Document.recipient == current_user))
-    )
+    # Archived documents live in the archive tables (see app/archive_storage.py)
+    criteria = []
 
     # Apply search if provided
     if search:
-        query = query.filter(
+        criteria.append(
             or_(
-                Document.title.ilike(f'%{search}%'),
-                Document.office.ilike(f'%{search}%'),
-                Document.classification.ilike(f'%{search}%'),
-                Document.status.ilike(f'%{search}%'),
+                ArchivedDocument.title.ilike(f'%{search}%'),
+                ArchivedDocument.office.ilike(f'%{search}%'),
+                ArchivedDocument.classification.ilike(f'%{search}%'),
+                ArchivedDocument.status.ilike(f'%{search}%'),
                 or_(
-                    Document.barcode.ilike(f'%{search}%'),
-                    Document.barcode == search
+                    ArchivedDocument.barcode.ilike(f'%{search}%'),
+                    ArchivedDocument.barcode == search
                 )
             )
         )
 
     # Apply date range filter if available
     if start_dt is not None and end_dt is not None:
-        query = query.filter(
-            Document.timestamp >= start_dt,
-            Document.timestamp < end_dt
-        )
-
-    paginated_documents = query.order_by(Document.timestamp.desc()).paginate(
+        criteria.append(ArchivedDocument.timestamp >= start_dt)
+        criteria.append(ArchivedDocument.timestamp < end_dt)
+
+    # Created and received sides are paged separately so each one walks its
+    # (user, timestamp) index instead of an OR scan
+    paginated_documents = paginate_user_archive(
+        current_user.id,
+        criteria=criteria,
+        options=[
+            joinedload(ArchivedDocument.creator),
+            joinedload(ArchivedDocument.recipient)
+        ],
         page=page, per_page=10, error_out=False
     )
     
-    years_query = db.session.query(
-        db.func.year(Document.timestamp).label('year')
-    ).filter(
-        Document.status=='Archived',
-        (Document.creator_id == current_user.id) | (Document.recipient_id == current_user.id)
-    ).distinct().order_by(
-        db.func.year(Document.timestamp).desc()
-    )
-    
-    try:
-        years = [int(year[0]) for year in years_query.all() if year[0]]
-    except (TypeError, ValueError):
-        years = []
-        current_year = datetime.now().year
-        years = list(range(current_year, current_year-5, -1))
+    # Filter dropdowns come from the precomputed per-user facet index
+    facets = get_archive_facets(current_user.id)
+    years = sorted(facets.keys(), reverse=True)
+    year_counts = {y: sum(months.values()) for y, months in facets.items()}
+    month_counts = {}
+    for y, months in facets.items():
+        if year and str(y) != year:
+            continue
+        for m, count in months.items():
+            month_counts[m] = month_counts.get(m, 0) + count
 
     for document in paginated_documents.items:
         document.activities_json = [activity.to_dict() for activity in document.activities]
@@ -2086,6 +2044,8 @@ def archive():
                          archived_documents=paginated_documents.items,
                          pagination=paginated_documents,
                          years=years,
+                         year_counts=year_counts,
+                         month_counts=month_counts,
                          current_month=month,
                          current_year=year,
                          search=search)
@@ -2093,13 +2053,22 @@ def archive():
 @main.route('/unarchive_document/<int:document_id>', methods=['POST'])
 @login_required
 def unarchive_document(document_id):
-    document = Document.query.get_or_404(document_id)
+    archived = db.session.get(ArchivedDocument, document_id)
+    document = None if archived else Document.query.get_or_404(document_id)
+    owner = archived or document
 
-    if document.creator != current_user and document.recipient != current_user:
+    if owner.creator_id != current_user.id and owner.recipient_id != current_user.id:
         flash('You are not authorized to unarchive this document.', 'danger')
         return redirect(url_for('main.archive'))
 
     try:
+        if archived:
+            # Move the document and its history back to the live tables
+            db.session.expunge(archived)
+            restore_documents_from_archive([document_id])
+            db.session.flush()
+            document = db.session.get(Document, document_id)
+
         # Restore the document to its previous status or set to 'Pending'
         document.status = 'Pending'
         db.session.commit()
@@ -2162,40 +2131,55 @@ def _describe_sla_key(dedupe_key: str):
 def _compute_duration_label(key_info):
     if not key_info:
         return None
+    return _compute_duration_labels([key_info]).get(key_info.get('raw'))
 
-    entity_type = key_info.get('entity_type')
-    entity_id = key_info.get('entity_id')
-    if not entity_type or entity_id is None:
-        return None
 
-    now = datetime.utcnow()
+def _compute_duration_labels(key_infos):
+    """
+    Resolve elapsed-duration labels for many SLA keys at once: one query per
+    entity type plus one grouped anchor query for documents. Returns a dict
+    keyed by the raw dedupe key.
+    """
+    ids_by_type = {'Document': set(), 'LeaveRequest': set(), 'EWPRecord': set()}
+    for info in key_infos:
+        if not info or info.get('entity_id') is None:
+            continue
+        if info.get('entity_type') in ids_by_type:
+            ids_by_type[info['entity_type']].add(info['entity_id'])
 
+    anchors = {}
     try:
-        if entity_type == 'Document':
-            document = Document.query.get(entity_id)
-            if not document:
-                return None
-            anchor = _resolve_document_anchor(document) or document.timestamp
-            if not anchor:
-                return None
-            hours = _elapsed_hours(anchor, now, use_business_hours=True)
-            return _format_elapsed_duration(hours, True)
-        elif entity_type == 'LeaveRequest':
-            leave = LeaveRequest.query.get(entity_id)
-            if not leave or not leave.created_timestamp:
-                return None
-            hours = _elapsed_hours(leave.created_timestamp, now, use_business_hours=False)
-            return _format_elapsed_duration(hours, False)
-        elif entity_type == 'EWPRecord':
-            record = EWPRecord.query.get(entity_id)
-            if not record or not record.created_timestamp:
-                return None
-            hours = _elapsed_hours(record.created_timestamp, now, use_business_hours=False)
-            return _format_elapsed_duration(hours, False)
+        if ids_by_type['Document']:
+            documents = Document.query.with_entities(
+                Document.id, Document.status, Document.timestamp
+            ).filter(Document.id.in_(ids_by_type['Document'])).all()
+            anchors['Document'] = _resolve_document_anchors(documents)
+        if ids_by_type['LeaveRequest']:
+            anchors['LeaveRequest'] = dict(
+                LeaveRequest.query.with_entities(LeaveRequest.id, LeaveRequest.created_timestamp)
+                .filter(LeaveRequest.id.in_(ids_by_type['LeaveRequest'])).all()
+            )
+        if ids_by_type['EWPRecord']:
+            anchors['EWPRecord'] = dict(
+                EWPRecord.query.with_entities(EWPRecord.id, EWPRecord.created_timestamp)
+                .filter(EWPRecord.id.in_(ids_by_type['EWPRecord'])).all()
+            )
     except Exception:
-        return None
+        return {}
 
-    return None
+    now = datetime.utcnow()
+    labels = {}
+    for info in key_infos:
+        if not info:
+            continue
+        anchor = anchors.get(info.get('entity_type'), {}).get(info.get('entity_id'))
+        if not anchor:
+            continue
+        # Documents follow business hours; leave and EWP use wall-clock time
+        use_business = info['entity_type'] == 'Document'
+        hours = _elapsed_hours(anchor, now, use_business_hours=use_business)
+        labels[info['raw']] = _format_elapsed_duration(hours, use_business)
+    return labels
 
 @main.route('/admin')
 @login_required
@@ -2211,34 +2195,30 @@ def admin_dashboard():
     user_page = request.args.get('user_page', 1, type=int)  
     search_query = request.args.get('search', '').strip()
     
-    # Documents pagination
-    documents_query = Document.query
-    if search_query:
-        documents_query = documents_query.filter(
+    # Documents pagination (hot and archived documents, newest first)
+    def _document_search(model):
+        if not search_query:
+            return []
+        return [
             or_(
-                Document.title.ilike(f'%{search_query}%'),
-                Document.office.ilike(f'%{search_query}%'),
-                Document.classification.ilike(f'%{search_query}%'),
-                Document.status.ilike(f'%{search_query}%'),
+                model.title.ilike(f'%{search_query}%'),
+                model.office.ilike(f'%{search_query}%'),
+                model.classification.ilike(f'%{search_query}%'),
+                model.status.ilike(f'%{search_query}%'),
                 or_(
-                    Document.barcode.ilike(f'%{search_query}%'),
-                    Document.barcode == search_query
+                    model.barcode.ilike(f'%{search_query}%'),
+                    model.barcode == search_query
                 )
             )
-        )
-    paginated_documents = documents_query.order_by(Document.timestamp.desc()).paginate(
-        page=doc_page, per_page=10, error_out=False
+        ]
+    paginated_documents = paginate_documents_with_archive(
+        _document_search, page=doc_page, per_page=10, error_out=False
     )
 
-    # Activities pagination
-    activities_query = ActivityLog.query\
-        .join(Document, ActivityLog.document_id == Document.id)\
-        .join(User, ActivityLog.user_id == User.id)\
-        .order_by(ActivityLog.timestamp.desc())
-    
-    paginated_activities = activities_query.paginate(
-        page=activity_page, 
-        per_page=10, 
+    # Activities pagination (hot and archived history)
+    paginated_activities = paginate_activities_with_archive(
+        page=activity_page,
+        per_page=10,
         error_out=False
     )
 
@@ -2249,46 +2229,46 @@ def admin_dashboard():
     )
 
     # Total documents by status
-    total_documents = Document.query.count()
+    # Archived documents are kept in the archive tables
+    total_archived = ArchivedDocument.query.count()
+    total_documents = Document.query.count() + total_archived
     total_pending = Document.query.filter_by(status='Pending').count()
     total_accepted = Document.query.filter_by(status='Accepted').count()
     total_declined = Document.query.filter_by(status='Declined').count()
     total_released = Document.query.filter_by(status='Released').count()
-    total_archived = Document.query.filter_by(status='Archived').count()
+
+    # Classification counts include archived documents
+    def _classification_count(classification):
+        return count_all_documents(lambda model: [model.classification == classification])
+
+    def _classification_prefix_count(prefix):
+        return count_all_documents(lambda model: [model.classification.like(f'{prefix}%')])
 
     # Add classification counts
-    total_communications = Document.query.filter_by(classification='Communications').count()
-    total_payroll = Document.query.filter_by(classification='Payroll').count()
-    total_request = Document.query.filter_by(classification='Request').count()
+    total_communications = _classification_count('Communications')
+    total_payroll = _classification_count('Payroll')
+    total_request = _classification_count('Request')
 
     # Classification distributions with sub-classifications
     communications_subtypes = {
-        'Travel Order': Document.query.filter(Document.classification.like('Communications - Travel Order%')).count(),
-        'Office Order': Document.query.filter(Document.classification.like('Communications - Office Order%')).count(),
-        'Travel Authority': Document.query.filter(Document.classification.like('Communications - Travel Authority%')).count(),
+        subtype: _classification_prefix_count(f'Communications - {subtype}')
+        for subtype in ('Travel Order', 'Office Order', 'Travel Authority')
     }
-    
+
     payroll_subtypes = {
-        'Salary': Document.query.filter(Document.classification.like('Payroll - Salary%')).count(),
-        'Voucher': Document.query.filter(Document.classification.like('Payroll - Voucher%')).count(),
-        'Trust fund': Document.query.filter(Document.classification.like('Payroll - Trust fund%')).count(),
-        'Terminal Pay': Document.query.filter(Document.classification.like('Payroll - Terminal Pay%')).count(),
-        'Overtime Pay': Document.query.filter(Document.classification.like('Payroll - Overtime Pay%')).count(),
-        'Subsistence Allowance': Document.query.filter(Document.classification.like('Payroll - Subsistence Allowance%')).count(),
-        'Travel Allowance': Document.query.filter(Document.classification.like('Payroll - Travel Allowance%')).count(),
-        'RATA': Document.query.filter(Document.classification.like('Payroll - RATA%')).count(),
-        'Mobile Allowance': Document.query.filter(Document.classification.like('Payroll - Mobile Allowance%')).count(),
+        subtype: _classification_prefix_count(f'Payroll - {subtype}')
+        for subtype in ('Salary', 'Voucher', 'Trust fund', 'Terminal Pay', 'Overtime Pay',
+                        'Subsistence Allowance', 'Travel Allowance', 'RATA', 'Mobile Allowance')
     }
-    
+
     request_subtypes = {
-        'Certificate of Employment': Document.query.filter(Document.classification.like('Request - Certificate of Employment%')).count(),
-        'Service Record': Document.query.filter(Document.classification.like('Request - Service Record%')).count(),
-        'Clearance': Document.query.filter(Document.classification.like('Request - Clearance%')).count(),
+        subtype: _classification_prefix_count(f'Request - {subtype}')
+        for subtype in ('Certificate of Employment', 'Service Record', 'Clearance')
     }
 
     # Totals used for Document Analytics grouped chart
     try:
-        others_count = Document.query.filter(Document.classification.like('Others%')).count()
+        others_count = _classification_prefix_count('Others')
     except Exception:
         others_count = 0
 
@@ -2451,22 +2431,15 @@ def admin_dashboard():
     } for doc in pending_documents]
 
 
-    from app.models import ProcessingLog
-    user_metrics = (
-        db.session.query(
-            User.username,
-            db.func.count(ProcessingLog.id).label('documents_handled'),
-            db.func.avg(
-                db.func.time_to_sec(
-                    db.func.timediff(ProcessingLog.forwarded_timestamp, ProcessingLog.accepted_timestamp)
-                )
-            ).label('avg_processing_time')  # Changed to use MySQL/MariaDB compatible functions
-        )
-        .join(ProcessingLog, ProcessingLog.user_id == User.id)
-        .filter(ProcessingLog.forwarded_timestamp != None)
-        .group_by(User.username)
-        .all()
-    )
+    # Handling times include processing history of archived documents
+    user_metrics = [
+        {
+            'username': entry.username,
+            'documents_handled': entry.count,
+            'avg_processing_time': entry.avg_sec,
+        }
+        for entry in sorted(processing_leaderboard().entries, key=lambda e: (e.username or '').lower())
+    ]
 
     # Leave performance by creator (created -> released)
     try:
@@ -2846,10 +2819,10 @@ def admin_sla_alerts():
             for key in SLAAlertPreference.DEFAULTS.keys()
         }
         try:
-            SLAAlertPreference.ensure_defaults()
             for category, enabled in preferences_payload.items():
                 SLAAlertPreference.set_enabled(category, enabled)
             db.session.commit()
+            invalidate_sla_snapshot()
             flash('SLA notification preferences updated.', 'success')
         except Exception as exc:
             db.session.rollback()
@@ -2878,7 +2851,7 @@ def admin_sla_alerts():
         error_out=False
     )
 
-    alerts = []
+    parsed_alerts = []
     for alert in pagination.items:
         raw_message = (alert.message or '').strip()
         dedupe_key = None
@@ -2886,13 +2859,20 @@ def admin_sla_alerts():
             raw_message, tail = raw_message.rsplit('[', 1)
             raw_message = raw_message.strip()
             dedupe_key = tail.strip(' ]')
+        key_info = _describe_sla_key(dedupe_key) if dedupe_key else None
+        parsed_alerts.append((alert, raw_message, dedupe_key, key_info))
+
+    duration_labels = _compute_duration_labels(
+        [key_info for _, _, _, key_info in parsed_alerts if key_info]
+    )
 
+    alerts = []
+    for alert, raw_message, dedupe_key, key_info in parsed_alerts:
         severity = 'escalate' if 'SLA Escalate' in raw_message else (
             'warn' if 'SLA Warn' in raw_message else 'info'
         )
 
-        key_info = _describe_sla_key(dedupe_key) if dedupe_key else None
-        duration_label = _compute_duration_label(key_info) if key_info else None
+        duration_label = duration_labels.get(key_info.get('raw')) if key_info else None
         friendly_message = None
         if key_info and duration_label:
             status_phrase = key_info['status_label'].lower()
@@ -2916,20 +2896,21 @@ def admin_sla_alerts():
 
     window_hours = 24
     window_start = datetime.utcnow() - timedelta(hours=window_hours)
-    summary_query = Notification.query.filter(
+    # One conditional aggregate instead of three separate scans
+    summary_row = db.session.query(
+        func.count(Notification.id),
+        func.sum(case((Notification.message.ilike('%SLA Escalate%'), 1), else_=0)),
+        func.sum(case((Notification.message.ilike('%SLA Warn%'), 1), else_=0)),
+    ).filter(
         Notification.message.ilike('SLA%'),
         Notification.timestamp >= window_start
-    )
-    summary_total = summary_query.count()
-    summary_escalations = summary_query.filter(
-        Notification.message.ilike('%SLA Escalate%')
-    ).count()
-    summary_warnings = summary_query.filter(
-        Notification.message.ilike('%SLA Warn%')
-    ).count()
+    ).one()
+    summary_total = summary_row[0] or 0
+    summary_escalations = int(summary_row[1] or 0)
+    summary_warnings = int(summary_row[2] or 0)
 
     try:
-        sla_preferences = SLAAlertPreference.get_preferences_map()
+        sla_preferences = dict(get_sla_snapshot().preferences)
     except Exception as exc:
         current_app.logger.warning('Unable to load SLA notification preferences: %s', exc)
         sla_preferences = SLAAlertPreference.DEFAULTS.copy()
@@ -3016,6 +2997,9 @@ def delete_user(user_id):
         
         # Check if user has any documents
         document_count = Document.query.filter((Document.creator_id == user.id) | (Document.recipient_id == user.id)).count()
+        document_count += ArchivedDocument.query.filter(
+            (ArchivedDocument.creator_id == user.id) | (ArchivedDocument.recipient_id == user.id)
+        ).count()
         if document_count > 0:
             print(f"Cannot delete user {user.username} - has {document_count} associated documents")
             return jsonify({
@@ -3043,6 +3027,9 @@ def delete_user(user_id):
                 print(f"Deleting {log_count} processing logs for user {user.username}")
                 ProcessingLog.query.filter_by(user_id=user.id).delete()
                 print(f"Successfully deleted {log_count} processing logs")
+            ArchivedProcessingLog.query.filter_by(user_id=user.id).delete()
+            # Bulk deletes bypass the flush hook; closed-period reports are recomputed
+            invalidate_report_snapshots()
         except Exception as log_error:
             db.session.rollback()
             print(f"Error deleting processing logs: {str(log_error)}")
@@ -3056,6 +3043,7 @@ def delete_user(user_id):
                 print(f"Deleting {activity_count} activity logs for user {user.username}")
                 ActivityLog.query.filter_by(user_id=user.id).delete()
                 print(f"Successfully deleted {activity_count} activity logs")
+            ArchivedActivityLog.query.filter_by(user_id=user.id).delete()
         except Exception as activity_error:
             db.session.rollback()
             print(f"Error deleting activity logs: {str(activity_error)}")
@@ -3150,54 +3138,40 @@ def user_metrics_details(user_id):
     if not current_user.is_admin:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     try:
-        from app.models import ProcessingLog, User, format_timedelta, Document
+        from app.models import User, format_timedelta, Document
         user = User.query.get_or_404(user_id)
 
         today = datetime.utcnow().date()
         first_day_of_month = today.replace(day=1)
 
+        # Processing averages come from the shared leaderboards (hot + archived logs)
+        month_start = datetime(first_day_of_month.year, first_day_of_month.month, 1)
+        overall_board = processing_leaderboard()
+        monthly_board = processing_leaderboard(month_start)
+        overall_entry = overall_board.entry_for(user_id)
+        monthly_entry = monthly_board.entry_for(user_id)
+
         # Count of documents processed this month (forwarded completed)
-        documents_processed_this_month = db.session.query(
-            db.func.count(ProcessingLog.id)
-        ).filter(
-            ProcessingLog.user_id == user_id,
-            ProcessingLog.forwarded_timestamp != None,
-            db.func.date(ProcessingLog.forwarded_timestamp) >= first_day_of_month
-        ).scalar() or 0
-
-        # Overall average processing time in seconds for this user
-        avg_processing_time_seconds = db.session.query(
-            db.func.avg(
-                db.func.time_to_sec(
-                    db.func.timediff(ProcessingLog.forwarded_timestamp, ProcessingLog.accepted_timestamp)
-                )
-            )
-        ).filter(
-            ProcessingLog.user_id == user_id,
-            ProcessingLog.forwarded_timestamp != None
-        ).scalar()
-
-        # Monthly average processing time in seconds for this user
-        monthly_avg_processing_time_seconds = db.session.query(
-            db.func.avg(
-                db.func.time_to_sec(
-                    db.func.timediff(ProcessingLog.forwarded_timestamp, ProcessingLog.accepted_timestamp)
-                )
-            )
-        ).filter(
-            ProcessingLog.user_id == user_id,
-            ProcessingLog.forwarded_timestamp != None,
-            db.func.date(ProcessingLog.forwarded_timestamp) >= first_day_of_month
-        ).scalar()
+        documents_processed_this_month = monthly_entry.count if monthly_entry else 0
+        avg_processing_time_seconds = overall_entry.avg_sec if overall_entry else None
+        monthly_avg_processing_time_seconds = monthly_entry.avg_sec if monthly_entry else None
+
+        additional_metrics = []
+        for label, board in (('Overall', overall_board), ('This month', monthly_board)):
+            rank = board.rank_of(user_id)
+            if rank is None:
+                continue
+            additional_metrics.append({'title': f'{label} rank', 'value': f'{rank} of {len(board.entries)}'})
+            additional_metrics.append({'title': f'{label}: faster than', 'value': f'{board.faster_than_pct(user_id)}% of users'})
 
         # New: Count of documents created overall by the user
-        documents_created_overall = Document.query.filter_by(creator_id=user_id).count()
+        documents_created_overall = count_all_documents(lambda model: [model.creator_id == user_id])
 
         # New: Count of documents created by the user this month
-        documents_created_this_month = Document.query.filter(
-            Document.creator_id == user_id,
-            db.func.date(Document.timestamp) >= first_day_of_month
-        ).count()
+        documents_created_this_month = count_all_documents(lambda model: [
+            model.creator_id == user_id,
+            db.func.date(model.timestamp) >= first_day_of_month
+        ])
 
         avg_sec = int(avg_processing_time_seconds) if avg_processing_time_seconds else 0
         monthly_avg_sec = int(monthly_avg_processing_time_seconds) if monthly_avg_processing_time_seconds else 0
@@ -3211,7 +3185,8 @@ def user_metrics_details(user_id):
             'average_processing_time_seconds': avg_sec,
             'average_processing_time_formatted': format_timedelta(avg_sec),
             'monthly_average_processing_time_seconds': monthly_avg_sec,
-            'monthly_average_processing_time_formatted': format_timedelta(monthly_avg_sec)
+            'monthly_average_processing_time_formatted': format_timedelta(monthly_avg_sec),
+            'additional_metrics': additional_metrics
         })
     except Exception as e:
         db.session.rollback()
@@ -3244,26 +3219,28 @@ def profile_activity_data():
             else:
                 month_end = datetime(now.year, now.month + 1, 1)
 
-        # Documents Created by current user (per day)
-        doc_created_rows = db.session.query(
-            func.date(Document.timestamp).label('day'),
-            db.func.count(Document.id)
-        ).filter(
-            Document.creator_id == current_user.id,
-            Document.timestamp >= month_start,
-            Document.timestamp < month_end
-        ).group_by(func.date(Document.timestamp)).all()
-
-        # Documents Released handled by current user (per day)
-        doc_released_rows = db.session.query(
-            func.date(Document.released_timestamp).label('day'),
-            db.func.count(Document.id)
-        ).filter(
-            Document.recipient_id == current_user.id,
-            Document.released_timestamp != None,
-            Document.released_timestamp >= month_start,
-            Document.released_timestamp < month_end
-        ).group_by(func.date(Document.released_timestamp)).all()
+        # Documents Created / Released by current user (per day), hot and archived
+        doc_created_rows = []
+        doc_released_rows = []
+        for model in (Document, ArchivedDocument):
+            doc_created_rows += db.session.query(
+                func.date(model.timestamp).label('day'),
+                db.func.count(model.id)
+            ).filter(
+                model.creator_id == current_user.id,
+                model.timestamp >= month_start,
+                model.timestamp < month_end
+            ).group_by(func.date(model.timestamp)).all()
+
+            doc_released_rows += db.session.query(
+                func.date(model.released_timestamp).label('day'),
+                db.func.count(model.id)
+            ).filter(
+                model.recipient_id == current_user.id,
+                model.released_timestamp != None,
+                model.released_timestamp >= month_start,
+                model.released_timestamp < month_end
+            ).group_by(func.date(model.released_timestamp)).all()
 
         # Leave Created by current user
         leave_created_rows = db.session.query(
@@ -3292,8 +3269,12 @@ def profile_activity_data():
             except Exception:
                 return str(d)
 
-        doc_created_map = {_norm_day(d): int(c) for d, c in doc_created_rows}
-        doc_released_map = {_norm_day(d): int(c) for d, c in doc_released_rows}
+        doc_created_map = {}
+        for d, c in doc_created_rows:
+            doc_created_map[_norm_day(d)] = doc_created_map.get(_norm_day(d), 0) + int(c)
+        doc_released_map = {}
+        for d, c in doc_released_rows:
+            doc_released_map[_norm_day(d)] = doc_released_map.get(_norm_day(d), 0) + int(c)
         leave_created_map = {_norm_day(d): int(c) for d, c in leave_created_rows}
         leave_released_map = {_norm_day(d): int(c) for d, c in leave_released_rows}
 
@@ -3400,7 +3381,7 @@ def check_username():
         if len(username) < 3:
             return jsonify({'valid': False, 'message': 'Username must be at least 3 characters long'})
         
-        user = User.query.filter_by(username=username).first()
+        user = get_user_directory().find_username(username)
         
         if user:
             return jsonify({'valid': False, 'message': 'This username is already taken'})
@@ -3427,7 +3408,7 @@ def check_email():
             return jsonify({'valid': False, 'message': 'Invalid email format'})
         
         # Check if email exists in database
-        existing_user = User.query.filter_by(email=email).first()
+        existing_user = get_user_directory().find_email(email)
         
         if existing_user:
             return jsonify({'valid': False, 'message': 'Email is already registered'})
@@ -3445,7 +3426,7 @@ def check_account_status():
     if not username:
         return jsonify({'exists': False})
     
-    user = User.query.filter_by(username=username).first()
+    user = get_user_directory().find_username(username)
     if not user:
         return jsonify({'exists': False})
     
@@ -3521,10 +3502,13 @@ def get_document_activities(document_id):
         if not current_user.is_admin:
             return jsonify({'error': 'Unauthorized access'}), 403
             
-        document = Document.query.get_or_404(document_id)
+        log_model = ActivityLog
+        if not db.session.get(Document, document_id):
+            ArchivedDocument.query.get_or_404(document_id)
+            log_model = ArchivedActivityLog
         
         # Get activities with error handling for to_dict()
-        activities = ActivityLog.query.filter_by(document_id=document_id).order_by(ActivityLog.timestamp.desc()).all()
+        activities = log_model.query.filter_by(document_id=document_id).order_by(log_model.timestamp.desc()).all()
         activity_dicts = []
         
         for activity in activities:
@@ -3572,8 +3556,8 @@ def check_barcode():
             'suggestions': []
         })
     
-    # Check if barcode exists
-    existing_document = Document.query.filter_by(barcode=barcode).first()
+    # Check if barcode exists (archived documents keep theirs)
+    existing_document = find_document_by_barcode(barcode)
     
     if not existing_document:
         return jsonify({
@@ -3589,7 +3573,7 @@ def check_barcode():
     suffixes = ["-A", "-B", "-C", "A", "B", "C", "_1", "_2", "_3"]
     for suffix in suffixes:
         suggestion = barcode + suffix
-        if not Document.query.filter_by(barcode=suggestion).first():
+        if not find_document_by_barcode(suggestion):
             suggestions.append(suggestion)
             # Limit to 5 suggestions
             if len(suggestions) >= 5:
@@ -3668,9 +3652,10 @@ def print_text_report():
     Admin-only, print-ready detailed text report.
     Query params:
       - month, year: integers; defaults to current month/year
-      - include_details: 1|0 (default 1). When 1, include up to 200 documents list for the month.
+      - include_details: 1|0 (default 1). When 1, include the documents list for the period
+        (capped at 200 rows on the HTML page; txt/csv stream the full list).
       - autoprint: 1|0 (default 1). When 1, HTML page triggers window.print() on load.
-      - format: html|txt (default html). 'txt' returns text/plain content.
+      - format: html|txt|csv (default html). 'txt'/'csv' stream text/plain or text/csv content.
     """
     # Security
     if not current_user.is_admin:
@@ -3683,574 +3668,37 @@ def print_text_report():
     autoprint = request.args.get('autoprint', default=1, type=int)
     fmt = (request.args.get('format', default='html') or 'html').lower()
 
-    # Date range support (preferred); fallback to month/year
-    date_from_str = (request.args.get('date_from') or '').strip()
-    date_to_str = (request.args.get('date_to') or '').strip()
-
-    # Normalize partial inputs: if only one is provided, use it for both
-    if date_from_str and not date_to_str:
-        date_to_str = date_from_str
-    if date_to_str and not date_from_str:
-        date_from_str = date_to_str
-
-    start_dt = None
-    end_dt = None
-
-    def _parse_date(s: str):
-        try:
-            return datetime.strptime(s, '%Y-%m-%d')
-        except Exception:
-            return None
-
-    if date_from_str and date_to_str:
-        df = _parse_date(date_from_str)
-        dt = _parse_date(date_to_str)
-        if df and dt:
-            # Bounds are [start, end)
-            start_dt = datetime(df.year, df.month, df.day)
-            # end is next day midnight of date_to to make [start,end)
-            end_dt = datetime(dt.year, dt.month, dt.day) + timedelta(days=1)
-        else:
-            # Invalid date strings; clear and fallback to month/year
-            date_from_str = ''
-            date_to_str = ''
-
-    if start_dt is None or end_dt is None:
-        # Fallback to month/year if date range not provided/invalid
-        month = request.args.get('month', type=int) or now.month
-        year = request.args.get('year', type=int) or now.year
-        try:
-            start_dt = datetime(year, month, 1)
-        except Exception:
-            start_dt = datetime(now.year, now.month, 1)
-            year = start_dt.year
-            month = start_dt.month
-        if month == 12:
-            end_dt = datetime(year + 1, 1, 1)
-        else:
-            end_dt = datetime(year, month + 1, 1)
-        # Populate defaults for date inputs from computed month bounds
-        date_from_str = start_dt.date().isoformat()
-        date_to_str = (end_dt - timedelta(days=1)).date().isoformat()
-
-    # Data computations
-    # 1) Documents created in selected month
-    documents_month_q = Document.query.filter(
-        Document.timestamp >= start_dt,
-        Document.timestamp < end_dt
-    )
-    documents_created_this_month = documents_month_q.count()
-
-    # 2) Per-classification counts for selected month
-    def count_class(prefix: str) -> int:
-        return Document.query.filter(
-            Document.classification.like(f'{prefix}%'),
-            Document.timestamp >= start_dt,
-            Document.timestamp < end_dt
-        ).count()
-
-    # Include Leave requests created within the selected period
-    try:
-        leave_created_in_period = LeaveRequest.query.filter(
-            LeaveRequest.created_timestamp >= start_dt,
-            LeaveRequest.created_timestamp < end_dt
-        ).count()
-    except Exception:
-        leave_created_in_period = 0
-
-    per_classification_counts = {
-        'Communications': count_class('Communications'),
-        'Payroll': count_class('Payroll'),
-        'Request': count_class('Request'),
-        'Others': count_class('Others'),
-        'Leave': int(leave_created_in_period or 0)
-    }
-
-    # New: Processing time by classification (released within period, business hours)
-    classification_buckets = {
-        'Communications': {'count': 0, 'total_sec': 0},
-        'Payroll': {'count': 0, 'total_sec': 0},
-        'Request': {'count': 0, 'total_sec': 0},
-        'Others': {'count': 0, 'total_sec': 0},
-        'Leave': {'count': 0, 'total_sec': 0}
-    }
-    # Track per sub-classification aggregates under each main classification
-    classification_sub_buckets = {
-        'Communications': {},
-        'Payroll': {},
-        'Request': {},
-        'Others': {},
-        'Leave': {}
-    }
-    docs_rel = (
-        Document.query
-        .with_entities(Document.classification, Document.timestamp, Document.released_timestamp)
-        .filter(
-            Document.released_timestamp != None,
-            Document.released_timestamp >= start_dt,
-            Document.released_timestamp < end_dt
-        ).all()
-    )
-    for cls, created_at, released_at in docs_rel:
-        if not created_at or not released_at:
-            continue
-        main = 'Others'
-        try:
-            if isinstance(cls, str):
-                if cls.startswith('Communications'):
-                    main = 'Communications'
-                elif cls.startswith('Payroll'):
-                    main = 'Payroll'
-                elif cls.startswith('Request'):
-                    main = 'Request'
-        except Exception:
-            main = 'Others'
-        try:
-            delta_td = calculate_business_hours(created_at, released_at)
-        except Exception:
-            delta_td = (released_at - created_at)
-        try:
-            sec = int(delta_td.total_seconds()) if delta_td else 0
-        except Exception:
-            sec = 0
-        if sec < 0:
-            sec = 0
-        classification_buckets[main]['count'] += 1
-        classification_buckets[main]['total_sec'] += sec
-        # Determine sub-classification label
-        sub_name = cls
-        try:
-            if isinstance(cls, str):
-                prefix = main + ' - '
-                if cls.startswith(prefix):
-                    sub_name = cls[len(prefix):].strip() or 'General'
-                elif cls == main:
-                    sub_name = 'General'
-                else:
-                    sub_name = cls
-        except Exception:
-            sub_name = 'General'
-        subs = classification_sub_buckets.get(main, {})
-        entry = subs.get(sub_name)
-        if not entry:
-            entry = {'count': 0, 'total_sec': 0}
-            subs[sub_name] = entry
-            classification_sub_buckets[main] = subs
-        entry['count'] += 1
-        entry['total_sec'] += sec
-
-    # Include LeaveRequest processing (released within period)
-    try:
-        leaves_rel = (
-            LeaveRequest.query
-            .with_entities(LeaveRequest.leave_type, LeaveRequest.created_timestamp, LeaveRequest.released_timestamp)
-            .filter(
-                LeaveRequest.released_timestamp != None,
-                LeaveRequest.released_timestamp >= start_dt,
-                LeaveRequest.released_timestamp < end_dt
-            ).all()
-        )
-    except Exception:
-        leaves_rel = []
-
-    for leave_type, created_ts, released_ts in leaves_rel:
-        if not created_ts or not released_ts:
-            continue
-        main = 'Leave'
-        try:
-            delta_td = calculate_business_hours(created_ts, released_ts)
-        except Exception:
-            delta_td = (released_ts - created_ts)
-        try:
-            sec = int(delta_td.total_seconds()) if delta_td else 0
-        except Exception:
-            sec = 0
-        if sec < 0:
-            sec = 0
-        # Update main bucket
-        bucket = classification_buckets.get(main)
-        if not bucket:
-            classification_buckets[main] = {'count': 0, 'total_sec': 0}
-            bucket = classification_buckets[main]
-        bucket['count'] += 1
-        bucket['total_sec'] += sec
-
-        # Subtype by leave_type
-        sub_name = leave_type or 'General'
-        subs = classification_sub_buckets.get(main) or {}
-        entry = subs.get(sub_name)
-        if not entry:
-            entry = {'count': 0, 'total_sec': 0}
-            subs[sub_name] = entry
-            classification_sub_buckets[main] = subs
-        entry['count'] += 1
-        entry['total_sec'] += sec
-
-    classification_processing = []
-    for key in ['Communications', 'Payroll', 'Request', 'Others', 'Leave']:
-        c = classification_buckets[key]['count']
-        tot = classification_buckets[key]['total_sec']
-        avg_sec = int(tot / c) if c > 0 else 0
-        if c > 0:
-            try:
-                avg_formatted = format_timedelta(timedelta(seconds=avg_sec))
-            except Exception:
-                avg_formatted = str(timedelta(seconds=avg_sec))
-        else:
-            avg_formatted = "No document processed yet"
-        classification_processing.append({
-            'classification': key,
-            'count': c,
-            'avg_sec': avg_sec,
-            'avg_formatted': avg_formatted
-        })
-
-    # Build output structure for template/TXT
-    classification_sub_processing = []
-    for key in ['Communications', 'Payroll', 'Request', 'Others', 'Leave']:
-        submap = classification_sub_buckets.get(key, {})
-        rows = []
-        if submap:
-            for sub_name in sorted(submap.keys()):
-                sc = submap[sub_name]['count']
-                tot_sec = submap[sub_name]['total_sec']
-                avg_sec = int(tot_sec / sc) if sc > 0 else 0
-                avg_formatted = format_timedelta(timedelta(seconds=avg_sec)) if sc > 0 else "No document processed yet"
-                rows.append({
-                    'sub': sub_name,
-                    'count': sc,
-                    'avg_sec': avg_sec,
-                    'avg_formatted': avg_formatted
-                })
-        else:
-            # No documents released for this main classification
-            rows.append({
-                'sub': '—',
-                'count': 0,
-                'avg_sec': 0,
-                'avg_formatted': "No document processed yet"
-            })
-        classification_sub_processing.append({
-            'classification': key,
-            'rows': rows
-        })
-
-    # 3) Rankings (monthly and overall)
-    from app.models import ProcessingLog
-
-    # Helper to get ranking (best and worst) given a base query
-    def get_rankings(base_filters):
-        avg_expr = db.func.avg(
-            db.func.time_to_sec(
-                db.func.timediff(ProcessingLog.forwarded_timestamp, ProcessingLog.accepted_timestamp)
-            )
-        ).label('avg_sec')
-
-        q = (
-            db.session.query(
-                User.username.label('username'),
-                avg_expr,
-                db.func.count(ProcessingLog.id).label('count')
-            )
-            .join(User, User.id == ProcessingLog.user_id)
-            .filter(ProcessingLog.forwarded_timestamp != None)
-        )
-
-        if base_filters:
-            q = q.filter(*base_filters)
-
-        q = q.group_by(User.username).having(db.func.count(ProcessingLog.id) > 0)
-
-        best = q.order_by(db.asc(db.text('avg_sec'))).first()
-        worst = q.order_by(db.desc(db.text('avg_sec'))).first()
-
-        def norm(row):
-            if not row or row.avg_sec is None:
-                return None
-            try:
-                sec = int(row.avg_sec) if row.avg_sec is not None else 0
-            except Exception:
-                sec = 0
-            return {
-                'username': row.username,
-                'avg_sec': sec,
-                'avg_formatted': format_timedelta(timedelta(seconds=sec)),
-                'count': int(row.count) if getattr(row, 'count', None) is not None else 0
-            }
-
-        return norm(best), norm(worst)
+    start_dt, end_dt, date_from_str, date_to_str = resolve_report_period(request.args, now)
 
-    # Monthly rankings (based on forwarded in selected month)
-    monthly_best, monthly_worst = get_rankings([
-        ProcessingLog.forwarded_timestamp >= start_dt,
-        ProcessingLog.forwarded_timestamp < end_dt
-    ])
-
-    # Overall rankings (no date filter)
-    overall_best, overall_worst = get_rankings([])
-
-    # User Performance (This Month)
-    user_performance = []
-    leave_user_metrics_period = []
-    try:
-        # Collect handled per user from ProcessingLog within month and compute avg in Python
-        plogs = (
-            ProcessingLog.query
-            .filter(
-                ProcessingLog.forwarded_timestamp != None,
-                ProcessingLog.accepted_timestamp != None,
-                ProcessingLog.forwarded_timestamp >= start_dt,
-                ProcessingLog.forwarded_timestamp < end_dt
-            ).all()
-        )
-        handled_map = {}
-        for pl in plogs:
-            uid = pl.user_id
-            if not uid:
-                continue
-            delta = 0
-            try:
-                if pl.forwarded_timestamp and pl.accepted_timestamp:
-                    delta = int((pl.forwarded_timestamp - pl.accepted_timestamp).total_seconds())
-            except Exception:
-                delta = 0
-            if delta < 0:
-                delta = 0
-            entry = handled_map.setdefault(uid, {'handled': 0, 'total_sec': 0})
-            entry['handled'] += 1
-            entry['total_sec'] += delta
-
-        # Collect created per user from Document within month
-        creators = Document.query.with_entities(Document.creator_id).filter(
-            Document.timestamp >= start_dt,
-            Document.timestamp < end_dt
-        ).all()
-        created_map = {}
-        for (cid,) in creators:
-            if cid:
-                created_map[cid] = created_map.get(cid, 0) + 1
-
-        # Merge and build list
-        all_uids = set(created_map.keys()) | set(handled_map.keys())
-        if all_uids:
-            users_rows = db.session.query(User.id, User.username).filter(User.id.in_(all_uids)).all()
-            usernames = {uid: uname for uid, uname in users_rows}
-            for uid in all_uids:
-                created = int(created_map.get(uid, 0))
-                handled_data = handled_map.get(uid, {'handled': 0, 'total_sec': 0})
-                handled = int(handled_data['handled'])
-                if created > 0 or handled > 0:
-                    avg_sec = int(handled_data['total_sec'] / handled) if handled > 0 else 0
-                    user_performance.append({
-                        'username': usernames.get(uid, f'User {uid}'),
-                        'documents_created': created,
-                        'documents_handled': handled,
-                        'avg_sec': avg_sec,
-                        'avg_formatted': format_timedelta(timedelta(seconds=avg_sec))
-                    })
-            user_performance.sort(key=lambda x: x['username'].lower() if isinstance(x['username'], str) else str(x['username']).lower())
-
-        # Leave user performance for selected period (created -> released)
-        try:
-            leave_rows = (
-                LeaveRequest.query
-                .with_entities(
-                    LeaveRequest.created_by_user_id,
-                    LeaveRequest.created_timestamp,
-                    LeaveRequest.released_timestamp
-                )
-                .filter(
-                    LeaveRequest.created_by_user_id != None,
-                    LeaveRequest.released_timestamp != None,
-                    LeaveRequest.released_timestamp >= start_dt,
-                    LeaveRequest.released_timestamp < end_dt
-                ).all()
-            )
-        except Exception:
-            leave_rows = []
+    report = build_report_summary(start_dt, end_dt)
 
-        agg = {}
-        for uid, cts, rts in leave_rows:
-            if not uid or not cts or not rts:
-                continue
-            try:
-                delta_td = calculate_business_hours(cts, rts)
-            except Exception:
-                delta_td = (rts - cts)
-            try:
-                sec = int(delta_td.total_seconds()) if delta_td else 0
-            except Exception:
-                sec = 0
-            if sec < 0:
-                sec = 0
-            e = agg.setdefault(uid, {'count': 0, 'total_sec': 0})
-            e['count'] += 1
-            e['total_sec'] += sec
-
-        if agg:
-            users_rows2 = db.session.query(User.id, User.username).filter(User.id.in_(list(agg.keys()))).all()
-            uname_map = {uid: uname for uid, uname in users_rows2}
-            for uid, data in agg.items():
-                cnt = int(data['count'])
-                avg_sec = int(data['total_sec'] / cnt) if cnt > 0 else 0
-                leave_user_metrics_period.append({
-                    'username': uname_map.get(uid, f'User {uid}'),
-                    'leaves_released': cnt,
-                    'avg_sec': avg_sec,
-                    'avg_formatted': format_timedelta(timedelta(seconds=avg_sec))
-                })
-            leave_user_metrics_period.sort(key=lambda x: x['username'].lower() if isinstance(x['username'], str) else str(x['username']).lower())
-        else:
-            leave_user_metrics_period = []
-    except Exception as _e:
-        user_performance = []
-        leave_user_metrics_period = []
+    # txt/csv stream the summary first, then every document in the period
+    if fmt in ('txt', 'csv'):
+        period_label = report_period_label(start_dt, end_dt, date_from_str, date_to_str)
+        documents = iter_report_documents(start_dt, end_dt) if include_details else None
+        if fmt == 'csv':
+            body = iter_report_csv(report, period_label, documents)
+            resp = Response(stream_with_context(body), mimetype='text/csv')
+            resp.headers['Content-Disposition'] = f'attachment; filename=system_report_{start_dt:%Y%m%d}.csv'
+            return resp
+        body = iter_report_text(report, period_label, documents)
+        return Response(stream_with_context(body), mimetype='text/plain; charset=utf-8')
 
-    # 4) Document list (optional, capped)
+    # 4) Document list (optional, capped for the printable HTML page)
     documents_list = []
     truncated = False
     cap = 200
     if include_details:
-        docs_q = (
-            documents_month_q
-            .options(joinedload(Document.creator), joinedload(Document.recipient))
-            .order_by(Document.timestamp.desc())
-        )
-        total = docs_q.count()
-        if total > cap:
+        # Closed explicitly: the capped read leaves the yield_per cursor mid-result
+        with closing(iter_report_documents(start_dt, end_dt, chunk_size=cap + 1)) as documents:
+            documents_list = list(islice(documents, cap + 1))
+        if len(documents_list) > cap:
             truncated = True
-        docs = docs_q.limit(cap).all()
-        for d in docs:
-            documents_list.append({
-                'title': d.title,
-                'office': d.office,
-                'classification': d.classification,
-                'creator': d.creator.username if d.creator else 'Unknown',
-                'created_at': to_local_time(d.timestamp) if d.timestamp else None,
-                'status': d.status,
-                'barcode': d.barcode or ''
-            })
-
-    # Plain text format
-    if fmt == 'txt':
-        # Build a plain text representation
-        lines = []
-        # Build a human-friendly period label (MMMM DD, YYYY)
-        try:
-            start_fmt_txt = to_local_time(start_dt).strftime('%B %d, %Y') if start_dt else ''
-        except Exception:
-            start_fmt_txt = start_dt.strftime('%B %d, %Y') if start_dt else ''
-        try:
-            end_inclusive_txt = (end_dt - timedelta(days=1)) if end_dt else None
-            end_fmt_txt = to_local_time(end_inclusive_txt).strftime('%B %d, %Y') if end_inclusive_txt else ''
-        except Exception:
-            end_fmt_txt = end_inclusive_txt.strftime('%B %d, %Y') if end_inclusive_txt else ''
-        if date_from_str and date_to_str:
-            if date_from_str == date_to_str:
-                period_label = start_fmt_txt
-            else:
-                period_label = f'{start_fmt_txt} to {end_fmt_txt}'
-        else:
-            period_label = to_local_time(start_dt).strftime('%B %Y') if start_dt else 'Selected Period'
-
-        generated_ts = to_local_time(datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
-        lines.append(f'System Activity Report — {period_label}')
-        lines.append(f'Generated: {generated_ts}')
-        lines.append('')
-        lines.append('Summary')
-        lines.append('-------')
-        lines.append(f'Documents created in period: {documents_created_this_month}')
-        lines.append('Per-Classification counts (selected period):')
-        for k, v in per_classification_counts.items():
-            lines.append(f'  - {k}: {v}')
-        lines.append('')
-        lines.append(f'Processing Time by Classification and Sub-types ({period_label})')
-        lines.append('------------------------------------------------------')
-        for grp in classification_sub_processing:
-            lines.append(f'  {grp["classification"]}:')
-            for row in grp["rows"]:
-                lines.append(f'    - {row["sub"]}: count {row["count"]}, avg {row["avg_formatted"]}')
-        lines.append('')
-        lines.append('Rankings (Selected Period)')
-        lines.append('--------------------------')
-        if monthly_best:
-            lines.append(f'  Top performer: {monthly_best["username"]} — {monthly_best["avg_formatted"]} (avg, {monthly_best["count"]} handled)')
-        else:
-            lines.append('  Top performer: N/A')
-        if monthly_worst:
-            lines.append(f'  Longest processing: {monthly_worst["username"]} — {monthly_worst["avg_formatted"]} (avg, {monthly_worst["count"]} handled)')
-        else:
-            lines.append('  Longest processing: N/A')
-        lines.append('')
-        lines.append('Rankings (Overall)')
-        lines.append('------------------')
-        if overall_best:
-            lines.append(f'  Top performer: {overall_best["username"]} — {overall_best["avg_formatted"]} (avg, {overall_best["count"]} handled)')
-        else:
-            lines.append('  Top performer: N/A')
-        if overall_worst:
-            lines.append(f'  Longest processing: {overall_worst["username"]} — {overall_worst["avg_formatted"]} (avg, {overall_worst["count"]} handled)')
-        else:
-            lines.append('  Longest processing: N/A')
-        lines.append('')
-        lines.append('User Performance (Selected Period)')
-        lines.append('----------------------------------')
-        if user_performance:
-            for u in user_performance:
-                lines.append(f'  - {u["username"]}: created {u["documents_created"]}, handled {u["documents_handled"]}, avg {u["avg_formatted"]}')
-        else:
-            lines.append('  No user activity found.')
-        lines.append('')
-        lines.append('Leave User Performance (Selected Period)')
-        lines.append('---------------------------------------')
-        if leave_user_metrics_period:
-            for row in leave_user_metrics_period:
-                lines.append(f'  - {row["username"]}: released {row["leaves_released"]}, avg {row["avg_formatted"]}')
-        else:
-            lines.append('  No leave processing data found.')
-        lines.append('')
-        if include_details:
-            lines.append('Documents Created This Month')
-            lines.append('----------------------------')
-            if not documents_list:
-                lines.append('  No documents found.')
-            else:
-                for d in documents_list:
-                    created_str = d['created_at'].strftime('%Y-%m-%d %H:%M') if d['created_at'] else 'N/A'
-                    lines.append(f'  • {d["title"]} | {d["office"]} | {d["classification"]} | by {d["creator"]} | {created_str} | {d["status"]} | {d["barcode"]}')
-                if truncated:
-                    lines.append('')
-                    lines.append(f'  Note: List truncated to {cap} items. Use include_details=1 and filter by month/year or export via database for full list.')
-        text = '\n'.join(lines)
-        resp = make_response(text, 200)
-        resp.mimetype = 'text/plain; charset=utf-8'
-        return resp
+            documents_list = documents_list[:cap]
 
     # HTML format (render template)
-    # Build human-friendly formatted dates and period label
-    from_fmt = ''
-    to_fmt = ''
-    if start_dt:
-        try:
-            from_fmt = to_local_time(start_dt).strftime('%B %d, %Y')
-        except Exception:
-            from_fmt = start_dt.strftime('%B %d, %Y')
-    if end_dt:
-        try:
-            end_inclusive = end_dt - timedelta(days=1)
-            to_fmt = to_local_time(end_inclusive).strftime('%B %d, %Y')
-        except Exception:
-            to_fmt = (end_dt - timedelta(days=1)).strftime('%B %d, %Y')
-    else:
-        to_fmt = from_fmt
-
-    if date_from_str and date_to_str:
-        if date_from_str == date_to_str:
-            period_label = from_fmt
-        else:
-            period_label = f'{from_fmt} to {to_fmt}'
-    else:
-        period_label = to_local_time(start_dt).strftime('%B %Y') if start_dt else 'Selected Period'
+    from_fmt, to_fmt = report_period_dates(start_dt, end_dt)
+    period_label = report_period_label(start_dt, end_dt, date_from_str, date_to_str)
 
     return render_template(
         'report_text.html',
@@ -4262,23 +3710,155 @@ def print_text_report():
         period_label=period_label,
         autoprint=bool(autoprint),
         include_details=bool(include_details),
-        documents_created_this_month=documents_created_this_month,
-        per_classification_counts=per_classification_counts,
-        monthly_best=monthly_best,
-        monthly_worst=monthly_worst,
-        overall_best=overall_best,
-        overall_worst=overall_worst,
         documents_list=documents_list,
         truncated=truncated,
         cap=cap,
         generated_at=to_local_time(datetime.utcnow()),
-        user_performance=user_performance,
-        leave_user_metrics_period=leave_user_metrics_period,
-        classification_processing=classification_processing,
-        classification_sub_processing=classification_sub_processing
+        **report
+    )
+
+@main.route('/admin/print_text_report/rebuild', methods=['POST'])
+@login_required
+def rebuild_text_report():
+    """Admin-only: discard and recompute the stored snapshot of a closed report period."""
+    if not current_user.is_admin:
+        flash('You are not authorized to access the admin report.', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    start_dt, end_dt, date_from_str, date_to_str = resolve_report_period(request.form)
+    try:
+        rebuild_report_snapshot(start_dt, end_dt)
+        flash('Report snapshot rebuilt.', 'success')
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error rebuilding report snapshot: {str(e)}")
+        flash(f'Error rebuilding report snapshot: {str(e)}', 'danger')
+    return redirect(url_for(
+        'main.print_text_report',
+        date_from=date_from_str,
+        date_to=date_to_str,
+        include_details=request.form.get('include_details', 1, type=int),
+        autoprint=0
+    ))
+
+def _report_job_payload(job):
+    data = job.to_dict()
+    data['status_url'] = url_for('main.report_job_status', job_id=job.id)
+    data['download_url'] = url_for('main.download_report_job', job_id=job.id) if job.status == 'Completed' else None
+    return data
+
+@main.route('/admin/report_jobs', methods=['POST'])
+@login_required
+def create_report_job():
+    """Admin-only: queue a system report to be rendered in the background."""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized. Only administrators can generate reports.'}), 403
+
+    params = {
+        key: request.form.get(key)
+        for key in ('date_from', 'date_to', 'month', 'year', 'include_details')
+        if request.form.get(key)
+    }
+    try:
+        job = submit_report_job(current_user.id, request.form.get('format', 'pdf'), params)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error queueing report job: {str(e)}")
+        return jsonify({'success': False, 'error': 'Could not queue the report.'}), 500
+    return jsonify({'success': True, 'job': _report_job_payload(job)}), 202
+
+@main.route('/admin/report_jobs/<int:job_id>')
+@login_required
+def report_job_status(job_id):
+    """Admin-only: progress of a background report job."""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized.'}), 403
+    job = db.session.get(ReportJob, job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Report job not found.'}), 404
+    return jsonify({'success': True, 'job': _report_job_payload(job)})
+
+@main.route('/admin/report_jobs/<int:job_id>/download')
+@login_required
+def download_report_job(job_id):
+    """Admin-only: download the finished artifact of a report job."""
+    if not current_user.is_admin:
+        flash('You are not authorized to access the admin report.', 'danger')
+        return redirect(url_for('main.dashboard'))
+    job = db.session.get(ReportJob, job_id)
+    if not job or job.status != 'Completed' or not job.artifact_path:
+        abort(404)
+    return send_from_directory(report_artifact_dir(), job.artifact_path, as_attachment=True)
+
+@main.route('/admin/export/documents')
+@login_required
+def export_documents():
+    """
+    Admin-only audit export: documents with their activity/processing history
+    and notifications, streamed as CSV or JSON Lines.
+    Query params: date_from, date_to (YYYY-MM-DD, optional), classification,
+    status, office, user_id, notifications=1|0, format=csv|jsonl, gzip=1|0.
+    """
+    if not current_user.is_admin:
+        flash('You are not authorized to export documents.', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    def _parse(value, days=0):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d') + timedelta(days=days)
+        except (TypeError, ValueError):
+            return None
+
+    fmt = (request.args.get('format') or 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'error': f"Unsupported export format '{fmt}'"}), 400
+    compress = request.args.get('gzip', default=0, type=int) == 1
+    filters = ExportFilters(
+        start_dt=_parse(request.args.get('date_from')),
+        # date_to is inclusive
+        end_dt=_parse(request.args.get('date_to'), days=1),
+        classification=(request.args.get('classification') or '').strip() or None,
+        status=(request.args.get('status') or '').strip() or None,
+        office=(request.args.get('office') or '').strip() or None,
+        user_id=request.args.get('user_id', type=int),
+        include_notifications=request.args.get('notifications', default=1, type=int) == 1,
     )
 
+    filename = f"documents_export_{datetime.utcnow():%Y%m%d_%H%M%S}.{fmt}"
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    if compress:
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    resp = Response(stream_with_context(iter_export(filters, fmt, compress)), mimetype=mimetype)
+    resp.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return resp
+
 # Batch Document Action Routes
+def _queue_batch_job(action, verb, document_ids, params, view, page, search):
+    """Hand a large selection to the background batch worker and return to the dashboard."""
+    try:
+        job = submit_batch_job(current_user.id, action, document_ids, params)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error queueing batch {action}: {str(e)}")
+        flash(f'Error queueing batch {action}: {str(e)}', 'danger')
+        return redirect(url_for('main.dashboard', view=view, page=page, search=search))
+    flash(f'{job.total} document(s) queued to be {verb} in the background.', 'info')
+    return redirect(url_for('main.dashboard', view=view, page=page, search=search, batch_job=job.id))
+
+@main.route('/batch_jobs/<int:job_id>')
+@login_required
+def batch_job_status(job_id):
+    """Progress and failed documents of a background batch job (owner or admin)."""
+    job = db.session.get(BatchJob, job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_admin):
+        return jsonify({'success': False, 'error': 'Batch job not found.'}), 404
+    data = job.to_dict()
+    data['failures'] = job_failures(job.id) if job.error_count else []
+    return jsonify({'success': True, 'job': data})
+
 @main.route('/batch_accept_documents', methods=['POST'])
 @login_required
 def batch_accept_documents():
@@ -4298,68 +3878,19 @@ def batch_accept_documents():
         flash('Invalid document selection.', 'danger')
         return redirect(url_for('main.dashboard', view=view, page=page, search=search))
     
-    success_count = 0
-    error_count = 0
-    
-    for doc_id in document_ids:
-        try:
-            document = Document.query.get(doc_id)
-            if not document:
-                error_count += 1
-                continue
-                
-            # Check authorization and status
-            if document.recipient != current_user:
-                error_count += 1
-                continue
-                
-            if document.status not in ['Pending', 'Forwarded']:
-                error_count += 1
-                continue
-            
-            # Accept the document
-            document.status = 'Accepted'
-            document.accepted_timestamp = datetime.utcnow()
-            
-            # Create notification for document creator
-            notification = Notification(
-                user=document.creator,
-                message=f"Your document '{document.title}' has been accepted by {current_user.username}"
-            )
-            db.session.add(notification)
-            
-            # Log the acceptance action
-            activity_log = ActivityLog(
-                user=current_user,
-                document_id=document.id,
-                action="Batch Accepted",
-                remarks="Document accepted via batch operation"
-            )
-            db.session.add(activity_log)
-            
-            # Insert ProcessingLog record
-            from app.models import ProcessingLog
-            processing_log = ProcessingLog(
-                user_id=current_user.id,
-                document_id=document.id,
-                accepted_timestamp=datetime.utcnow()
-            )
-            db.session.add(processing_log)
-            
-            success_count += 1
-            
-        except Exception as e:
-            error_count += 1
-            current_app.logger.error(f"Error in batch accept for document {doc_id}: {str(e)}")
+    if should_run_async(document_ids):
+        return _queue_batch_job(ACCEPT, 'accepted', document_ids, {}, view, page, search)
     
     try:
+        result = apply_batch_transition(ACCEPT, document_ids, current_user)
         db.session.commit()
-        if success_count > 0:
-            flash(f'Successfully accepted {success_count} document(s).', 'success')
-        if error_count > 0:
-            flash(f'Failed to accept {error_count} document(s).', 'warning')
+        if result.success_count > 0:
+            flash(f'Successfully accepted {result.success_count} document(s).', 'success')
+        if result.error_count > 0:
+            flash(f'Failed to accept {result.error_count} document(s).', 'warning')
     except Exception as e:
         db.session.rollback()
+        current_app.logger.error(f"Error in batch accept: {str(e)}")
         flash(f'Error processing batch accept: {str(e)}', 'danger')
     
     return redirect(url_for('main.dashboard', view=view, page=page, search=search))
@@ -4389,56 +3920,21 @@ def batch_decline_documents():
         flash('Invalid document selection.', 'danger')
         return redirect(url_for('main.dashboard', view=view, page=page, search=search))
     
-    success_count = 0
-    error_count = 0
     reason = form.reason.data
     
-    for doc_id in document_ids:
-        try:
-            document = Document.query.get(doc_id)
-            if not document:
-                error_count += 1
-                continue
-                
-            # Check authorization
-            if document.recipient != current_user:
-                error_count += 1
-                continue
-            
-            # Decline the document
-            document.status = 'Declined'
-            document.remarks = reason
-            
-            # Create notification for document creator
-            notification = Notification(
-                user=document.creator,
-                message=f"Your document '{document.title}' has been declined. Reason: {reason}"
-            )
-            db.session.add(notification)
-            
-            # Log the decline action
-            activity_log = ActivityLog(
-                user=current_user,
-                document_id=document.id,
-                action="Batch Declined",
-                remarks=reason
-            )
-            db.session.add(activity_log)
-            
-            success_count += 1
-            
-        except Exception as e:
-            error_count += 1
-            current_app.logger.error(f"Error in batch decline for document {doc_id}: {str(e)}")
+    if should_run_async(document_ids):
+        return _queue_batch_job(DECLINE, 'declined', document_ids, {'reason': reason}, view, page, search)
     
     try:
+        result = apply_batch_transition(DECLINE, document_ids, current_user, reason=reason)
         db.session.commit()
-        if success_count > 0:
-            flash(f'Successfully declined {success_count} document(s).', 'success')
-        if error_count > 0:
-            flash(f'Failed to decline {error_count} document(s).', 'warning')
+        if result.success_count > 0:
+            flash(f'Successfully declined {result.success_count} document(s).', 'success')
+        if result.error_count > 0:
+            flash(f'Failed to decline {result.error_count} document(s).', 'warning')
     except Exception as e:
         db.session.rollback()
+        current_app.logger.error(f"Error in batch decline: {str(e)}")
         flash(f'Error processing batch decline: {str(e)}', 'danger')
     
     return redirect(url_for('main.dashboard', view=view, page=page, search=search))
@@ -4469,88 +3965,33 @@ def batch_forward_documents():
         flash('Invalid document selection.', 'danger')
         return redirect(url_for('main.dashboard', view=view, page=page, search=search))
     
-    success_count = 0
-    error_count = 0
     new_recipient_id = form.recipient.data
     action_taken = form.action_taken.data
     remarks = form.remarks.data
     
     # Get new recipient user
-    new_recipient_user = User.query.get(new_recipient_id)
+    new_recipient_user = get_user_directory().get(new_recipient_id)
     if not new_recipient_user:
         flash('Invalid recipient selected.', 'danger')
         return redirect(url_for('main.dashboard', view=view, page=page, search=search))
     
-    for doc_id in document_ids:
-        try:
-            document = Document.query.get(doc_id)
-            if not document:
-                error_count += 1
-                continue
-                
-            # Check authorization and status
-            if document.recipient != current_user:
-                error_count += 1
-                continue
-                
-            if document.status not in ['Accepted', 'Forwarded']:
-                error_count += 1
-                continue
-            
-            # Forward the document
-            document.recipient_id = new_recipient_id
-            document.status = 'Pending'
-            document.action_taken = action_taken
-            document.remarks = remarks
-            document.forwarded_timestamp = datetime.utcnow()
-            
-            # Create notification for new recipient
-            notification = Notification(
-                user=new_recipient_user,
-                message=f"Document '{document.title}' has been forwarded to you by {current_user.username}"
-            )
-            db.session.add(notification)
-            
-            # Log the forwarding action
-            activity_log = ActivityLog(
-                user=current_user,
-                document_id=document.id,
-                action="Batch Forwarded",
-                remarks=f"Forwarded to {new_recipient_user.username}"
-            )
-            db.session.add(activity_log)
-            
-            # Update ProcessingLog
-            from app.models import ProcessingLog
-            processing_log = (ProcessingLog.query
-                              .filter_by(document_id=document.id, forwarded_timestamp=None)
-                              .order_by(ProcessingLog.accepted_timestamp.desc())
-                              .first())
-            if processing_log:
-                processing_log.forwarded_timestamp = datetime.utcnow()
-            else:
-                processing_log = ProcessingLog(
-                    user_id=current_user.id,
-                    document_id=document.id,
-                    accepted_timestamp=datetime.utcnow(),
-                    forwarded_timestamp=datetime.utcnow()
-                )
-                db.session.add(processing_log)
-            
-            success_count += 1
-            
-        except Exception as e:
-            error_count += 1
-            current_app.logger.error(f"Error in batch forward for document {doc_id}: {str(e)}")
+    if should_run_async(document_ids):
+        params = {'recipient_id': new_recipient_user.id, 'action_taken': action_taken, 'remarks': remarks}
+        return _queue_batch_job(FORWARD, f'forwarded to {new_recipient_user.username}', document_ids, params, view, page, search)
     
     try:
+        result = apply_batch_transition(
+            FORWARD, document_ids, current_user,
+            new_recipient=new_recipient_user, action_taken=action_taken, remarks=remarks
+        )
         db.session.commit()
-        if success_count > 0:
-            flash(f'Successfully forwarded {success_count} document(s) to {new_recipient_user.username}.', 'success')
-        if error_count > 0:
-            flash(f'Failed to forward {error_count} document(s).', 'warning')
+        if result.success_count > 0:
+            flash(f'Successfully forwarded {result.success_count} document(s) to {new_recipient_user.username}.', 'success')
+        if result.error_count > 0:
+            flash(f'Failed to forward {result.error_count} document(s).', 'warning')
     except Exception as e:
         db.session.rollback()
+        current_app.logger.error(f"Error in batch forward: {str(e)}")
         flash(f'Error processing batch forward: {str(e)}', 'danger')
     
     return redirect(url_for('main.dashboard', view=view, page=page, search=search))
@@ -4574,59 +4015,100 @@ def batch_release_documents():
         flash('Invalid document selection.', 'danger')
         return redirect(url_for('main.dashboard', view=view, page=page, search=search))
     
-    success_count = 0
-    error_count = 0
-    
-    for doc_id in document_ids:
-        try:
-            document = Document.query.get(doc_id)
-            if not document:
-                error_count += 1
-                continue
-                
-            # Check authorization
-            if document.recipient != current_user:
-                error_count += 1
-                continue
-            
-            # Release the document
-            document.status = 'Released'
-            document.released_timestamp = datetime.utcnow()
-            
-            # Create notification for document creator
-            notification = Notification(
-                user=document.creator,
-                message=f"Your document '{document.title}' has been released."
-            )
-            db.session.add(notification)
-            
-            # Log the release action
-            activity_log = ActivityLog(
-                user=current_user,
-                document_id=document.id,
-                action="Batch Released",
-                remarks="Document released via batch operation"
-            )
-            db.session.add(activity_log)
-            
-            success_count += 1
-            
-        except Exception as e:
-            error_count += 1
-            current_app.logger.error(f"Error in batch release for document {doc_id}: {str(e)}")
+    if should_run_async(document_ids):
+        return _queue_batch_job(RELEASE, 'released', document_ids, {}, view, page, search)
     
     try:
+        result = apply_batch_transition(RELEASE, document_ids, current_user)
         db.session.commit()
-        if success_count > 0:
-            flash(f'Successfully released {success_count} document(s).', 'success')
-        if error_count > 0:
-            flash(f'Failed to release {error_count} document(s).', 'warning')
+        if result.success_count > 0:
+            flash(f'Successfully released {result.success_count} document(s).', 'success')
+        if result.error_count > 0:
+            flash(f'Failed to release {result.error_count} document(s).', 'warning')
     except Exception as e:
         db.session.rollback()
+        current_app.logger.error(f"Error in batch release: {str(e)}")
         flash(f'Error processing batch release: {str(e)}', 'danger')
     
     return redirect(url_for('main.dashboard', view=view, page=page, search=search))
 
+# Barcode scan station: scans are collected in the browser, resolved in one
+# indexed IN lookup and accepted/released together through the batch engine
+SCAN_STATION_MAX_BARCODES = 500
+SCAN_STATION_ACTIONS = {ACCEPT: 'accepted', RELEASE: 'released'}
+
+@main.route('/scan_station')
+@login_required
+def scan_station():
+    """Receiving-window page for scanning many barcodes in a row."""
+    return render_template('scan_station.html', max_barcodes=SCAN_STATION_MAX_BARCODES)
+
+@main.route('/scan_station/resolve', methods=['POST'])
+@login_required
+def scan_station_resolve():
+    """Resolve scanned barcodes to documents with the actions available to the current user."""
+    data = request.get_json(silent=True) or {}
+    barcodes = [str(value).strip() for value in (data.get('barcodes') or []) if str(value or '').strip()]
+    barcodes = list(dict.fromkeys(barcodes))
+    if len(barcodes) > SCAN_STATION_MAX_BARCODES:
+        return jsonify({'success': False, 'error': f'Resolve at most {SCAN_STATION_MAX_BARCODES} barcodes at a time.'}), 400
+
+    matches = {barcode: [] for barcode in barcodes}
+    if barcodes:
+        Creator = aliased(User)
+        rows = db.session.execute(
+            select(Document.id, Document.barcode, Document.title, Document.office, Document.status,
+                      Document.recipient_id, Creator.username)
+            .outerjoin(Creator, Creator.id == Document.creator_id)
+            .where(Document.barcode.in_(barcodes))
+            .order_by(Document.timestamp.desc())
+        )
+        # Collations may match barcodes case-insensitively, so key results case-insensitively too
+        by_key = {barcode.lower(): barcode for barcode in barcodes}
+        for doc_id, barcode, title, office, status, recipient_id, creator in rows:
+            actions = []
+            if recipient_id == current_user.id:
+                if status in ('Pending', 'Forwarded'):
+                    actions.append(ACCEPT)
+                if status == 'Accepted':
+                    actions.append(RELEASE)
+            matches.setdefault(by_key.get((barcode or '').lower(), barcode), []).append({
+                'id': doc_id, 'title': title, 'office': office, 'status': status,
+                'creator': creator, 'actions': actions,
+            })
+    return jsonify({
+        'success': True,
+        'results': [{'barcode': barcode, 'documents': docs} for barcode, docs in matches.items()],
+    })
+
+@main.route('/scan_station/apply', methods=['POST'])
+@login_required
+def scan_station_apply():
+    """Accept or release the resolved documents in one batch transition."""
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    if action not in SCAN_STATION_ACTIONS:
+        return jsonify({'success': False, 'error': 'Unsupported action.'}), 400
+    try:
+        document_ids = [int(doc_id) for doc_id in (data.get('document_ids') or [])]
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid document selection.'}), 400
+    if not document_ids:
+        return jsonify({'success': False, 'error': 'No documents to process.'}), 400
+    if len(document_ids) > SCAN_STATION_MAX_BARCODES:
+        return jsonify({'success': False, 'error': f'Process at most {SCAN_STATION_MAX_BARCODES} documents at a time.'}), 400
+
+    try:
+        result = apply_batch_transition(action, document_ids, current_user)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in scan station {action}: {str(e)}")
+        return jsonify({'success': False, 'error': f'Error processing documents: {str(e)}'}), 500
+    data = result.to_dict()
+    data['message'] = f"{result.success_count} document(s) {SCAN_STATION_ACTIONS[action]}, {result.error_count} failed."
+    return jsonify({'success': True, 'result': data})
+
 # Serve favicon.ico
 @main.route('/favicon.ico')
 def favicon():
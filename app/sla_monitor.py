@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Iterable, List, Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional
 
 from flask import current_app
+from sqlalchemy import insert
 from sqlalchemy.orm import joinedload
 
 from app import db
@@ -24,6 +30,113 @@ _DOCUMENT_STATUS_ANCHORS: Dict[str, List[str]] = {
 }
 
 
+# Rows buffered before a bulk insert + commit when SLA_ALERT_CHUNK_SIZE is unset
+DEFAULT_ALERT_CHUNK_SIZE = 500
+
+
+class _AlertWriter:
+    """
+    Buffer SLA notifications and activity log entries as plain row dicts and
+    write them with chunked executemany inserts, committing after each chunk.
+    Keeps mass-escalation runs out of the ORM identity map.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_ALERT_CHUNK_SIZE):
+        self.chunk_size = max(int(chunk_size or DEFAULT_ALERT_CHUNK_SIZE), 1)
+        self.notifications: List[Dict] = []
+        self.activities: List[Dict] = []
+        self.pending_keys = set()
+        self.written = 0
+
+    def add_notification(self, user_id: int, message: str, dedupe_key: str, now: datetime) -> None:
+        self.notifications.append(
+            {
+                "user_id": user_id,
+                "message": f"{message} [{dedupe_key}]",
+                "is_read": False,
+                "timestamp": now,
+            }
+        )
+        self.pending_keys.add((user_id, dedupe_key))
+        self._maybe_flush()
+
+    def add_activity(self, user_id: int, document_id: int, action: str, remarks: str) -> None:
+        self.activities.append(
+            {
+                "user_id": user_id,
+                "document_id": document_id,
+                "action": action,
+                "remarks": remarks,
+                "timestamp": datetime.utcnow(),
+            }
+        )
+        self._maybe_flush()
+
+    def is_pending(self, user_id: int, dedupe_key: str) -> bool:
+        return (user_id, dedupe_key) in self.pending_keys
+
+    def _maybe_flush(self) -> None:
+        if len(self.notifications) + len(self.activities) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.notifications and not self.activities:
+            return
+        if self.notifications:
+            db.session.execute(insert(Notification.__table__), self.notifications)
+        if self.activities:
+            db.session.execute(insert(ActivityLog.__table__), self.activities)
+        # Core inserts leave ORM state untouched, so keep the loaded entities
+        # from being expired (and lazily reloaded one by one) after each chunk.
+        session = db.session()
+        expire_on_commit = session.expire_on_commit
+        session.expire_on_commit = False
+        try:
+            session.commit()
+        finally:
+            session.expire_on_commit = expire_on_commit
+        self.written += len(self.notifications) + len(self.activities)
+        self.notifications = []
+        self.activities = []
+        # Flushed rows are now visible to the dedupe queries
+        self.pending_keys = set()
+
+
+def _alert_chunk_size() -> int:
+    try:
+        return int(current_app.config.get("SLA_ALERT_CHUNK_SIZE", DEFAULT_ALERT_CHUNK_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_ALERT_CHUNK_SIZE
+
+
+# Seconds a cached snapshot is trusted before reloading; bounds staleness in
+# workers that did not see the invalidating POST.
+DEFAULT_SNAPSHOT_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class SLASnapshot:
+    """
+    Immutable view of the SLA preferences and rules used by a monitor run.
+    """
+
+    version: int
+    loaded_at: float
+    preferences: Mapping[str, bool]
+    rules: Mapping[str, Mapping[str, Mapping[str, float]]]
+
+    def is_enabled(self, category: str) -> bool:
+        return self.preferences.get(category, True)
+
+    def rules_for(self, entity: str) -> Mapping[str, Mapping[str, float]]:
+        return self.rules.get(entity, MappingProxyType({}))
+
+
+_snapshot_lock = threading.Lock()
+_snapshot_version = 0
+_snapshot: Optional[SLASnapshot] = None
+
+
 def _load_sla_preferences() -> Dict[str, bool]:
     defaults = SLAAlertPreference.DEFAULTS.copy()
     try:
@@ -33,26 +146,77 @@ def _load_sla_preferences() -> Dict[str, bool]:
         return defaults
 
 
+def _freeze_rules(config: Mapping) -> Mapping[str, Mapping[str, Mapping[str, float]]]:
+    return MappingProxyType(
+        {
+            entity: MappingProxyType(
+                {status: MappingProxyType(dict(rule)) for status, rule in statuses.items()}
+            )
+            for entity, statuses in (config or {}).items()
+        }
+    )
+
+
+def get_sla_snapshot() -> SLASnapshot:
+    """
+    Return the cached preferences-and-rules snapshot, loading it when the
+    version was bumped or the TTL elapsed.
+    """
+    global _snapshot
+    ttl = current_app.config.get("SLA_SNAPSHOT_TTL_SECONDS", DEFAULT_SNAPSHOT_TTL_SECONDS)
+    with _snapshot_lock:
+        cached = _snapshot
+        if (
+            cached is not None
+            and cached.version == _snapshot_version
+            and time.monotonic() - cached.loaded_at < ttl
+        ):
+            return cached
+        version = _snapshot_version
+
+    snapshot = SLASnapshot(
+        version=version,
+        loaded_at=time.monotonic(),
+        preferences=MappingProxyType(_load_sla_preferences()),
+        rules=_freeze_rules(current_app.config.get("SLA_RULES", {})),
+    )
+    with _snapshot_lock:
+        # A concurrent invalidation wins; the next caller reloads.
+        if version == _snapshot_version:
+            _snapshot = snapshot
+    return snapshot
+
+
+def invalidate_sla_snapshot() -> int:
+    """
+    Bump the snapshot version so the next reader reloads preferences.
+    """
+    global _snapshot_version, _snapshot
+    with _snapshot_lock:
+        _snapshot_version += 1
+        _snapshot = None
+        return _snapshot_version
+
+
 def run_sla_checks() -> Dict[str, Dict[str, int]]:
     """
     Entry point for the APScheduler job. Returns per-entity summaries.
+    Set SLA_CONCURRENT_MONITORS to run the per-entity monitors in parallel.
     """
+    if current_app.config.get("SLA_CONCURRENT_MONITORS", False):
+        return _run_sla_checks_concurrently()
+
     now = datetime.utcnow()
+    writer = _AlertWriter(_alert_chunk_size())
     try:
         admins = _collect_admins()
-        preferences = _load_sla_preferences()
+        snapshot = get_sla_snapshot()
         results = {
-            "documents": _monitor_document_slas(
-                now, admins, enabled=preferences.get("documents", True)
-            ),
-            "leave_requests": _monitor_leave_slas(
-                now, admins, enabled=preferences.get("leave_requests", True)
-            ),
-            "ewp_records": _monitor_ewp_slas(
-                now, admins, enabled=preferences.get("ewp_records", True)
-            ),
+            section: monitor(now, admins, snapshot=snapshot, writer=writer)
+            for section, monitor in _MONITORS.items()
         }
 
+        writer.flush()
         if db.session.new or db.session.dirty or db.session.deleted:
             db.session.commit()
 
@@ -64,13 +228,80 @@ def run_sla_checks() -> Dict[str, Dict[str, int]]:
         raise
 
 
+def _run_sla_checks_concurrently() -> Dict[str, Dict[str, int]]:
+    """
+    Run each entity monitor on a small thread pool. Every worker pushes its
+    own app context, so Flask-SQLAlchemy hands it an isolated scoped session
+    that it commits (or rolls back) independently.
+    """
+    app = current_app._get_current_object()
+    now = datetime.utcnow()
+    snapshot = get_sla_snapshot()
+    chunk_size = _alert_chunk_size()
+    max_workers = max(
+        1, min(int(app.config.get("SLA_MONITOR_WORKERS", len(_MONITORS))), len(_MONITORS))
+    )
+
+    results: Dict[str, Dict[str, int]] = {}
+    failures: Dict[str, BaseException] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sla-monitor") as pool:
+        futures = {
+            pool.submit(_run_monitor_isolated, app, section, now, snapshot, chunk_size): section
+            for section in _MONITORS
+        }
+        for future in as_completed(futures):
+            section = futures[future]
+            try:
+                results[section] = future.result()
+            except Exception as exc:
+                failures[section] = exc
+                results[section] = _empty_summary()
+
+    # Keep the summary in the same section order as the sequential path
+    results = {section: results[section] for section in _MONITORS}
+    _log_summary(results)
+    if failures:
+        current_app.logger.error("SLA monitor sections failed: %s", sorted(failures))
+        raise next(iter(failures.values()))
+    return results
+
+
+def _run_monitor_isolated(
+    app,
+    section: str,
+    now: datetime,
+    snapshot: SLASnapshot,
+    chunk_size: int,
+) -> Dict[str, int]:
+    with app.app_context():
+        writer = _AlertWriter(chunk_size)
+        try:
+            admins = _collect_admins()
+            summary = _MONITORS[section](now, admins, snapshot=snapshot, writer=writer)
+            writer.flush()
+            if db.session.new or db.session.dirty or db.session.deleted:
+                db.session.commit()
+            return summary
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception("SLA monitor section '%s' failed", section)
+            raise
+        finally:
+            db.session.remove()
+
+
 def _monitor_document_slas(
-    now: datetime, admins: List[User], *, enabled: bool = True
+    now: datetime,
+    admins: List[User],
+    *,
+    snapshot: Optional[SLASnapshot] = None,
+    writer: Optional[_AlertWriter] = None,
 ) -> Dict[str, int]:
-    if not enabled:
+    snapshot = snapshot or get_sla_snapshot()
+    if not snapshot.is_enabled("documents"):
         return _empty_summary()
 
-    rules = _get_rules("Document")
+    rules = snapshot.rules_for("Document")
     if not rules:
         return _empty_summary()
 
@@ -104,7 +335,7 @@ def _monitor_document_slas(
 
         # Avoid duplicate alerts for the same severity after the last reassignment
         if not _log_document_activity(
-            document, severity, elapsed_hours, anchor, use_business
+            document, severity, elapsed_hours, anchor, use_business, writer=writer
         ):
             continue
 
@@ -123,7 +354,9 @@ def _monitor_document_slas(
         if severity == "escalate" and rule.get("escalate_to_admins"):
             recipients.extend(admins)
 
-        if _notify_users(recipients, message, dedupe_key, dedupe_hours, now):
+        if _notify_users(
+            recipients, message, dedupe_key, dedupe_hours, now, writer=writer
+        ):
             summary["alerts"] += 1
             if severity == "escalate":
                 summary["escalations"] += 1
@@ -136,12 +369,17 @@ def _monitor_document_slas(
 
 
 def _monitor_leave_slas(
-    now: datetime, admins: List[User], *, enabled: bool = True
+    now: datetime,
+    admins: List[User],
+    *,
+    snapshot: Optional[SLASnapshot] = None,
+    writer: Optional[_AlertWriter] = None,
 ) -> Dict[str, int]:
-    if not enabled:
+    snapshot = snapshot or get_sla_snapshot()
+    if not snapshot.is_enabled("leave_requests"):
         return _empty_summary()
 
-    rules = _get_rules("LeaveRequest")
+    rules = snapshot.rules_for("LeaveRequest")
     if not rules:
         return _empty_summary()
 
@@ -184,7 +422,9 @@ def _monitor_leave_slas(
         if severity == "escalate" and rule.get("escalate_to_admins"):
             recipients.extend(admins)
 
-        if _notify_users(recipients, message, dedupe_key, dedupe_hours, now):
+        if _notify_users(
+            recipients, message, dedupe_key, dedupe_hours, now, writer=writer
+        ):
             summary["alerts"] += 1
             if severity == "escalate":
                 summary["escalations"] += 1
@@ -197,12 +437,17 @@ def _monitor_leave_slas(
 
 
 def _monitor_ewp_slas(
-    now: datetime, admins: List[User], *, enabled: bool = True
+    now: datetime,
+    admins: List[User],
+    *,
+    snapshot: Optional[SLASnapshot] = None,
+    writer: Optional[_AlertWriter] = None,
 ) -> Dict[str, int]:
-    if not enabled:
+    snapshot = snapshot or get_sla_snapshot()
+    if not snapshot.is_enabled("ewp_records"):
         return _empty_summary()
 
-    rules = _get_rules("EWPRecord")
+    rules = snapshot.rules_for("EWPRecord")
     if not rules:
         return _empty_summary()
 
@@ -245,7 +490,9 @@ def _monitor_ewp_slas(
         if severity == "escalate" and rule.get("escalate_to_admins"):
             recipients.extend(admins)
 
-        if _notify_users(recipients, message, dedupe_key, dedupe_hours, now):
+        if _notify_users(
+            recipients, message, dedupe_key, dedupe_hours, now, writer=writer
+        ):
             summary["alerts"] += 1
             if severity == "escalate":
                 summary["escalations"] += 1
@@ -257,12 +504,21 @@ def _monitor_ewp_slas(
     return summary
 
 
+_MONITORS = {
+    "documents": _monitor_document_slas,
+    "leave_requests": _monitor_leave_slas,
+    "ewp_records": _monitor_ewp_slas,
+}
+
+
 def _notify_users(
     users: Iterable[Optional[User]],
     message: str,
     dedupe_key: str,
     dedupe_hours: float,
     now: datetime,
+    *,
+    writer: Optional[_AlertWriter] = None,
 ) -> bool:
     sent_any = False
     seen_ids = set()
@@ -272,7 +528,9 @@ def _notify_users(
         if getattr(user, "status", "Active") not in (None, "Active"):
             continue
 
-        if _send_notification_once(user, message, dedupe_key, dedupe_hours, now):
+        if _send_notification_once(
+            user, message, dedupe_key, dedupe_hours, now, writer=writer
+        ):
             sent_any = True
         seen_ids.add(user.id)
 
@@ -285,10 +543,15 @@ def _send_notification_once(
     dedupe_key: str,
     dedupe_hours: float,
     now: datetime,
+    *,
+    writer: Optional[_AlertWriter] = None,
 ) -> bool:
     """
     Prevent duplicate notifications within the configured window.
     """
+    if writer is not None and writer.is_pending(user.id, dedupe_key):
+        return False
+
     cutoff = now - timedelta(hours=dedupe_hours)
     existing = (
         Notification.query.filter(
@@ -303,6 +566,10 @@ def _send_notification_once(
     if existing:
         return False
 
+    if writer is not None:
+        writer.add_notification(user.id, message, dedupe_key, now)
+        return True
+
     alert = Notification(user=user, message=f"{message} [{dedupe_key}]")
     alert.timestamp = now
     db.session.add(alert)
@@ -326,12 +593,47 @@ def _resolve_document_anchor(document: Document) -> Optional[datetime]:
     return anchor_log.timestamp if anchor_log else document.timestamp
 
 
+def _resolve_document_anchors(documents: Iterable[Document]) -> Dict[int, datetime]:
+    """
+    Batch variant of _resolve_document_anchor: one grouped ActivityLog query
+    per anchor action set instead of one lookup per document.
+    """
+    anchors: Dict[int, datetime] = {}
+    by_actions: Dict[tuple, List[int]] = {}
+    for document in documents:
+        actions = _DOCUMENT_STATUS_ANCHORS.get(document.status)
+        anchors[document.id] = document.timestamp
+        if actions:
+            by_actions.setdefault(tuple(actions), []).append(document.id)
+
+    for actions, document_ids in by_actions.items():
+        rows = (
+            db.session.query(
+                ActivityLog.document_id,
+                db.func.max(ActivityLog.timestamp),
+            )
+            .filter(
+                ActivityLog.document_id.in_(document_ids),
+                ActivityLog.action.in_(actions),
+            )
+            .group_by(ActivityLog.document_id)
+            .all()
+        )
+        for document_id, latest in rows:
+            if latest:
+                anchors[document_id] = latest
+
+    return anchors
+
+
 def _log_document_activity(
     document: Document,
     severity: str,
     elapsed_hours: float,
     anchor_time: datetime,
     use_business_hours: bool,
+    *,
+    writer: Optional[_AlertWriter] = None,
 ) -> bool:
     action = "SLA Escalation" if severity == "escalate" else "SLA Warning"
     existing = (
@@ -357,6 +659,10 @@ def _log_document_activity(
         f"Automated SLA monitor flagged status '{document.status}' "
         f"after {elapsed_label}."
     )
+    if writer is not None:
+        writer.add_activity(actor.id, document.id, action, remarks)
+        return True
+
     entry = ActivityLog(
         user=actor,
         document_id=document.id,
@@ -381,7 +687,7 @@ def _elapsed_hours(
     return max(delta.total_seconds(), 0) / 3600.0
 
 
-def _determine_severity(elapsed_hours: float, rule: Dict[str, float]) -> Optional[str]:
+def _determine_severity(elapsed_hours: float, rule: Mapping[str, float]) -> Optional[str]:
     escalate = rule.get("escalate_after_hours")
     warn = rule.get("warn_after_hours")
 
@@ -392,15 +698,14 @@ def _determine_severity(elapsed_hours: float, rule: Dict[str, float]) -> Optiona
     return None
 
 
-def _dedupe_window(rule: Dict[str, float], severity: str) -> float:
+def _dedupe_window(rule: Mapping[str, float], severity: str) -> float:
     if severity == "escalate":
         return rule.get("escalation_dedupe_hours", rule.get("dedupe_hours", 12))
     return rule.get("dedupe_hours", 6)
 
 
-def _get_rules(entity: str) -> Dict[str, Dict[str, float]]:
-    config = current_app.config.get("SLA_RULES", {})
-    return config.get(entity, {})
+def _get_rules(entity: str) -> Mapping[str, Mapping[str, float]]:
+    return get_sla_snapshot().rules_for(entity)
 
 
 def _collect_admins() -> List[User]:
@@ -1,26 +1,13 @@
-from datetime import datetime
-
 def auto_archive_documents():
     """
     Archives documents created in previous months.
-    """
-    from app import db  # Delayed import to avoid circular dependency
-    from app.models import Document
-
-    # Get the current month and year
-    current_date = datetime.utcnow()
-    current_month = current_date.month
-    current_year = current_date.year
 
-    # Find documents created in previous months
-    documents_to_archive = Document.query.filter(
-        (Document.timestamp < datetime(current_year, current_month, 1)) & 
-        (Document.status != 'archived')  # Avoid re-archiving already archived documents
-    ).all()
-
-    # Archive the documents
-    for document in documents_to_archive:
-        document.status = 'archived'
-        db.session.commit()
+    Kept for callers of the old task name; delegates to the chunked,
+    resumable pipeline in app.auto_archive.
+    """
+    from flask import current_app
+    from app.auto_archive import archive_old_documents  # Delayed import to avoid circular dependency
 
-    print(f"Archived {len(documents_to_archive)} documents.")
+    result = archive_old_documents()
+    current_app.logger.info(result)
+    return result
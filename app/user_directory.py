@@ -0,0 +1,229 @@
+"""
+In-process user directory.
+
+One query loads every account's id, username, email, status and permission
+flags; recipient pickers, the recipient typeahead (a sorted index searched by
+prefix with binary search), the username/email/status lookups and the
+Flask-Login user loader then read from memory. The directory is versioned:
+committing a change to a User row bumps a local counter and touches a small
+version file in the instance folder, so every worker on the host reloads on
+its next read. A TTL bounds staleness for changes made outside the app.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app import db
+from app.models import User
+
+DEFAULT_TTL_SECONDS = 300
+VERSION_FILENAME = 'user_directory.version'
+
+# Columns whose changes invalidate the directory
+_TRACKED_COLUMNS = ('username', 'email', 'status', 'is_admin', 'can_access_leave', 'can_access_employee_records')
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    id: int
+    username: str
+    email: str
+    status: str
+    is_admin: bool
+    can_access_leave: bool
+    can_access_employee_records: bool
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == 'Active'
+
+
+@dataclass(frozen=True)
+class UserDirectory:
+    version: Tuple[int, int]
+    loaded_at: float
+    by_id: Mapping[int, DirectoryEntry]
+    by_username: Mapping[str, DirectoryEntry]
+    by_email: Mapping[str, DirectoryEntry]
+    # (id, username) for every account, sorted by username
+    choices: Tuple[Tuple[int, str], ...]
+    # Active accounts only: lower-cased usernames (sorted) and the matching (id, username)
+    active_keys: Tuple[str, ...]
+    active_choices: Tuple[Tuple[int, str], ...]
+
+    def get(self, user_id) -> Optional[DirectoryEntry]:
+        try:
+            return self.by_id.get(int(user_id))
+        except (TypeError, ValueError):
+            return None
+
+    def find_username(self, username: str) -> Optional[DirectoryEntry]:
+        # Lower-cased keys match the case-insensitive collation of the user table
+        return self.by_username.get((username or '').strip().lower())
+
+    def find_email(self, email: str) -> Optional[DirectoryEntry]:
+        return self.by_email.get((email or '').strip().lower())
+
+    def recipient_choices(self, exclude_id=None) -> List[Tuple[int, str]]:
+        return [choice for choice in self.choices if choice[0] != exclude_id]
+
+    def search_active(self, prefix: str, limit: int = 20, exclude_id=None) -> List[Tuple[int, str]]:
+        """Active accounts whose username starts with ``prefix`` (case-insensitive), by binary search."""
+        prefix = (prefix or '').strip().lower()
+        results = []
+        for index in range(bisect_left(self.active_keys, prefix), len(self.active_keys)):
+            if not self.active_keys[index].startswith(prefix) or len(results) >= limit:
+                break
+            if self.active_choices[index][0] != exclude_id:
+                results.append(self.active_choices[index])
+        return results
+
+
+_lock = threading.Lock()
+_local_version = 0
+_directory: Optional[UserDirectory] = None
+
+
+def _version_path(app) -> str:
+    return os.path.join(app.instance_path, VERSION_FILENAME)
+
+
+def _shared_version(app) -> int:
+    try:
+        return os.stat(_version_path(app)).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _ttl() -> float:
+    try:
+        return float(current_app.config.get('USER_DIRECTORY_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_TTL_SECONDS
+
+
+def _load(version) -> UserDirectory:
+    rows = db.session.execute(
+        select(User.id, User.username, User.email, User.status, User.is_admin,
+               User.can_access_leave, User.can_access_employee_records)
+    )
+    entries = [
+        DirectoryEntry(id=row[0], username=row[1], email=row[2], status=row[3], is_admin=bool(row[4]),
+                       can_access_leave=bool(row[5]), can_access_employee_records=bool(row[6]))
+        for row in rows
+    ]
+    entries.sort(key=lambda entry: (entry.username.lower(), entry.id))
+    active = [entry for entry in entries if entry.is_active]
+    return UserDirectory(
+        version=version,
+        loaded_at=time.monotonic(),
+        by_id=MappingProxyType({entry.id: entry for entry in entries}),
+        by_username=MappingProxyType({entry.username.lower(): entry for entry in entries}),
+        by_email=MappingProxyType({(entry.email or '').lower(): entry for entry in entries}),
+        choices=tuple((entry.id, entry.username) for entry in entries),
+        active_keys=tuple(entry.username.lower() for entry in active),
+        active_choices=tuple((entry.id, entry.username) for entry in active),
+    )
+
+
+def get_user_directory() -> UserDirectory:
+    """Return the cached directory, reloading it when the version moved or the TTL elapsed."""
+    global _directory
+    app = current_app._get_current_object()
+    with _lock:
+        version = (_local_version, _shared_version(app))
+        cached = _directory
+        if cached is not None and cached.version == version and time.monotonic() - cached.loaded_at < _ttl():
+            return cached
+
+    directory = _load(version)
+    with _lock:
+        # A concurrent invalidation wins; the next caller reloads.
+        if version == (_local_version, _shared_version(app)):
+            _directory = directory
+    return directory
+
+
+def load_principal(user_id) -> Optional[User]:
+    """
+    Flask-Login user loader: build the logged-in User from the directory and
+    attach it to the session without a SELECT. Columns outside the directory
+    (such as password_hash) load on first access.
+    """
+    entry = get_user_directory().get(user_id)
+    if entry is None:
+        # Created outside the app since the last reload; read it directly
+        user = db.session.get(User, int(user_id))
+        if user is not None:
+            invalidate_user_directory()
+        return user
+    user = User(
+        id=entry.id,
+        username=entry.username,
+        email=entry.email,
+        status=entry.status,
+        is_admin=entry.is_admin,
+        can_access_leave=entry.can_access_leave,
+        can_access_employee_records=entry.can_access_employee_records,
+    )
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def invalidate_user_directory(app=None) -> None:
+    """Bump the directory version in this worker and for every other worker on the host."""
+    global _local_version, _directory
+    with _lock:
+        _local_version += 1
+        _directory = None
+    app = app or current_app._get_current_object()
+    path = _version_path(app)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            handle.write(uuid.uuid4().hex)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        app.logger.warning("Could not publish user directory version: %s", exc)
+
+
+def _user_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _TRACKED_COLUMNS)
+
+
+@event.listens_for(Session, 'before_flush')
+def _mark_user_changes(session, flush_context, instances):
+    if session.info.get('user_directory_dirty'):
+        return
+    if (any(isinstance(obj, User) for obj in session.new)
+            or any(isinstance(obj, User) for obj in session.deleted)
+            or any(isinstance(obj, User) and _user_changed(obj) for obj in session.dirty)):
+        session.info['user_directory_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_user_changes(session):
+    if session.info.pop('user_directory_dirty', False):
+        try:
+            invalidate_user_directory()
+        except RuntimeError:
+            # Committed outside an app context (e.g. a script); the TTL covers it
+            pass
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_user_changes(session):
+    session.info.pop('user_directory_dirty', None)
@@ -1,4 +1,5 @@
 import os
+import socket
 from flask import current_app, url_for
 from werkzeug.utils import secure_filename
 from datetime import time, timedelta, datetime
@@ -79,3 +80,12 @@ def get_file_url(filepath):
         return None
     filename = os.path.basename(filepath)
     return url_for('main.serve_file', filename=filename)
+
+def job_lease_owner():
+    """Who holds a background job's lease: this host and process, as stored in claimed_by"""
+    return f'{socket.gethostname()}:{os.getpid()}'[:64]
+
+def job_lease_cutoff():
+    """Jobs whose heartbeat is older than this have lost their worker (JOB_LEASE_SECONDS)"""
+    seconds = int(current_app.config.get('JOB_LEASE_SECONDS', 900))
+    return datetime.utcnow() - timedelta(seconds=seconds)
@@ -106,6 +106,46 @@ class Config:
         },
     }
 
+    # SLA monitor: alerts are bulk-inserted and committed in chunks of this size
+    SLA_ALERT_CHUNK_SIZE = int(os.environ.get("SLA_ALERT_CHUNK_SIZE", "500"))
+    # Seconds a worker trusts its cached SLA preferences/rules snapshot
+    SLA_SNAPSHOT_TTL_SECONDS = int(os.environ.get("SLA_SNAPSHOT_TTL_SECONDS", "300"))
+    # Run the document/leave/EWP monitors in parallel, each on its own session
+    SLA_CONCURRENT_MONITORS = os.environ.get("SLA_CONCURRENT_MONITORS", "0") == "1"
+    SLA_MONITOR_WORKERS = int(os.environ.get("SLA_MONITOR_WORKERS", "3"))
+
+    # Auto-archive: documents per UPDATE/commit chunk and optional pause between chunks
+    ARCHIVE_CHUNK_SIZE = int(os.environ.get("ARCHIVE_CHUNK_SIZE", "1000"))
+    ARCHIVE_THROTTLE_SECONDS = float(os.environ.get("ARCHIVE_THROTTLE_SECONDS", "0"))
+
+    # Reports: rows fetched per yield_per cursor chunk when streaming txt/csv
+    REPORT_STREAM_CHUNK_SIZE = int(os.environ.get("REPORT_STREAM_CHUNK_SIZE", "1000"))
+    # Serve closed-period report summaries from stored snapshots
+    REPORT_SNAPSHOTS_ENABLED = os.environ.get("REPORT_SNAPSHOTS_ENABLED", "1") == "1"
+    # Background report jobs: worker processes and where finished artifacts are kept
+    REPORT_JOB_WORKERS = int(os.environ.get("REPORT_JOB_WORKERS", "2"))
+    REPORT_ARTIFACT_DIR = os.environ.get("REPORT_ARTIFACT_DIR") or None
+    # Seconds a worker reuses a computed processing-time leaderboard
+    RANKING_CACHE_TTL_SECONDS = int(os.environ.get("RANKING_CACHE_TTL_SECONDS", "60"))
+
+    # Audit export: documents per keyset chunk (history is fetched per chunk)
+    EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "500"))
+
+    # Batch actions: selections of at least this many documents run as background
+    # jobs, processed in chunks of BATCH_JOB_CHUNK_SIZE by BATCH_JOB_WORKERS processes
+    BATCH_ASYNC_THRESHOLD = int(os.environ.get("BATCH_ASYNC_THRESHOLD", "200"))
+    BATCH_JOB_CHUNK_SIZE = int(os.environ.get("BATCH_JOB_CHUNK_SIZE", "200"))
+    BATCH_JOB_WORKERS = int(os.environ.get("BATCH_JOB_WORKERS", "1"))
+    # Background jobs refresh a lease as they work; one silent for this long is
+    # taken over by `flask resume-jobs` / the next server start
+    JOB_LEASE_SECONDS = int(os.environ.get("JOB_LEASE_SECONDS", "900"))
+
+    # Bulk document intake: valid rows inserted and committed per chunk
+    INTAKE_CHUNK_SIZE = int(os.environ.get("INTAKE_CHUNK_SIZE", "1000"))
+
+    # Seconds a worker trusts its cached user directory (changes made in the app reload it at once)
+    USER_DIRECTORY_TTL_SECONDS = int(os.environ.get("USER_DIRECTORY_TTL_SECONDS", "300"))
+
     # Host/Port
     HOST = os.environ.get("HOST", "0.0.0.0")
     PORT = int(os.environ.get("PORT", "5000"))
@@ -1,5 +1,7 @@
 # Gunicorn configuration file
 bind = '127.0.0.1:8000'
 workers = 4  # Adjust based on your CPU cores
+# Workers do not resume abandoned background jobs; after a restart run
+# `flask resume-jobs` once (not per worker)
 accesslog = '-'
 errorlog = '-'
@@ -45,6 +45,22 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Employee search objects created outside the models by migration a7c9e1f3b528
+# (see app.employee_search); autogenerate must not propose dropping them.
+SEARCH_TABLE_PREFIX = 'employees_fts'
+SEARCH_INDEXES = {'ft_employees_search'} | {
+    f'ix_employees_{column}_trgm' for column in ('surname', 'first_name', 'employee_name', 'bio_number')
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name and name.startswith(SEARCH_TABLE_PREFIX):
+        return False
+    if type_ == 'index' and reflected and compare_to is None and name in SEARCH_INDEXES:
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +81,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +110,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,65 @@
+"""add per-user archive facet counts
+
+Revision ID: a2d4f6b8c031
+Revises: f1c3e5a7b920
+Create Date: 2026-10-19 11:45:00.000000
+
+"""
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d4f6b8c031'
+down_revision = 'f1c3e5a7b920'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'archive_facets',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('month', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'year', 'month'),
+    )
+
+    # Backfill from the archive table. Year/month are derived in Python so the
+    # migration does not depend on database-specific date functions.
+    bind = op.get_bind()
+    archived = sa.table(
+        'document_archive',
+        sa.column('creator_id', sa.Integer),
+        sa.column('recipient_id', sa.Integer),
+        sa.column('timestamp', sa.DateTime),
+    )
+    counts = Counter()
+    rows = bind.execute(sa.select(archived.c.creator_id, archived.c.recipient_id, archived.c.timestamp))
+    for creator_id, recipient_id, timestamp in rows:
+        if timestamp is None:
+            continue
+        for user_id in {creator_id, recipient_id}:
+            if user_id:
+                counts[(user_id, timestamp.year, timestamp.month)] += 1
+
+    if counts:
+        facets = sa.table(
+            'archive_facets',
+            sa.column('user_id', sa.Integer),
+            sa.column('year', sa.Integer),
+            sa.column('month', sa.Integer),
+            sa.column('count', sa.Integer),
+        )
+        op.bulk_insert(facets, [
+            {'user_id': user_id, 'year': year, 'month': month, 'count': count}
+            for (user_id, year, month), count in counts.items()
+        ])
+
+
+def downgrade():
+    op.drop_table('archive_facets')
@@ -0,0 +1,82 @@
+"""add employee search indexes (name B-trees plus FULLTEXT / FTS5 / trigram per database)
+
+Revision ID: a7c9e1f3b528
+Revises: f2a4c6e8b017
+Create Date: 2026-10-19 21:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1f3b528'
+down_revision = 'f2a4c6e8b017'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with app.employee_search
+FULLTEXT_INDEX = 'ft_employees_search'
+FTS_TABLE = 'employees_fts'
+SEARCH_COLUMNS = ('surname', 'first_name', 'employee_name', 'bio_number')
+NAME_INDEXES = (
+    ('ix_employees_surname', 'surname'),
+    ('ix_employees_first_name', 'first_name'),
+    ('ix_employees_employee_name', 'employee_name'),
+)
+
+
+def _create_fts5_table():
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+    op.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, content='employees', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON employees BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON employees BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {columns} ON employees BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def upgrade():
+    for name, column in NAME_INDEXES:
+        op.create_index(name, 'employees', [column], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.create_index(FULLTEXT_INDEX, 'employees', list(SEARCH_COLUMNS), unique=False,
+                        mysql_prefix='FULLTEXT', mariadb_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        _create_fts5_table()
+    elif dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in SEARCH_COLUMNS:
+            op.create_index(f'ix_employees_{column}_trgm', 'employees', [column], unique=False,
+                            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.drop_index(FULLTEXT_INDEX, table_name='employees')
+    elif dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif dialect == 'postgresql':
+        for column in SEARCH_COLUMNS:
+            op.drop_index(f'ix_employees_{column}_trgm', table_name='employees')
+
+    for name, _column in reversed(NAME_INDEXES):
+        op.drop_index(name, table_name='employees')
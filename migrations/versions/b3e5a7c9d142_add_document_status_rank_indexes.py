@@ -0,0 +1,58 @@
+"""add document status_rank and covering indexes for the received/created/archive views
+
+Revision ID: b3e5a7c9d142
+Revises: a2d4f6b8c031
+Create Date: 2026-10-19 13:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e5a7c9d142'
+down_revision = 'a2d4f6b8c031'
+branch_labels = None
+depends_on = None
+
+# Mirrors app.models.DOCUMENT_STATUS_RANKS at the time of this revision
+STATUS_RANKS = {
+    'Pending': 0,
+    'Accepted': 1,
+    'Forwarded': 2,
+    'Declined': 3,
+    'Released': 4,
+}
+DEFAULT_STATUS_RANK = 5
+
+
+def _add_status_rank(table_name):
+    with op.batch_alter_table(table_name, schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status_rank', sa.SmallInteger(), nullable=False,
+                                      server_default=str(DEFAULT_STATUS_RANK)))
+
+    table = sa.table(table_name, sa.column('status', sa.String), sa.column('status_rank', sa.SmallInteger))
+    rank = sa.case(
+        *[(table.c.status == status, value) for status, value in STATUS_RANKS.items()],
+        else_=DEFAULT_STATUS_RANK,
+    )
+    op.execute(table.update().values(status_rank=rank))
+
+
+def upgrade():
+    _add_status_rank('document')
+    _add_status_rank('document_archive')
+
+    with op.batch_alter_table('document', schema=None) as batch_op:
+        batch_op.create_index('ix_doc_recipient_rank_ts', ['recipient_id', 'status_rank', sa.text('timestamp DESC')], unique=False)
+        batch_op.create_index('ix_doc_creator_ts', ['creator_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('document', schema=None) as batch_op:
+        batch_op.drop_index('ix_doc_creator_ts')
+        batch_op.drop_index('ix_doc_recipient_rank_ts')
+        batch_op.drop_column('status_rank')
+
+    with op.batch_alter_table('document_archive', schema=None) as batch_op:
+        batch_op.drop_column('status_rank')
@@ -0,0 +1,46 @@
+"""stop reusing document ids that already exist in document_archive; index archived barcodes
+
+Revision ID: b4e6a8c0d259
+Revises: a7c9e1f3b528
+Create Date: 2026-10-20 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e6a8c0d259'
+down_revision = 'a7c9e1f3b528'
+branch_labels = None
+depends_on = None
+
+
+def _next_document_id(bind):
+    hot_max = bind.execute(sa.text('SELECT MAX(id) FROM document')).scalar() or 0
+    archived_max = bind.execute(sa.text('SELECT MAX(id) FROM document_archive')).scalar() or 0
+    return max(hot_max, archived_max) + 1
+
+
+def upgrade():
+    op.create_index('ix_doc_archive_barcode', 'document_archive', ['barcode'], unique=False)
+
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    if dialect == 'sqlite':
+        # AUTOINCREMENT needs a table rebuild; sqlite_sequence then starts above every archived id
+        with op.batch_alter_table('document', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        next_id = _next_document_id(bind)
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'document'")
+        op.execute(f"INSERT INTO sqlite_sequence (name, seq) VALUES ('document', {next_id - 1})")
+    elif dialect in ('mysql', 'mariadb'):
+        op.execute(f'ALTER TABLE document AUTO_INCREMENT = {_next_document_id(bind)}')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        with op.batch_alter_table('document', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
+    op.drop_index('ix_doc_archive_barcode', table_name='document_archive')
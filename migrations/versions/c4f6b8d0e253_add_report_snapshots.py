@@ -0,0 +1,36 @@
+"""add report_snapshots for closed-period report summaries
+
+Revision ID: c4f6b8d0e253
+Revises: b3e5a7c9d142
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f6b8d0e253'
+down_revision = 'b3e5a7c9d142'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'report_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('options_key', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.LargeBinary(length=(2**24) - 1), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('period_start', 'period_end', 'options_key', name='uq_report_snapshot_period'),
+    )
+    op.create_index('ix_report_snapshot_end', 'report_snapshots', ['period_end'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_report_snapshot_end', table_name='report_snapshots')
+    op.drop_table('report_snapshots')
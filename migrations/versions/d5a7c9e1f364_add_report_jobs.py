@@ -0,0 +1,43 @@
+"""add report_jobs for background report rendering
+
+Revision ID: d5a7c9e1f364
+Revises: c4f6b8d0e253
+Create Date: 2026-10-19 15:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a7c9e1f364'
+down_revision = 'c4f6b8d0e253'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('params', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='Queued'),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('message', sa.String(length=255), nullable=True),
+        sa.Column('artifact_path', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('claimed_by', sa.String(length=64), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_report_job_user_created', 'report_jobs', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_report_job_user_created', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,60 @@
+"""add batch_jobs and batch_job_items for background batch operations
+
+Revision ID: e6b8d0f2a475
+Revises: d5a7c9e1f364
+Create Date: 2026-10-19 17:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b8d0f2a475'
+down_revision = 'd5a7c9e1f364'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'batch_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(length=20), nullable=False),
+        sa.Column('params', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='Queued'),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('success_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('message', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('claimed_by', sa.String(length=64), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_batch_job_user_created', 'batch_jobs', ['user_id', 'created_at'], unique=False)
+
+    op.create_table(
+        'batch_job_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('outcome', sa.String(length=20), nullable=True),
+        sa.Column('reason', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['batch_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_batch_job_item_job_outcome', 'batch_job_items', ['job_id', 'outcome'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_batch_job_item_job_outcome', table_name='batch_job_items')
+    op.drop_table('batch_job_items')
+    op.drop_index('ix_batch_job_user_created', table_name='batch_jobs')
+    op.drop_table('batch_jobs')
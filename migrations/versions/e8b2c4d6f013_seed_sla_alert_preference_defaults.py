@@ -0,0 +1,49 @@
+"""seed default sla alert preference rows
+
+Revision ID: e8b2c4d6f013
+Revises: d4f1a2b3c4d5
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b2c4d6f013'
+down_revision = 'd4f1a2b3c4d5'
+branch_labels = None
+depends_on = None
+
+
+DEFAULT_CATEGORIES = ('documents', 'leave_requests', 'ewp_records')
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing = {
+        row[0]
+        for row in bind.execute(sa.text('SELECT category FROM sla_alert_preferences'))
+    }
+    missing = [category for category in DEFAULT_CATEGORIES if category not in existing]
+    if not missing:
+        return
+
+    preferences = sa.table(
+        'sla_alert_preferences',
+        sa.column('category', sa.String),
+        sa.column('enabled', sa.Boolean),
+        sa.column('updated_at', sa.DateTime),
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(
+        preferences,
+        [{'category': category, 'enabled': True, 'updated_at': now} for category in missing],
+    )
+
+
+def downgrade():
+    # Seeded rows are indistinguishable from admin-saved ones; leave them in place.
+    pass
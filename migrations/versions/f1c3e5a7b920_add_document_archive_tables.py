@@ -0,0 +1,123 @@
+"""add archive tables for documents, activity logs and processing logs
+
+Revision ID: f1c3e5a7b920
+Revises: e8b2c4d6f013
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c3e5a7b920'
+down_revision = 'e8b2c4d6f013'
+branch_labels = None
+depends_on = None
+
+
+DOCUMENT_COLUMNS = (
+    'id, title, office, classification, status, action_taken, attachment, remarks, barcode, '
+    'timestamp, no_dtas_flag, accepted_timestamp, released_timestamp, forwarded_timestamp, '
+    'creator_id, recipient_id'
+)
+# History rows get fresh ids in cold storage
+ACTIVITY_COLUMNS = 'timestamp, action, remarks, user_id, document_id'
+PROCESSING_COLUMNS = 'user_id, document_id, accepted_timestamp, forwarded_timestamp'
+
+
+def upgrade():
+    op.create_table(
+        'document_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('office', sa.String(length=100), nullable=False),
+        sa.Column('classification', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='Archived'),
+        sa.Column('action_taken', sa.String(length=50), nullable=False),
+        sa.Column('attachment', sa.String(length=200), nullable=True),
+        sa.Column('remarks', sa.Text(), nullable=True),
+        sa.Column('barcode', sa.String(length=50), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('no_dtas_flag', sa.Boolean(), nullable=False, server_default=sa.text('0')),
+        sa.Column('accepted_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('released_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('forwarded_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('creator_id', sa.Integer(), nullable=False),
+        sa.Column('recipient_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['creator_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['recipient_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('document_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_doc_archive_creator_ts', ['creator_id', 'timestamp'], unique=False)
+        batch_op.create_index('ix_doc_archive_recipient_ts', ['recipient_id', 'timestamp'], unique=False)
+        batch_op.create_index('ix_doc_archive_timestamp', ['timestamp'], unique=False)
+        batch_op.create_index('ix_doc_archive_released', ['released_timestamp'], unique=False)
+
+    op.create_table(
+        'activity_log_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('action', sa.String(length=50), nullable=False),
+        sa.Column('remarks', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['document_id'], ['document_archive.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('activity_log_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_archive_document_id', ['document_id'], unique=False)
+
+    op.create_table(
+        'processing_logs_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('accepted_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('forwarded_timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['document_id'], ['document_archive.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('processing_logs_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_processing_archive_document_id', ['document_id'], unique=False)
+        batch_op.create_index('ix_processing_archive_user_forwarded', ['user_id', 'forwarded_timestamp'], unique=False)
+
+    # Move documents that are already archived into cold storage
+    op.execute(
+        f"INSERT INTO document_archive ({DOCUMENT_COLUMNS}) "
+        f"SELECT {DOCUMENT_COLUMNS} FROM document WHERE status = 'Archived'"
+    )
+    op.execute(
+        f"INSERT INTO activity_log_archive ({ACTIVITY_COLUMNS}) "
+        f"SELECT {ACTIVITY_COLUMNS} FROM activity_log WHERE document_id IN (SELECT id FROM document_archive)"
+    )
+    op.execute(
+        f"INSERT INTO processing_logs_archive ({PROCESSING_COLUMNS}) "
+        f"SELECT {PROCESSING_COLUMNS} FROM processing_logs WHERE document_id IN (SELECT id FROM document_archive)"
+    )
+    op.execute("DELETE FROM activity_log WHERE document_id IN (SELECT id FROM document_archive)")
+    op.execute("DELETE FROM processing_logs WHERE document_id IN (SELECT id FROM document_archive)")
+    op.execute("DELETE FROM document WHERE id IN (SELECT id FROM document_archive)")
+
+
+def downgrade():
+    # Move archived rows back into the hot tables before dropping cold storage
+    op.execute(
+        f"INSERT INTO document ({DOCUMENT_COLUMNS}) "
+        f"SELECT {DOCUMENT_COLUMNS} FROM document_archive"
+    )
+    op.execute(
+        f"INSERT INTO activity_log ({ACTIVITY_COLUMNS}) "
+        f"SELECT {ACTIVITY_COLUMNS} FROM activity_log_archive"
+    )
+    op.execute(
+        f"INSERT INTO processing_logs ({PROCESSING_COLUMNS}) "
+        f"SELECT {PROCESSING_COLUMNS} FROM processing_logs_archive"
+    )
+    op.drop_table('processing_logs_archive')
+    op.drop_table('activity_log_archive')
+    op.drop_table('document_archive')
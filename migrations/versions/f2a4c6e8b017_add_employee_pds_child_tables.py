@@ -0,0 +1,163 @@
+"""add child tables for employee PDS sections and backfill them from the JSON columns
+
+Revision ID: f2a4c6e8b017
+Revises: e6b8d0f2a475
+Create Date: 2026-10-19 19:20:00.000000
+
+"""
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a4c6e8b017'
+down_revision = 'e6b8d0f2a475'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 500
+# Values are TEXT; MySQL indexes over them cover this many leading characters
+INDEX_PREFIX = 191
+
+# Mirrors the *_FIELD_NAMES tuples in app.models at the time of this revision
+EDUCATION_FIELDS = ('school_name', 'basic_education', 'period_from', 'period_to',
+                    'highest_level', 'year_graduated', 'scholarships')
+CIVIL_SERVICE_FIELDS = ('career_service', 'rating', 'exam_date', 'exam_place',
+                        'license_number', 'license_validity')
+WORK_EXPERIENCE_FIELDS = ('inclusive_from', 'inclusive_to', 'position_title', 'department_agency',
+                          'monthly_salary', 'salary_grade', 'appointment_status', 'is_gov_service')
+VOLUNTARY_WORK_FIELDS = ('organization_name', 'organization_address', 'inclusive_from',
+                         'inclusive_to', 'hours', 'position_nature')
+LEARNING_DEV_FIELDS = ('program_title', 'inclusive_from', 'inclusive_to', 'hours', 'ld_type', 'conducted_by')
+
+# JSON column -> (child table, field names, education level)
+SECTIONS = (
+    ('elem_records_json', 'employee_education', EDUCATION_FIELDS, 'elem'),
+    ('sec_records_json', 'employee_education', EDUCATION_FIELDS, 'sec'),
+    ('voc_records_json', 'employee_education', EDUCATION_FIELDS, 'voc'),
+    ('college_records_json', 'employee_education', EDUCATION_FIELDS, 'college'),
+    ('grad_records_json', 'employee_education', EDUCATION_FIELDS, 'grad'),
+    ('civil_service_records_json', 'employee_civil_service', CIVIL_SERVICE_FIELDS, None),
+    ('work_experience_json', 'employee_work_experience', WORK_EXPERIENCE_FIELDS, None),
+    ('voluntary_work_json', 'employee_voluntary_work', VOLUNTARY_WORK_FIELDS, None),
+    ('learning_dev_json', 'employee_learning_dev', LEARNING_DEV_FIELDS, None),
+)
+
+
+def _text_columns(fields):
+    return [sa.Column(field, sa.Text(), nullable=True) for field in fields]
+
+
+def _create_section_table(name, fields, extra_columns=()):
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        *extra_columns,
+        sa.Column('sort_order', sa.Integer(), nullable=False, server_default='0'),
+        *_text_columns(fields),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def _records(raw_json, fields):
+    try:
+        parsed = json.loads(raw_json) if raw_json else []
+    except ValueError:
+        return []
+    records = []
+    if isinstance(parsed, list):
+        for entry in parsed:
+            if not isinstance(entry, dict):
+                continue
+            record = {field: (entry.get(field) or '').strip() for field in fields}
+            if any(record.values()):
+                records.append(record)
+    return records
+
+
+def _hours(value):
+    match = re.search(r'\d+(?:\.\d+)?', value or '')
+    return float(match.group(0)) if match else None
+
+
+def _backfill():
+    """Copy JSON sections into the child tables in id-ordered batches; employees that already have rows are skipped."""
+    bind = op.get_bind()
+    metadata = sa.MetaData()
+    employees = sa.Table('employees', metadata, autoload_with=bind)
+    tables = {name: sa.Table(name, metadata, autoload_with=bind)
+              for name in {section[1] for section in SECTIONS}}
+    json_columns = [employees.c[section[0]] for section in SECTIONS]
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(employees.c.id, *json_columns)
+            .where(employees.c.id > last_id)
+            .order_by(employees.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        ids = [row[0] for row in rows]
+
+        done = {name: set(bind.execute(sa.select(table.c.employee_id).where(table.c.employee_id.in_(ids))).scalars())
+                for name, table in tables.items()}
+        inserts = {name: [] for name in tables}
+        for row in rows:
+            employee_id = row[0]
+            for (column, table_name, fields, level), raw_json in zip(SECTIONS, row[1:]):
+                if employee_id in done[table_name]:
+                    continue
+                for sort_order, record in enumerate(_records(raw_json, fields)):
+                    values = {field: record[field] or None for field in fields}
+                    values.update(employee_id=employee_id, sort_order=sort_order)
+                    if level is not None:
+                        values['level'] = level
+                    if 'hours' in fields:
+                        values['hours_value'] = _hours(values['hours'])
+                    inserts[table_name].append(values)
+        for table_name, values in inserts.items():
+            if values:
+                bind.execute(tables[table_name].insert(), values)
+
+
+def upgrade():
+    _create_section_table('employee_education', EDUCATION_FIELDS,
+                          [sa.Column('level', sa.String(length=10), nullable=False)])
+    op.create_index('ix_emp_edu_employee', 'employee_education', ['employee_id', 'level', 'sort_order'], unique=False)
+    op.create_index('ix_emp_edu_level_course', 'employee_education', ['level', 'basic_education'], unique=False,
+                    mysql_length={'basic_education': INDEX_PREFIX})
+
+    _create_section_table('employee_civil_service', CIVIL_SERVICE_FIELDS)
+    op.create_index('ix_emp_cse_employee', 'employee_civil_service', ['employee_id', 'sort_order'], unique=False)
+    op.create_index('ix_emp_cse_career_employee', 'employee_civil_service', ['career_service', 'employee_id'], unique=False,
+                    mysql_length={'career_service': INDEX_PREFIX})
+
+    _create_section_table('employee_work_experience', WORK_EXPERIENCE_FIELDS)
+    op.create_index('ix_emp_work_employee', 'employee_work_experience', ['employee_id', 'sort_order'], unique=False)
+
+    _create_section_table('employee_voluntary_work', VOLUNTARY_WORK_FIELDS,
+                          [sa.Column('hours_value', sa.Float(), nullable=True)])
+    op.create_index('ix_emp_vol_employee', 'employee_voluntary_work', ['employee_id', 'sort_order'], unique=False)
+
+    _create_section_table('employee_learning_dev', LEARNING_DEV_FIELDS,
+                          [sa.Column('hours_value', sa.Float(), nullable=True)])
+    op.create_index('ix_emp_ld_employee', 'employee_learning_dev', ['employee_id', 'sort_order'], unique=False)
+    op.create_index('ix_emp_ld_type_employee', 'employee_learning_dev', ['ld_type', 'employee_id'], unique=False,
+                    mysql_length={'ld_type': INDEX_PREFIX})
+
+    _backfill()
+
+
+def downgrade():
+    # The *_json columns are still written alongside the child rows, so nothing is lost here
+    for table_name in ('employee_learning_dev', 'employee_voluntary_work', 'employee_work_experience',
+                       'employee_civil_service', 'employee_education'):
+        op.drop_table(table_name)
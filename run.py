@@ -1,5 +1,9 @@
-from app import create_app
-app = create_app()
+from app import create_app, resume_background_jobs
 
-if __name__ == '__main__':  
-    app.run(host='0.0.0.0', port=80)
\ No newline at end of file
+if __name__ == '__main__':
+    # Created here rather than at import: report/batch worker processes are
+    # spawned and re-import this script as __mp_main__
+    app = create_app()
+    # The one process that resumes jobs abandoned by a crash or restart
+    resume_background_jobs(app, watch=True)
+    app.run(host='0.0.0.0', port=80)
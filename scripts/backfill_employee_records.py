@@ -0,0 +1,48 @@
+"""
+Rebuild the employee PDS child tables (education, civil service, work
+experience, voluntary work, learning & development) from the *_json columns.
+
+The f2a4c6e8b017 migration backfills employees that have no child rows yet.
+Run this after every worker is on the new code to pick up sections that older
+workers wrote to JSON only during the rollout. Safe to re-run.
+
+Usage: DATABASE_URL=... PYTHONPATH=. python scripts/backfill_employee_records.py [batch_size]
+"""
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app import create_app, db
+from app.models import Employee, PDS_RECORD_COLUMNS, PDS_SECTION_RELATIONSHIPS
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        relationships = {relationship for relationship, _level in PDS_SECTION_RELATIONSHIPS.values()}
+        last_id = 0
+        total = 0
+        while True:
+            employees = db.session.execute(
+                select(Employee)
+                .where(Employee.id > last_id)
+                .order_by(Employee.id)
+                .limit(batch_size)
+                .options(*[selectinload(getattr(Employee, name)) for name in relationships])
+            ).scalars().all()
+            if not employees:
+                break
+            for employee in employees:
+                for column, field_names in PDS_RECORD_COLUMNS.items():
+                    employee.set_records(column, employee._parsed_records(column, field_names))
+            db.session.commit()
+            last_id = employees[-1].id
+            total += len(employees)
+            db.session.expunge_all()
+            print(f"{total} employees synced (last id {last_id})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure audit export throughput for each format, with and without gzip.
+Output is discarded; the database must already hold representative data.
+
+Usage: PYTHONPATH=. python scripts/benchmark_export.py [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--chunk-size N]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+try:
+    import psutil  # optional; gives the peak working set on Windows
+except ImportError:
+    psutil = None
+
+from app import create_app, db
+from app.exports import EXPORT_FORMATS, ExportFilters, iter_export
+from app.models import ArchivedDocument, Document
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MB, or None when it cannot be measured."""
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    return None
+
+
+def _document_count(filters):
+    total = 0
+    for model in (Document, ArchivedDocument):
+        query = model.query
+        if filters.start_dt is not None:
+            query = query.filter(model.timestamp >= filters.start_dt)
+        if filters.end_dt is not None:
+            query = query.filter(model.timestamp < filters.end_dt)
+        total += query.count()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the audit export')
+    parser.add_argument('--from', dest='date_from', type=_date)
+    parser.add_argument('--to', dest='date_to', type=_date)
+    parser.add_argument('--chunk-size', type=int)
+    args = parser.parse_args()
+
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        filters = ExportFilters(
+            start_dt=args.date_from,
+            end_dt=args.date_to + timedelta(days=1) if args.date_to else None,
+        )
+        documents = _document_count(filters)
+        print(f"{documents} documents in range")
+        print(f"{'format':<8}{'gzip':<6}{'seconds':>10}{'docs/s':>12}{'MB out':>10}{'MB/s':>8}{'peak RSS MB':>13}")
+        for fmt in EXPORT_FORMATS:
+            for compress in (False, True):
+                started = time.monotonic()
+                size = 0
+                for chunk in iter_export(filters, fmt, compress, args.chunk_size):
+                    size += len(chunk if compress else chunk.encode('utf-8'))
+                elapsed = time.monotonic() - started
+                db.session.rollback()
+                megabytes = size / (1024 * 1024)
+                peak = _peak_rss_mb()
+                print(f"{fmt:<8}{'yes' if compress else 'no':<6}{elapsed:>10.2f}"
+                      f"{(documents / elapsed if elapsed else 0):>12.0f}{megabytes:>10.2f}"
+                      f"{(megabytes / elapsed if elapsed else 0):>8.2f}"
+                      f"{(f'{peak:.0f}' if peak is not None else 'n/a'):>13}")
+
+
+if __name__ == '__main__':
+    main()
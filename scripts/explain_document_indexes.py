@@ -0,0 +1,100 @@
+"""
+Check the query plans for the received queue, the created list and the
+archive page: each must read its covering index in order, without a filesort
+(MySQL) or a temp B-tree (SQLite). Prints every plan and exits with status 1
+when a query stops using its index, so it can gate schema changes.
+
+Usage: DATABASE_URL=... PYTHONPATH=. python scripts/explain_document_indexes.py [user_id]
+"""
+import sys
+
+from sqlalchemy import select
+
+from app import create_app, db
+from app.archive_storage import ArchivePagination
+from app.models import ArchivedDocument, Document
+
+SORT_MARKERS = {
+    "sqlite": ("USE TEMP B-TREE",),
+    "mysql": ("Using filesort", "Using temporary"),
+}
+
+
+def _plan_problems(dialect, rows, expected_index):
+    """Why a plan misses its index, or an empty list when it is fine."""
+    if dialect == "sqlite":
+        # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+        details = [row[-1] for row in rows]
+        used = any(f"INDEX {expected_index} " in f"{detail} " for detail in details)
+        extras = details
+    else:
+        plan = [row._mapping for row in rows]
+        used = any(entry.get("key") == expected_index for entry in plan)
+        extras = [entry.get("Extra") or "" for entry in plan]
+    problems = [] if used else [f"does not use {expected_index}"]
+    for marker in SORT_MARKERS.get(dialect, SORT_MARKERS["mysql"]):
+        if any(marker in extra for extra in extras):
+            problems.append(f"sorts outside the index ({marker})")
+    return problems
+
+
+def _check(label, expected_index, statement):
+    bind = db.session.get_bind()
+    dialect = "sqlite" if bind.dialect.name == "sqlite" else "mysql"
+    compiled = statement.compile(bind=bind, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN"
+    rows = db.session.execute(db.text(f"{prefix} {compiled}")).all()
+    problems = _plan_problems(dialect, rows, expected_index)
+    print(f"== {label}: {'FAIL - ' + '; '.join(problems) if problems else 'ok'}")
+    print(compiled)
+    for row in rows:
+        print("   ", tuple(row))
+    print()
+    return not problems
+
+
+def main():
+    user_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        checks = [
+            (
+                "received queue", "ix_doc_recipient_rank_ts",
+                select(Document.id)
+                .where(Document.recipient_id == user_id, Document.status != 'Archived')
+                .order_by(Document.status_rank, Document.timestamp.desc())
+                .limit(10),
+            ),
+            (
+                "created list", "ix_doc_creator_ts",
+                select(Document.id)
+                .where(Document.creator_id == user_id, Document.status != 'Archived')
+                .order_by(Document.timestamp.desc())
+                .limit(10),
+            ),
+        ]
+        pagination = ArchivePagination.__new__(ArchivePagination)
+        pagination._query_args = {"user_id": user_id, "criteria": []}
+        for (label, index), where in zip(
+            (("archive created side", "ix_doc_archive_creator_ts"),
+             ("archive received side", "ix_doc_archive_recipient_ts")),
+            pagination._branches(),
+        ):
+            checks.append((
+                label, index,
+                select(ArchivedDocument.id, ArchivedDocument.timestamp)
+                .where(*where)
+                .order_by(ArchivedDocument.timestamp.desc())
+                .limit(10),
+            ))
+
+        results = [_check(*check) for check in checks]
+    failed = results.count(False)
+    if failed:
+        print(f"{failed} of {len(results)} queries no longer use their index")
+        sys.exit(1)
+    print(f"All {len(results)} queries use their index")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Command-line audit export: documents with their activity/processing history
+and notifications, as CSV or JSON Lines (optionally gzipped).
+
+Usage:
+  PYTHONPATH=. python scripts/export_documents.py --from 2025-01-01 --to 2025-06-30 \
+      --format jsonl --gzip --output audit.jsonl.gz
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.exports import EXPORT_FORMATS, ExportFilters, iter_export
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--from', dest='date_from', type=_date, help='first day (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='date_to', type=_date, help='last day, inclusive (YYYY-MM-DD)')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    parser.add_argument('--gzip', action='store_true', help='gzip the output as it is written')
+    parser.add_argument('--output', default='-', help="output file, or '-' for stdout")
+    parser.add_argument('--classification')
+    parser.add_argument('--status')
+    parser.add_argument('--office')
+    parser.add_argument('--user-id', type=int)
+    parser.add_argument('--no-notifications', action='store_true')
+    parser.add_argument('--chunk-size', type=int)
+    return parser.parse_args(argv)
+
+
+def build_filters(args):
+    return ExportFilters(
+        start_dt=args.date_from,
+        end_dt=args.date_to + timedelta(days=1) if args.date_to else None,
+        classification=args.classification,
+        status=args.status,
+        office=args.office,
+        user_id=args.user_id,
+        include_notifications=not args.no_notifications,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        chunks = iter_export(build_filters(args), args.format, args.gzip, args.chunk_size)
+        if args.output == '-':
+            handle = sys.stdout.buffer if args.gzip else sys.stdout
+        else:
+            handle = open(args.output, 'wb') if args.gzip else open(args.output, 'w', encoding='utf-8', newline='')
+        started = time.monotonic()
+        written = 0
+        try:
+            for chunk in chunks:
+                handle.write(chunk)
+                written += len(chunk)
+        finally:
+            if handle not in (sys.stdout, sys.stdout.buffer):
+                handle.close()
+        elapsed = time.monotonic() - started
+        rate = written / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+        print(f"Exported {written} {'bytes' if args.gzip else 'characters'} in {elapsed:.2f}s ({rate:.2f} MB/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
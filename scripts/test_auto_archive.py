@@ -4,12 +4,13 @@ os.environ['DATABASE_URL'] = 'sqlite:///test_auto_archive.db'
 from datetime import datetime, timedelta
 
 from app import create_app, db
-from app.models import User, Document, ActivityLog
+from app.models import User, Document, ActivityLog, ArchivedDocument, ArchivedActivityLog
+from app.archive_storage import restore_documents_from_archive
 from app.auto_archive import archive_old_documents
 
 
 def main():
-    app = create_app()
+    app = create_app(start_scheduler=False)
     with app.app_context():
         db.create_all()
         # Ensure a test user exists
@@ -63,33 +64,49 @@ def main():
             datetime(two_months_ago_day.year, two_months_ago_day.month, two_months_ago_day.day, 12, 0, 0),
         )
 
+        d1_id, d2_id, d3_id = d1.id, d2.id, d3.id
+
         # Run the archive job once
         result = archive_old_documents()
-
-        # Reload from DB
-        d1 = Document.query.get(d1.id)
-        d2 = Document.query.get(d2.id)
-        d3 = Document.query.get(d3.id)
+        # The job moves archived documents out of the hot table with bulk statements
+        db.session.expunge_all()
 
         def auto_log_count(doc_id: int) -> int:
-            return ActivityLog.query.filter_by(document_id=doc_id, action="Auto Archived").count()
+            return ArchivedActivityLog.query.filter_by(document_id=doc_id, action="Auto Archived").count()
 
         print("Job result:", result)
-        print("Statuses after job run:")
-        print(f"  Last Month       (d1): status={d1.status}, auto_logs={auto_log_count(d1.id)}")
-        print(f"  Current Month    (d2): status={d2.status}, auto_logs={auto_log_count(d2.id)}")
-        print(f"  Two Months Ago   (d3): status={d3.status}, auto_logs={auto_log_count(d3.id)}")
-
-        # Cleanup created test data
         try:
-            for doc in [d1, d2, d3]:
-                db.session.delete(doc)
-            db.session.commit()
-            print("Cleanup: deleted test documents.")
-        except Exception as e:
-            db.session.rollback()
-            print("Cleanup failed:", e)
+            for label, doc_id in (("Last Month     (d1)", d1_id), ("Two Months Ago (d3)", d3_id)):
+                archived = db.session.get(ArchivedDocument, doc_id)
+                assert archived is not None, f"{label} was not moved to the archive"
+                assert db.session.get(Document, doc_id) is None, f"{label} is still in the hot table"
+                assert archived.status == "Archived", f"{label} has status {archived.status}"
+                assert auto_log_count(doc_id) == 1, f"{label} has no archived 'Auto Archived' entry"
+                print(f"  {label}: archived, status={archived.status}, auto_logs={auto_log_count(doc_id)}")
 
+            current = db.session.get(Document, d2_id)
+            assert current is not None, "Current Month (d2) left the hot table"
+            assert current.status == "Pending", f"Current Month (d2) has status {current.status}"
+            assert db.session.get(ArchivedDocument, d2_id) is None, "Current Month (d2) was archived"
+            print(f"  Current Month  (d2): hot, status={current.status}")
+            print("OK")
+        finally:
+            # Cleanup created test data from both tables (restoring keeps the archive facets right)
+            try:
+                restore_documents_from_archive(
+                    [doc_id for doc_id in (d1_id, d3_id) if db.session.get(ArchivedDocument, doc_id)]
+                )
+                db.session.flush()
+                db.session.expunge_all()
+                for doc_id in (d1_id, d2_id, d3_id):
+                    doc = db.session.get(Document, doc_id)
+                    if doc is not None:
+                        db.session.delete(doc)
+                db.session.commit()
+                print("Cleanup: deleted test documents.")
+            except Exception as e:
+                db.session.rollback()
+                print("Cleanup failed:", e)
 
 if __name__ == "__main__":
     main()
@@ -2,10 +2,13 @@ import logging
 logging.basicConfig(level=logging.DEBUG)  # Enable debug logging
 
 from waitress import serve
-from app import create_app  # Use the factory method
-
-app = create_app()  # Create app instance
+from app import create_app, resume_background_jobs  # Use the factory method
 
 if __name__ == '__main__':
+    # Created here rather than at import: report/batch worker processes are
+    # spawned and re-import this script as __mp_main__
+    app = create_app()  # Create app instance
+    # The one process that resumes jobs abandoned by a crash or restart
+    resume_background_jobs(app, watch=True)
     print("Starting Waitress on 0.0.0.0:80")
     serve(app, listen='0.0.0.0:80')